@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+离线浏览性能测试
+
+启动本地模拟论坛（bench/mock_forum.py），让 GUI 版 Bot 和无头版 LinuxDoBot
+在其上浏览，统计：
+    - 帖子/分钟、楼层/分钟
+    - 每个帖子的浏览器调用次数（get / run_js / ele / run_cdp）
+    - 各阶段耗时（PhaseTimer）
+
+全程不访问外网。脚本里的防风控等待可以用 --speed 按比例缩短，
+便于快速比较改动前后的差异（比较时两边需用相同的 --speed）。
+
+需要本机安装 Chrome；GUI 版 Bot 使用有界面浏览器，Linux 服务器可用 xvfb-run 运行。
+
+使用方法：
+    python bench/bench_browse.py
+    python bench/bench_browse.py --bot all --topics 20 --latency 0.1 --speed 10
+    python bench/bench_browse.py --posts 100-300 --seed 3
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_forum import MockForum, parse_range  # noqa: E402
+from linux_do_metrics import PROFILED_CALLS, CallProfiler  # noqa: E402
+
+TITLES = {"headless": "无头版 LinuxDoBot", "gui": "GUI 版 Bot"}
+
+
+class _ScaledTime:
+    """time 模块替身：sleep 按比例缩短，其余函数不变"""
+
+    def __init__(self, speed):
+        self._speed = speed
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self._speed)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def scale_sleeps(modules, speed):
+    """把模块中的 time.sleep 按 speed 倍缩短"""
+    if speed and speed != 1:
+        for module in modules:
+            module.time = _ScaledTime(speed)
+
+
+def run_headless(forum, topics, seed):
+    """无头版 LinuxDoBot，返回结果字典"""
+    import linux_do_headless
+    from linux_do_log import Logger
+
+    random.seed(seed)
+    bot = linux_do_headless.LinuxDoBot(
+        "bench",
+        "bench",
+        config={"base_url": forum.url},
+        logger=Logger(console=False),
+    )
+    if not bot.start_browser(headless=True):
+        return None
+    try:
+        bot.page = profiler = CallProfiler(bot.page)
+        if not bot.login():
+            print("  登录模拟论坛失败")
+            return None
+        profiler.reset()
+        forum.reset_counters()
+        timer_start = time.perf_counter()
+        bot.browse(topics)
+        elapsed = time.perf_counter() - timer_start
+    finally:
+        bot.close_browser()
+
+    return {
+        "topics": bot.stats["topics"],
+        "floors": bot.stats["floors"],
+        "elapsed": elapsed,
+        "profiler": profiler,
+        "timer": bot.timer,
+    }
+
+
+def run_gui(forum, topics, seed):
+    """GUI 版 Bot（不创建窗口，只驱动浏览逻辑），返回结果字典"""
+    import linux_do_gui
+
+    random.seed(seed)
+    cfg = dict(linux_do_gui.CFG, base=forum.url, connect=forum.url + "/connect", proxy="")
+    cats = [c for c in linux_do_gui.CATS if c["e"]]
+    bot = linux_do_gui.Bot(cfg, cats, lambda msg: None, mode="endless")
+    bot._screen_height = 1080
+    if not bot.start():
+        return None
+    try:
+        bot.run = True
+        bot.pg = bot.mem.page = profiler = CallProfiler(bot.pg)
+        bot.pg.get(forum.url + "/session/bench")
+        if not bot.check_login(wait_for_login=False):
+            print("  登录模拟论坛失败")
+            return None
+        profiler.reset()
+        forum.reset_counters()
+        bot.start_time = time.time()
+        timer_start = time.perf_counter()
+        while bot.stats["topic"] < topics:
+            bot.browse_cat(random.choice(cats))
+        elapsed = time.perf_counter() - timer_start
+    finally:
+        bot.run = False
+        bot.stop()
+
+    return {
+        "topics": bot.stats["topic"],
+        "floors": bot.stats["floors"],
+        "elapsed": elapsed,
+        "profiler": profiler,
+        "timer": bot.timer,
+    }
+
+
+def print_result(name, result):
+    print("=" * 60)
+    print(name)
+    print("=" * 60)
+    if not result:
+        print("  运行失败（是否已安装 Chrome？GUI 版是否有图形环境？）")
+        return
+    minutes = result["elapsed"] / 60 or 1e-9
+    topics = result["topics"] or 1
+    calls = result["profiler"].totals()
+    print(f"  帖子 {result['topics']}，楼层 {result['floors']}，用时 {result['elapsed']:.1f}s")
+    print(f"  帖子/分钟 {result['topics'] / minutes:.2f}")
+    print(f"  楼层/分钟 {result['floors'] / minutes:.1f}")
+    print(f"  浏览器调用/帖子 {sum(calls.values()) / topics:.1f}")
+    print(f"  HTTP 请求/帖子 {result['requests'] / topics:.1f}")
+    for name in PROFILED_CALLS:
+        print(f"    {name:<10}{calls[name]:>8}{calls[name] / topics:>10.1f}/帖")
+    for line in result["timer"].report() + result["profiler"].report(top=10):
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线浏览性能测试")
+    parser.add_argument(
+        "--bot", choices=("headless", "gui", "all"), default="headless", help="测试对象"
+    )
+    parser.add_argument("--topics", type=int, default=10, help="浏览帖子数，默认 10")
+    parser.add_argument("--latency", type=float, default=0.05, help="模拟响应延迟（秒）")
+    parser.add_argument("--posts", default="20-120", help="帖子楼层数范围，默认 20-120")
+    parser.add_argument("--speed", type=float, default=10, help="等待时间缩短倍数，默认 10")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    forum = MockForum(latency=args.latency, posts=parse_range(args.posts), seed=args.seed).start()
+    print(f"模拟论坛: {forum.url}（延迟 {args.latency}s，楼层 {args.posts}，等待缩短 {args.speed}x）")
+
+    import linux_do_gui
+    import linux_do_headless
+
+    scale_sleeps((linux_do_gui, linux_do_headless), args.speed)
+
+    try:
+        for name, runner in (("headless", run_headless), ("gui", run_gui)):
+            if args.bot not in (name, "all"):
+                continue
+            result = runner(forum, args.topics, args.seed)
+            if result:
+                result["requests"] = forum.counters.get("requests", 0)
+            print_result(TITLES[name], result)
+    finally:
+        forum.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+打包方式性能测试
+
+分别用 build.py --layout onefile / onedir 打包 GUI 版和无头版，比较：
+1. 体积：可执行文件大小（onefile）或整个输出目录大小（onedir）
+2. 启动耗时：第 1 次单独列出（刚打包完，接近冷启动），其余取中位数。
+   onefile 每次启动都要重新解压，onedir 不需要
+   - GUI 版：启动到首个窗口出现
+   - 无头版：运行 --help 到退出（包含解压和全部模块导入，不启动浏览器）
+
+打包结果保存在 dist_bench/<打包目标>-<打包方式>/，加 --no-build 直接测已有的打包结果。
+需要 PyInstaller；测 GUI 版需要图形环境（Linux 服务器可用 xvfb-run 运行）。
+Windows 上 --windowed 程序没有标准输出，测不到 GUI 版窗口出现时间，只报告体积。
+
+使用方法：
+    python bench/bench_build.py
+    python bench/bench_build.py --runs 10 --layout onedir
+    python bench/bench_build.py --target headless
+    python bench/bench_build.py --no-build
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build  # noqa: E402
+from bench_gui_startup import measure_first_window  # noqa: E402
+
+OUTPUT = os.path.join(ROOT, "dist_bench")
+TARGETS = ("gui", "headless")
+
+
+def run_build(target, layout):
+    """打包并把 dist/ 移到 dist_bench/<target>-<layout>/，返回是否成功"""
+    result = subprocess.run(
+        [sys.executable, "build.py", "--target", target, "--layout", layout], cwd=ROOT
+    )
+    if result.returncode != 0:
+        return False
+    output = os.path.join(OUTPUT, f"{target}-{layout}")
+    if os.path.exists(output):
+        shutil.rmtree(output)
+    os.makedirs(OUTPUT, exist_ok=True)
+    shutil.move(os.path.join(ROOT, "dist"), output)
+    return True
+
+
+def find_executable(target, layout):
+    """dist_bench/<target>-<layout>/ 中的可执行文件路径"""
+    build.LAYOUT = layout
+    platform_name = build.PLATFORM_NAMES.get(build.get_platform(), build.get_platform())
+    app = build.HEADLESS_NAME if target == "headless" else build.APP_NAME
+    path = build.output_path(f"{app}_v{build.APP_VERSION}_{platform_name}")  # dist/...
+    return os.path.join(OUTPUT, f"{target}-{layout}", path.split("/", 1)[1])
+
+
+def bundle_size(target, layout):
+    """打包结果总大小（字节）"""
+    total = 0
+    for dirpath, _, filenames in os.walk(os.path.join(OUTPUT, f"{target}-{layout}")):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if not os.path.islink(path):
+                total += os.path.getsize(path)
+    return total
+
+
+def measure_help(exe, timeout=60):
+    """运行一次 exe --help，返回耗时，失败返回 None"""
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [exe, "--help"], cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return time.perf_counter() - start
+
+
+def measure(target, layout, runs):
+    """测量一种打包结果，返回结果字典"""
+    exe = find_executable(target, layout)
+    result = {"target": target, "layout": layout, "exe": exe, "size": None, "first": None, "median": None}
+    if not os.path.exists(exe):
+        print(f"  找不到 {exe}")
+        return result
+    result["size"] = bundle_size(target, layout)
+
+    walls = []
+    for i in range(runs):
+        if target == "headless":
+            wall = measure_help(exe)
+            if wall is None:
+                print(f"  第 {i + 1} 次: 失败")
+                continue
+            walls.append(wall)
+            print(f"  第 {i + 1} 次: {wall * 1000:.0f} ms")
+            continue
+        r = measure_first_window([exe])
+        if not r:
+            print(f"  第 {i + 1} 次: 失败（是否缺少图形环境？）")
+            continue
+        walls.append(r[0])
+        print(f"  第 {i + 1} 次: 总计 {r[0] * 1000:.0f} ms（程序内 {r[1] * 1000:.0f} ms）")
+    if walls:
+        result["first"] = walls[0]
+        result["median"] = statistics.median(walls[1:] or walls)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="打包方式性能测试")
+    parser.add_argument("--runs", type=int, default=5, help="每种方式的启动次数，默认 5")
+    parser.add_argument("--layout", choices=build.LAYOUTS, help="只测该打包方式")
+    parser.add_argument("--target", choices=TARGETS, help="只测该打包目标（gui / headless）")
+    parser.add_argument("--no-build", action="store_true", help="不重新打包，直接测 dist_bench/ 中的结果")
+    args = parser.parse_args()
+
+    layouts = [args.layout] if args.layout else list(build.LAYOUTS)
+    targets = [args.target] if args.target else list(TARGETS)
+    results = []
+    for target in targets:
+        for layout in layouts:
+            print("=" * 60)
+            print(f"打包目标: {target}，打包方式: {layout}")
+            print("=" * 60)
+            if not args.no_build and not run_build(target, layout):
+                print("  打包失败")
+                continue
+            results.append(measure(target, layout, args.runs))
+
+    def ms(value):
+        return f"{value * 1000:.0f}" if value is not None else "-"
+
+    print()
+    print("=" * 60)
+    print(f"  {'打包目标':<10}{'打包方式':<10}{'体积(MB)':>10}{'首次(ms)':>12}{'中位数(ms)':>12}")
+    for r in results:
+        size = f"{r['size'] / 1048576:.1f}" if r["size"] is not None else "-"
+        print(f"  {r['target']:<10}{r['layout']:<10}{size:>10}{ms(r['first']):>12}{ms(r['median']):>12}")
+
+    # 同一打包目标下比较两种方式（GUI 版和无头版的启动耗时测量方式不同，不互相比较）
+    for target in targets:
+        timed = [r for r in results if r["target"] == target and r["median"] is not None]
+        if len(timed) > 1:
+            best = min(timed, key=lambda r: r["median"])
+            print(f"{target} 启动最快: {best['layout']}")
+
+    sized = {r["target"]: r["size"] for r in results if r["size"] is not None and r["layout"] == layouts[0]}
+    if len(sized) == 2:
+        print(f"无头版体积为 GUI 版的 {sized['headless'] / sized['gui'] * 100:.0f}%（{layouts[0]}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+浏览器缓存性能测试（冷启动 / 热启动）
+
+模拟临时运行环境之间传递用户数据目录：
+    1. 冷启动：空的用户数据目录，打开页面，记录加载耗时和传输量，退出浏览器
+    2. 把用户数据目录打包为归档，删除目录，再从归档解包（与无头版 --profile-archive 相同）
+    3. 热启动：用解包后的目录重新启动浏览器，打开同一页面，再记录一次
+
+加载统计来自页面的 Navigation / Resource Timing（linux_do_metrics.page_load_stats），
+不需要登录。需要本机安装 Chrome（无头模式）。
+
+使用方法：
+    python bench/bench_cache.py
+    python bench/bench_cache.py --url https://linux.do/latest --repeat 3
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from linux_do_metrics import page_load_stats  # noqa: E402
+from linux_do_profile import dir_size, pack_profile, unpack_profile  # noqa: E402
+
+
+def load_once(url, user_data_dir, settle=3):
+    """用指定用户数据目录启动无头浏览器打开 url，返回加载统计"""
+    from DrissionPage import ChromiumPage, ChromiumOptions
+
+    co = ChromiumOptions()
+    co.headless(True)
+    co.auto_port()
+    co.set_user_data_path(user_data_dir)
+    co.set_argument("--no-sandbox")
+    page = ChromiumPage(co)
+    try:
+        page.get(url)
+        time.sleep(settle)  # 等待页面加载完异步资源
+        return page_load_stats(page)
+    finally:
+        page.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="浏览器缓存性能测试（冷启动 / 热启动）")
+    parser.add_argument("--url", default="https://linux.do", help="测试页面，默认 https://linux.do")
+    parser.add_argument("--repeat", type=int, default=1, help="冷/热各测几次，默认 1")
+    args = parser.parse_args()
+
+    results = {"cold": [], "warm": []}
+    for i in range(args.repeat):
+        work = tempfile.mkdtemp(prefix="linuxdo-cache-")
+        cold_dir = os.path.join(work, "cold")
+        warm_dir = os.path.join(work, "warm")
+        archive = os.path.join(work, "profile.tar.gz")
+        try:
+            results["cold"].append(load_once(args.url, cold_dir))
+
+            start = time.perf_counter()
+            size = pack_profile(cold_dir, archive)
+            pack_time = time.perf_counter() - start
+            start = time.perf_counter()
+            unpack_profile(archive, warm_dir)
+            unpack_time = time.perf_counter() - start
+            print(
+                f"第 {i + 1} 次: 目录 {dir_size(cold_dir) / 1048576:.1f} MB，"
+                f"归档 {size / 1048576:.1f} MB，打包 {pack_time:.1f}s，解包 {unpack_time:.1f}s"
+            )
+
+            results["warm"].append(load_once(args.url, warm_dir))
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    print()
+    print(f"页面: {args.url}")
+    print(f"  {'':<6}{'加载(s)':>10}{'请求数':>10}{'传输(KB)':>12}{'缓存命中':>10}")
+    for name, label in (("cold", "冷启动"), ("warm", "热启动")):
+        samples = [r for r in results[name] if r]
+        if not samples:
+            print(f"  {label:<6}{'-':>10}")
+            continue
+        print(
+            f"  {label:<6}"
+            f"{statistics.median(r['load'] for r in samples):>10.2f}"
+            f"{statistics.median(r['requests'] for r in samples):>10.0f}"
+            f"{statistics.median(r['bytes'] for r in samples) / 1024:>12.0f}"
+            f"{statistics.median(r['cached'] for r in samples):>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+GUI 启动性能测试
+
+测量两项指标：
+1. 首个窗口出现耗时：启动 linux_do_gui.py（或打包后的可执行文件），
+   通过环境变量 LINUXDO_STARTUP_PROBE 让程序在窗口首次绘制后输出耗时并退出
+2. 各模块导入耗时：python -X importtime 导入 linux_do_gui，按累计耗时排序
+
+需要图形环境（Linux 服务器可用 xvfb-run 运行）。
+
+使用方法：
+    python bench/bench_gui_startup.py
+    python bench/bench_gui_startup.py --runs 10
+    python bench/bench_gui_startup.py --exe dist/LinuxDoHelper_v8.3_Linux
+"""
+
+import os
+import sys
+import time
+import queue
+import argparse
+import statistics
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(ROOT, "linux_do_gui.py")
+
+
+def measure_first_window(cmd, timeout=60):
+    """
+    启动一次程序，返回 (进程启动到窗口出现的耗时, 程序内部记录的耗时)，失败返回 None
+
+    Args:
+        cmd: 启动命令列表
+        timeout: 超时时间（秒）
+    """
+    env = dict(os.environ, LINUXDO_STARTUP_PROBE="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    # 在线程中读输出：程序在输出任何内容之前卡住时，主线程仍能按时结束它
+    lines = queue.Queue()
+
+    def reader():
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+    deadline = start + timeout
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if line is None:
+                break
+            if line.startswith("STARTUP_PROBE"):
+                wall = time.perf_counter() - start
+                inner = float(line.split("first_window=")[1])
+                try:
+                    proc.wait(timeout=max(deadline - time.perf_counter(), 1))
+                except subprocess.TimeoutExpired:
+                    pass  # 已拿到结果，没有自行退出的进程在下面结束
+                return wall, inner
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    return None
+
+
+def measure_imports(top=15):
+    """
+    用 -X importtime 测量导入 linux_do_gui 时各模块的耗时
+
+    Returns:
+        list: [(模块名, 自身耗时 ms, 累计耗时 ms)]，按累计耗时降序
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import linux_do_gui"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # 只统计 linux_do_gui 本身及其直接导入的模块（缩进层级 0 和 1）
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level <= 1:
+            rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI 启动性能测试")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数，默认 5")
+    parser.add_argument("--exe", help="打包后的可执行文件路径（默认测源码）")
+    args = parser.parse_args()
+
+    cmd = [os.path.abspath(args.exe)] if args.exe else [sys.executable, MAIN_SCRIPT]
+
+    print("=" * 60)
+    print(f"首个窗口出现耗时（{args.runs} 次）: {' '.join(cmd)}")
+    print("=" * 60)
+    walls, inners = [], []
+    for i in range(args.runs):
+        r = measure_first_window(cmd)
+        if not r:
+            print(f"  第 {i + 1} 次: 失败（是否缺少图形环境？）")
+            continue
+        walls.append(r[0])
+        inners.append(r[1])
+        print(f"  第 {i + 1} 次: 总计 {r[0] * 1000:.0f} ms（程序内 {r[1] * 1000:.0f} ms）")
+
+    if walls:
+        print("-" * 60)
+        print(
+            f"  中位数 {statistics.median(walls) * 1000:.0f} ms，"
+            f"最快 {min(walls) * 1000:.0f} ms，最慢 {max(walls) * 1000:.0f} ms"
+        )
+
+    if not args.exe:
+        print()
+        print("=" * 60)
+        print("模块导入耗时（按累计耗时排序）")
+        print("=" * 60)
+        print(f"  {'模块':<32}{'自身(ms)':>10}{'累计(ms)':>10}")
+        for name, self_ms, cumulative_ms in measure_imports():
+            print(f"  {name:<32}{self_ms:>10.1f}{cumulative_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+帖子跳转性能测试（整页加载 / 前端路由 / 后台预加载）
+
+打开论坛首页取一批帖子地址，分别用 page.get 整页加载、linux_do_nav 前端路由、
+后台标签页预加载（每个帖子停留 --read 秒模拟阅读，期间预加载下一个）依次打开每个帖子，比较：
+1. 跳转耗时：发起跳转到到达目标帖子（预加载时为切换标签页的等待时间）
+2. 渲染进程 CPU 时间：CDP Performance.getMetrics 的 TaskDuration 增量
+   （预加载模式下加载发生在后台标签页，这一列不可比，不列出）
+
+回退为整页加载的次数一并列出。不需要登录，需要本机安装 Chrome（无头模式）。
+
+使用方法：
+    python bench/bench_nav.py
+    python bench/bench_nav.py --url https://linux.do/latest --topics 20 --read 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from linux_do_guard import GuardedPage  # noqa: E402
+from linux_do_nav import Navigator, TopicPreloader  # noqa: E402
+
+MODES = (("reload", "整页加载"), ("spa", "前端路由"), ("preload", "预加载"))
+
+
+def launch_page():
+    from DrissionPage import ChromiumPage, ChromiumOptions
+
+    co = ChromiumOptions()
+    co.headless(True)
+    co.auto_port()
+    co.set_argument("--no-sandbox")
+    return ChromiumPage(co)
+
+
+def cpu_seconds(page):
+    """渲染进程累计 CPU 时间（秒）"""
+    metrics = page.run_cdp("Performance.getMetrics")["metrics"]
+    return next((m["value"] for m in metrics if m["name"] == "TaskDuration"), 0.0)
+
+
+def topic_urls(page, url, count):
+    page.get(url)
+    time.sleep(3)
+    hrefs = page.run_js(
+        "return [...document.querySelectorAll('a.raw-topic-link')].map(a => a.href);"
+    )
+    return list(dict.fromkeys(hrefs or []))[:count]
+
+
+def run_mode(page, start_url, urls, mode, read=1):
+    """依次打开 urls，每个停留 read 秒，返回 (每次耗时列表, 每次 CPU 时间列表, 整页加载次数)"""
+    nav = Navigator(page, start_url, enabled=mode == "spa", log=lambda msg: None)
+    preloader = TopicPreloader(page, log=lambda msg: None) if mode == "preload" else None
+    page.get(start_url)
+    time.sleep(3)
+    walls, cpus = [], []
+    for i, url in enumerate(urls):
+        if preloader:
+            page.run_cdp("Performance.enable")  # 切换后是新标签页
+        cpu = cpu_seconds(page)
+        start = time.perf_counter()
+        if not (preloader and preloader.take(url)):
+            nav.go(url)
+        walls.append(time.perf_counter() - start)
+        if preloader and i + 1 < len(urls):
+            preloader.start(urls[i + 1])
+        time.sleep(read)  # 计入跳转后的异步渲染，预加载模式下模拟阅读
+        cpus.append(cpu_seconds(page) - cpu)
+    if preloader:
+        preloader.discard()
+    return walls, cpus, nav.counts["reload"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="帖子跳转性能测试（整页加载 / 前端路由 / 后台预加载）")
+    parser.add_argument("--url", default="https://linux.do/latest", help="取帖子列表的页面")
+    parser.add_argument("--topics", type=int, default=10, help="打开的帖子数，默认 10")
+    parser.add_argument("--read", type=float, default=3, help="每个帖子停留秒数，默认 3")
+    args = parser.parse_args()
+
+    page = GuardedPage(launch_page())
+    try:
+        page.run_cdp("Performance.enable")
+        urls = topic_urls(page, args.url, args.topics)
+        if not urls:
+            print(f"没有从 {args.url} 取到帖子地址")
+            sys.exit(1)
+        print(f"帖子 {len(urls)} 个: {args.url}")
+        results = {}
+        for name, _ in MODES:
+            results[name] = run_mode(page, args.url, urls, name, args.read)
+    finally:
+        page.quit()
+
+    print()
+    print(f"  {'':<10}{'跳转中位数(ms)':>16}{'跳转合计(s)':>14}{'CPU/帖(ms)':>12}{'整页加载':>10}")
+    for name, label in MODES:
+        walls, cpus, reloads = results[name]
+        cpu = f"{statistics.mean(cpus) * 1000:.0f}" if name != "preload" else "-"
+        print(
+            f"  {label:<10}"
+            f"{statistics.median(walls) * 1000:>16.0f}"
+            f"{sum(walls):>14.1f}"
+            f"{cpu:>12}"
+            f"{reloads:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+低渲染开销模式性能测试
+
+分别在普通模式（1920x1080）和低渲染开销模式（linux_do_js.LowRenderMode）下
+启动无头浏览器，依次打开同一批帖子并模拟阅读（分几次向下滚动），统计每个帖子的：
+1. 浏览器 CPU 时间：浏览器进程及全部子进程（渲染、GPU/光栅化等）的 CPU 时间增量，
+   读取 /proc，仅 Linux 可用
+2. 渲染进程主线程 CPU 时间：CDP Performance.getMetrics 的 TaskDuration 增量
+
+不需要登录，需要本机安装 Chrome。
+
+使用方法：
+    python bench/bench_render.py
+    python bench/bench_render.py --url https://linux.do/latest --topics 10 --scrolls 8
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from linux_do_guard import process_tree  # noqa: E402
+from linux_do_js import LOW_RENDER_VIEWPORT, LowRenderMode  # noqa: E402
+
+MODES = (("normal", "普通模式"), ("low", "低渲染开销"))
+
+
+def launch_page(low_render):
+    from DrissionPage import ChromiumPage, ChromiumOptions
+
+    co = ChromiumOptions()
+    co.headless(True)
+    co.auto_port()
+    co.set_argument("--no-sandbox")
+    co.set_argument("--disable-gpu")
+    if low_render:
+        width, height = LOW_RENDER_VIEWPORT
+        co.set_argument(f"--window-size={width},{height}")
+        co.set_argument("--disable-smooth-scrolling")
+    else:
+        co.set_argument("--window-size=1920,1080")
+    page = ChromiumPage(co)
+    if low_render:
+        LowRenderMode().apply(page)
+    page.run_cdp("Performance.enable")
+    return page
+
+
+def process_cpu_seconds(pid):
+    """进程及全部子进程的 CPU 时间（秒），非 Linux 返回 None"""
+    tree = process_tree(pid)
+    if tree is None:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    return sum(int(fields[11]) + int(fields[12]) for fields in tree.values()) / ticks
+
+
+def task_seconds(page):
+    """渲染进程主线程累计 CPU 时间（秒）"""
+    metrics = page.run_cdp("Performance.getMetrics")["metrics"]
+    return next((m["value"] for m in metrics if m["name"] == "TaskDuration"), 0.0)
+
+
+def topic_urls(url, count):
+    page = launch_page(False)
+    try:
+        page.get(url)
+        time.sleep(3)
+        hrefs = page.run_js(
+            "return [...document.querySelectorAll('a.raw-topic-link')].map(a => a.href);"
+        )
+    finally:
+        page.quit()
+    return list(dict.fromkeys(hrefs or []))[:count]
+
+
+def run_mode(urls, low_render, scrolls):
+    """打开每个帖子并滚动阅读，返回 [(浏览器 CPU 秒或 None, 主线程 CPU 秒)]"""
+    page = launch_page(low_render)
+    pid = getattr(page, "process_id", None)
+    samples = []
+    try:
+        for url in urls:
+            cpu, task = process_cpu_seconds(pid), task_seconds(page)
+            page.get(url)
+            time.sleep(2)
+            for _ in range(scrolls):
+                page.run_js("window.scrollBy(0, 600)")
+                time.sleep(0.5)
+            after = process_cpu_seconds(pid)
+            samples.append((after - cpu if cpu is not None else None, task_seconds(page) - task))
+    finally:
+        page.quit()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="低渲染开销模式性能测试")
+    parser.add_argument("--url", default="https://linux.do/latest", help="取帖子列表的页面")
+    parser.add_argument("--topics", type=int, default=10, help="打开的帖子数，默认 10")
+    parser.add_argument("--scrolls", type=int, default=6, help="每个帖子滚动次数，默认 6")
+    args = parser.parse_args()
+
+    urls = topic_urls(args.url, args.topics)
+    if not urls:
+        print(f"没有从 {args.url} 取到帖子地址")
+        sys.exit(1)
+    print(f"帖子 {len(urls)} 个: {args.url}")
+
+    results = {}
+    for name, label in MODES:
+        print(f"测试{label}...")
+        results[name] = run_mode(urls, name == "low", args.scrolls)
+
+    def ms(values):
+        values = [v for v in values if v is not None]
+        return f"{statistics.median(values) * 1000:.0f}" if values else "-"
+
+    print()
+    print(f"  {'':<12}{'浏览器CPU/帖(ms)':>18}{'主线程CPU/帖(ms)':>18}")
+    for name, label in MODES:
+        samples = results[name]
+        print(f"  {label:<12}{ms(s[0] for s in samples):>18}{ms(s[1] for s in samples):>18}")
+
+    normal = [s[0] for s in results["normal"] if s[0] is not None]
+    low = [s[0] for s in results["low"] if s[0] is not None]
+    if normal and low:
+        saved = 1 - statistics.median(low) / statistics.median(normal)
+        print(f"低渲染开销模式浏览器 CPU 时间减少 {saved * 100:.0f}%（中位数）")
+
+
+if __name__ == "__main__":
+    main()
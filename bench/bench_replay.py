@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+录制回放回归测试 / 性能测试
+
+用 linux_do_record 录制的真实页面快照（GUI 版设置 LINUXDO_RECORD=目录，
+无头版加 --record 目录），在本地回放服务器上重新运行各提取函数：
+    板块页  GUI get_topics、无头版 get_topics
+    帖子页  GUI get_floor_info、旧版脚本 find_like_buttons
+    等级页  GUI get_level_info
+把结果与录制时的结果比较，并统计每个函数的耗时。等待时间全部跳过，全速运行。
+有不一致时退出码为 1，可用于页面结构变化后的回归检查。
+
+需要本机安装 Chrome（无头模式）。
+
+使用方法：
+    python bench/bench_replay.py recordings/2024-06-01
+    python bench/bench_replay.py recordings/2024-06-01 --repeat 5 --kind topic
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from replay_server import ReplayServer  # noqa: E402
+from bench_browse import scale_sleeps  # noqa: E402
+from linux_do_metrics import PhaseTimer  # noqa: E402
+
+LEVEL_KEYS = ("username", "level", "nextLevel", "requirements")
+
+
+def launch_page():
+    """启动回放用的无头浏览器（不加载图片，使用独立端口）"""
+    from DrissionPage import ChromiumPage, ChromiumOptions
+
+    co = ChromiumOptions()
+    co.headless(True)
+    co.auto_port()
+    co.set_argument("--blink-settings=imagesEnabled=false")
+    co.set_argument("--no-sandbox")
+    return ChromiumPage(co)
+
+
+class ReplayRunner:
+    """在回放页面上运行各提取函数并与录制结果比较"""
+
+    def __init__(self, server, page):
+        import linux_do_gui
+        import linux_do_headless
+        import linux_do_auto_browse
+        from linux_do_log import Logger
+
+        scale_sleeps((linux_do_gui, linux_do_headless, linux_do_auto_browse), 1e9)
+
+        self.server = server
+        self.page = page
+        self.timer = PhaseTimer()
+        self.failures = []
+
+        cfg = dict(linux_do_gui.CFG, base=server.url, connect=server.url + "/", proxy="")
+        self.gui = linux_do_gui.Bot(cfg, [], lambda msg: None)
+        self.gui.pg = page
+        self.headless = linux_do_headless.LinuxDoBot(
+            "replay", "replay", config={"base_url": server.url}, logger=Logger(console=False)
+        )
+        self.headless.page = page
+        linux_do_auto_browse._logger = Logger(console=False)
+        self.auto = linux_do_auto_browse.LinuxDoBot(page)
+
+    def check(self, record, name, actual, expected):
+        if expected is not None and actual != expected:
+            self.failures.append((record["file"], name, expected, actual))
+
+    def run(self, record):
+        kind, path, expect = record["kind"], record["path"], record.get("expect") or {}
+
+        if kind == "category":
+            cat = {"u": path, "n": path, "url": path, "name": path}
+            with self.timer.span("gui.get_topics"):
+                topics = self.gui.get_topics(cat)
+            self.check(record, "gui.get_topics", [t["url"] for t in topics], expect.get("topics"))
+            with self.timer.span("headless.get_topics"):
+                topics = self.headless.get_topics(cat)
+            self.check(record, "headless.get_topics", [t["url"] for t in topics], expect.get("topics"))
+
+        elif kind == "topic":
+            with self.timer.span("load"):
+                self.page.get(self.server.url + path)
+            with self.timer.span("gui.get_floor_info"):
+                floor = self.gui.get_floor_info()
+            self.check(record, "gui.get_floor_info", floor, expect.get("floor"))
+            with self.timer.span("auto.find_like_buttons"):
+                buttons = self.auto.find_like_buttons()
+            self.check(record, "auto.find_like_buttons", len(buttons), expect.get("like_buttons"))
+
+        elif kind == "connect":
+            self.gui.cfg["connect"] = self.server.url + path
+            with self.timer.span("gui.get_level_info"):
+                info = self.gui.get_level_info()
+            expected = expect.get("level")
+            if expected is not None:
+                expected = {k: expected.get(k) for k in LEVEL_KEYS}
+            actual = {k: (info or {}).get(k) for k in LEVEL_KEYS}
+            self.check(record, "gui.get_level_info", actual, expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制回放回归测试 / 性能测试")
+    parser.add_argument("directory", help="录制目录")
+    parser.add_argument("--repeat", type=int, default=1, help="重复次数（性能测试用），默认 1")
+    parser.add_argument("--kind", choices=("category", "topic", "connect"), help="只回放该类页面")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.directory).start()
+    records = [r for r in server.records if not args.kind or r["kind"] == args.kind]
+    print(f"回放 {len(records)} 个快照 × {args.repeat} 次: {server.url}")
+
+    page = launch_page()
+    try:
+        runner = ReplayRunner(server, page)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for record in records:
+                runner.run(record)
+        elapsed = time.perf_counter() - start
+    finally:
+        page.quit()
+        server.stop()
+
+    print(f"用时 {elapsed:.1f}s")
+    for line in runner.timer.report():
+        print(line)
+
+    # 同一快照重复回放时只报告一次
+    failures = list(dict.fromkeys((f, n, repr(e), repr(a)) for f, n, e, a in runner.failures))
+    if failures:
+        print(f"\n不一致 {len(failures)} 处:")
+        for file, name, expected, actual in failures:
+            print(f"  {file} {name}\n    录制: {expected}\n    回放: {actual}")
+        sys.exit(1)
+    print("\n全部一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""
+本地模拟论坛（Discourse 替身）
+
+只依赖标准库，提供脚本用到的全部页面结构，用于离线、可重复的性能测试：
+    /                   首页（登录后显示 #current-user）
+    /login              登录页（#login-account-name / #login-account-password / #login-button）
+    /session/bench      直接写入登录 Cookie 并跳转首页
+    /c/...              板块帖子列表（tr.topic-list-item，支持"回复"排序按钮，含置顶帖）
+    /t/topic/<id>       帖子页（点赞按钮、.timeline-replies / #topic-progress 楼层计数、回复编辑器）
+    /connect            等级页（h1 用户名和等级、h2 下一级、升级要求表格）
+
+帖子楼层按 20 层一批懒加载，和真实站点一样滚动到底部附近才请求下一批。
+每个请求都会按 latency 延迟响应，帖子楼层数在 posts 范围内按 seed 固定生成。
+
+使用方法：
+    python bench/mock_forum.py                       # 默认 http://127.0.0.1:8765
+    python bench/mock_forum.py --latency 0.2 --posts 50-300
+
+    forum = MockForum(latency=0.05).start()
+    forum.url             # http://127.0.0.1:<端口>
+    forum.counters        # 各类请求 / 点赞 / 回复计数
+    forum.stop()
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+USERNAME = "bench"
+POST_CHUNK = 20  # 每批加载的楼层数
+
+PAGE = """<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+header {{ position: sticky; top: 0; background: #fff; padding: 8px; border-bottom: 1px solid #ddd; }}
+main {{ max-width: 760px; margin: 0 auto; padding: 8px; }}
+.topic-post {{ border-bottom: 1px solid #eee; padding: 16px 0; }}
+.topic-post p {{ line-height: 1.6; }}
+.timeline-container {{ position: fixed; right: 16px; top: 120px; }}
+#topic-progress {{ position: fixed; right: 16px; bottom: 16px; }}
+#reply-control {{ position: fixed; left: 0; right: 0; bottom: 0; background: #f7f7f7; padding: 8px; display: none; }}
+#reply-control.open {{ display: block; }}
+</style></head>
+<body>
+<header>{user}</header>
+<main>{body}</main>
+{script}
+</body></html>"""
+
+USER_LOGGED_IN = (
+    '<div id="current-user"><a href="#"><img title="{name}" alt="{name}" src="data:,"></a></div>'
+)
+USER_LOGGED_OUT = '<button class="login-button" onclick="location.href=\'/login\'">登录</button>'
+
+LOGIN_BODY = """
+<input id="login-account-name" type="text">
+<input id="login-account-password" type="password">
+<button id="login-button" onclick="document.cookie='_t=1; path=/'; location.href='/';">登录</button>
+"""
+
+CATEGORY_SCRIPT = """<script>
+document.querySelector('th[data-sort-order="posts"] button').addEventListener('click', function () {
+    const body = document.querySelector('.topic-list tbody');
+    const rows = Array.from(body.querySelectorAll('tr.topic-list-item'));
+    rows.sort((a, b) => b.dataset.posts - a.dataset.posts);
+    rows.forEach(r => body.appendChild(r));
+});
+</script>"""
+
+TOPIC_SCRIPT = """<script>
+(function () {
+    const total = %(total)d, topicId = %(topic_id)d;
+    const stream = document.querySelector('.post-stream');
+    let loaded = stream.children.length, loading = false;
+
+    function currentFloor() {
+        const posts = stream.children;
+        const limit = window.innerHeight;
+        let current = 1;
+        for (let i = 0; i < posts.length; i++) {
+            if (posts[i].getBoundingClientRect().top < limit) current = i + 1;
+            else break;
+        }
+        return current;
+    }
+
+    function update() {
+        const current = currentFloor();
+        document.querySelector('.timeline-replies').textContent = current + ' / ' + total;
+        const spans = document.querySelectorAll('#topic-progress .nums span');
+        spans[0].textContent = current;
+        spans[2].textContent = total;
+        if (!loading && loaded < total &&
+            window.innerHeight + window.scrollY >= document.body.offsetHeight - 1500) {
+            loading = true;
+            fetch('/t/topic/' + topicId + '/posts?offset=' + loaded)
+                .then(r => r.text())
+                .then(html => {
+                    stream.insertAdjacentHTML('beforeend', html);
+                    loaded = stream.children.length;
+                    loading = false;
+                    update();
+                });
+        }
+    }
+
+    document.addEventListener('click', function (e) {
+        const like = e.target.closest('button.btn-toggle-reaction-like');
+        if (like && !like.classList.contains('has-like')) {
+            like.classList.add('has-like');
+            fetch('/like', {method: 'POST'});
+        }
+        if (e.target.closest('.topic-footer-main-buttons button.create')) {
+            document.querySelector('#reply-control').classList.add('open');
+        }
+        if (e.target.closest('#reply-control button.create')) {
+            const text = document.querySelector('#reply-control textarea').value;
+            fetch('/reply', {method: 'POST', body: text});
+            document.querySelector('#reply-control').classList.remove('open');
+        }
+    });
+
+    window.addEventListener('scroll', update, {passive: true});
+    update();
+})();
+</script>"""
+
+LEVEL_BODY = """
+<h1>你好，{name} ({name}) 1级用户</h1>
+<h2>信任级别 2 的要求</h2>
+<table>
+<tr><th>要求</th><th>当前</th><th>需要</th></tr>
+<tr><td>访问次数</td><td>12</td><td>50</td></tr>
+<tr><td>回复的话题</td><td>3</td><td>10</td></tr>
+<tr><td>浏览的话题</td><td>{topics}</td><td>500</td></tr>
+<tr><td>已读帖子</td><td>{floors}</td><td>20000</td></tr>
+<tr><td>点赞</td><td>{likes}</td><td>30</td></tr>
+</table>
+"""
+
+WORDS = (
+    "性能 浏览器 标签页 渲染 缓存 延迟 吞吐 内存 线程 队列 代理 脚本 "
+    "测试 数据 页面 网络 请求 响应 调度 监控 日志 配置 版本 部署"
+).split()
+
+
+class MockForum:
+    """本地模拟论坛服务器"""
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        posts=(20, 120),
+        topics_per_category=30,
+        seed=0,
+    ):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示自动分配
+            latency: 每个请求的响应延迟（秒）
+            jitter: 延迟随机抖动（±秒）
+            posts: 帖子楼层数范围 (最少, 最多)
+            topics_per_category: 每个板块的帖子数
+            seed: 随机种子，相同种子生成相同的帖子
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.posts = posts
+        self.topics_per_category = topics_per_category
+        self.seed = seed
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """在后台线程启动服务器，返回自身"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.forum = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-forum", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def reset_counters(self):
+        with self._lock:
+            self.counters = {}
+
+    # ------------------------------------------------------------------
+    # 数据生成（按 seed 固定）
+    # ------------------------------------------------------------------
+
+    def _rng(self, *key):
+        return random.Random(f"{self.seed}:{':'.join(map(str, key))}")
+
+    def topic_posts(self, topic_id):
+        """帖子总楼层数"""
+        return self._rng("posts", topic_id).randint(*self.posts)
+
+    def category_topics(self, path):
+        """板块帖子列表：[(id, 标题, 楼层数, 是否置顶)]"""
+        base = (sum(ord(c) for c in path) % 1000) * 1000
+        topics = []
+        for i in range(self.topics_per_category):
+            topic_id = base + i + 1
+            rng = self._rng("title", topic_id)
+            title = "".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8)))
+            topics.append((topic_id, f"{title} #{topic_id}", self.topic_posts(topic_id), i < 2))
+        return topics
+
+    def render_posts(self, topic_id, offset, limit=POST_CHUNK):
+        """渲染一批楼层"""
+        total = self.topic_posts(topic_id)
+        html = []
+        for n in range(offset + 1, min(total, offset + limit) + 1):
+            rng = self._rng("post", topic_id, n)
+            paragraphs = "".join(
+                "<p>" + "".join(rng.choice(WORDS) for _ in range(rng.randint(20, 60))) + "</p>"
+                for _ in range(rng.randint(1, 3))
+            )
+            html.append(
+                f'<article class="topic-post" id="post_{n}" data-post-number="{n}">'
+                f"<div class=\"cooked\">{paragraphs}</div>"
+                f'<nav class="post-menu-area"><div class="discourse-reactions-reaction-button">'
+                f'<button class="btn-toggle-reaction-like" title="点赞此帖子">♡</button>'
+                f"</div></nav></article>"
+            )
+        return "".join(html)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def forum(self):
+        return self.server.forum
+
+    def _delay(self):
+        forum = self.forum
+        if forum.latency or forum.jitter:
+            time.sleep(max(0.0, forum.latency + random.uniform(-forum.jitter, forum.jitter)))
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _page(self, title, body, script=""):
+        logged_in = "_t=" in self.headers.get("Cookie", "")
+        user = USER_LOGGED_IN.format(name=USERNAME) if logged_in else USER_LOGGED_OUT
+        self._send(200, PAGE.format(title=title, user=user, body=body, script=script))
+
+    def do_POST(self):
+        self._delay()
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        path = urlparse(self.path).path
+        if path in ("/like", "/reply"):
+            self.forum.count(path.strip("/") + "s")
+            self._send(200, "{}", "application/json")
+        else:
+            self._send(404, "not found", "text/plain")
+
+    def do_GET(self):
+        self._delay()
+        parsed = urlparse(self.path)
+        path = parsed.path
+        forum = self.forum
+        forum.count("requests")
+
+        if path == "/favicon.ico":
+            self._send(404, "", "text/plain")
+        elif path == "/":
+            forum.count("home")
+            self._page("首页", self._topic_table(forum.category_topics("/latest")), CATEGORY_SCRIPT)
+        elif path == "/login":
+            self._page("登录", LOGIN_BODY)
+        elif path == "/session/bench":
+            self._send(302, "", headers={"Location": "/", "Set-Cookie": "_t=1; Path=/"})
+        elif path.startswith("/c/"):
+            forum.count("category")
+            self._page("板块", self._topic_table(forum.category_topics(path)), CATEGORY_SCRIPT)
+        elif path == "/connect":
+            forum.count("connect")
+            body = LEVEL_BODY.format(
+                name=USERNAME,
+                topics=forum.counters.get("topic", 0),
+                floors=forum.counters.get("posts_loaded", 0),
+                likes=forum.counters.get("likes", 0),
+            )
+            self._page("等级", body)
+        else:
+            match = re.match(r"^/t/(?:[^/]+/)?(\d+)(/posts)?/?$", path)
+            if not match:
+                self._send(404, "not found", "text/plain")
+                return
+            topic_id = int(match.group(1))
+            if match.group(2):
+                offset = int(parse_qs(parsed.query).get("offset", ["0"])[0])
+                html = forum.render_posts(topic_id, offset)
+                forum.count("posts_loaded", html.count("<article"))
+                self._send(200, html)
+            else:
+                self._topic_page(topic_id)
+
+    def _topic_table(self, topics):
+        rows = "".join(
+            f'<tr class="topic-list-item{" pinned" if pinned else ""}" '
+            f'data-topic-id="{topic_id}" data-posts="{posts}">'
+            f'<td><a class="title raw-link raw-topic-link" href="/t/topic/{topic_id}">{title}</a></td>'
+            f"<td>{posts}</td></tr>"
+            for topic_id, title, posts, pinned in topics
+        )
+        return (
+            '<table class="topic-list"><thead><tr><th>话题</th>'
+            '<th data-sort-order="posts"><button>回复</button></th></tr></thead>'
+            f"<tbody>{rows}</tbody></table>"
+        )
+
+    def _topic_page(self, topic_id):
+        forum = self.forum
+        forum.count("topic")
+        total = forum.topic_posts(topic_id)
+        posts = forum.render_posts(topic_id, 0)
+        forum.count("posts_loaded", posts.count("<article"))
+        body = (
+            f"<h1>帖子 #{topic_id}</h1>"
+            f'<div class="post-stream">{posts}</div>'
+            '<div class="timeline-container"><div class="timeline-replies"></div></div>'
+            '<div id="topic-progress"><div class="nums"><span></span><span>/</span><span></span></div></div>'
+            '<div class="topic-footer-main-buttons"><button class="create">回复</button></div>'
+            '<div id="reply-control"><textarea class="d-editor-input"></textarea>'
+            '<button class="create">回复</button></div>'
+        )
+        script = TOPIC_SCRIPT % {"total": total, "topic_id": topic_id}
+        self._page(f"帖子 #{topic_id}", body, script)
+
+
+def parse_range(text):
+    """解析 "20-120" 形式的范围"""
+    low, _, high = text.partition("-")
+    return int(low), int(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟论坛")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口，默认 8765")
+    parser.add_argument("--latency", type=float, default=0.0, help="响应延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟抖动（±秒）")
+    parser.add_argument("--posts", default="20-120", help="帖子楼层数范围，默认 20-120")
+    parser.add_argument("--topics", type=int, default=30, help="每个板块的帖子数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    forum = MockForum(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        posts=parse_range(args.posts),
+        topics_per_category=args.topics,
+        seed=args.seed,
+    ).start()
+    print(f"模拟论坛已启动: {forum.url}（Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(forum.counters, ensure_ascii=False))
+        forum.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+录制回放服务器
+
+读取 linux_do_record.PageRecorder 录制的目录，按原路径提供页面快照和 .json 响应，
+其余请求（图片、样式等）直接返回 404，回放时不访问外网。
+
+使用方法：
+    python bench/replay_server.py recordings/2024-06-01          # 默认 http://127.0.0.1:8766
+    python bench/replay_server.py recordings/2024-06-01 --port 9000
+
+    server = ReplayServer("recordings/2024-06-01").start()
+    server.url
+    server.stop()
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from linux_do_record import load_manifest  # noqa: E402
+
+
+class ReplayServer:
+    """录制回放服务器"""
+
+    def __init__(self, directory, host="127.0.0.1", port=0, latency=0.0):
+        """
+        Args:
+            directory: 录制目录
+            host: 监听地址
+            port: 监听端口，0 表示自动分配
+            latency: 每个请求的响应延迟（秒）
+        """
+        self.directory = directory
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.records = load_manifest(directory)
+        self.routes = {}  # 路径 -> (文件, Content-Type)，同一路径以最后一次录制为准
+        for record in self.records:
+            self.routes[record["path"]] = (record["file"], "text/html; charset=utf-8")
+            for response in record.get("responses") or []:
+                self.routes.setdefault(
+                    response["path"], (response["file"], "application/json; charset=utf-8")
+                )
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """在后台线程启动服务器，返回自身"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.replay = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="replay", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def read(self, path):
+        """返回 (内容, Content-Type)，没有录制返回 None"""
+        route = self.routes.get(path) or self.routes.get(path.split("?")[0])
+        if not route:
+            return None
+        with open(os.path.join(self.directory, route[0]), "rb") as f:
+            return f.read(), route[1]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        replay = self.server.replay
+        if replay.latency:
+            time.sleep(replay.latency)
+        found = replay.read(self.path)
+        body, content_type = found or (b"", "text/plain")
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制回放服务器")
+    parser.add_argument("directory", help="录制目录")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8766, help="监听端口，默认 8766")
+    parser.add_argument("--latency", type=float, default=0.0, help="响应延迟（秒）")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.directory, args.host, args.port, args.latency).start()
+    print(f"回放服务器已启动: {server.url}（{len(server.records)} 个快照，Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
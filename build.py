@@ -2,10 +2,27 @@
 """
 Linux.do 刷帖助手 - 多平台打包脚本
 支持 Windows、macOS、Linux
+
+打包方式（--layout）：
+    onefile  单个可执行文件（默认）。每次启动都要先把整个程序解压到临时目录，冷启动较慢
+    onedir   一个目录（可执行文件 + 依赖文件），启动时不需要解压，不使用 UPX 压缩
+
+两种方式都会排除程序用不到的模块（EXCLUDE_MODULES），减小体积。
+用 bench/bench_build.py 比较两种方式的启动耗时和体积。
+
+打包目标（--target）：
+    gui       GUI 版（默认）
+    headless  无头版命令行程序，不包含 tkinter、Pillow、pystray，适合服务器/容器/CI
+
+使用方法：
+    python build.py
+    python build.py --layout onedir
+    python build.py --target headless
 """
 
 import os
 import sys
+import argparse
 import subprocess
 import shutil
 import platform
@@ -14,9 +31,37 @@ import platform
 APP_NAME = "LinuxDoHelper"
 APP_VERSION = "8.3"
 MAIN_SCRIPT = "linux_do_gui.py"
+HEADLESS_SCRIPT = "linux_do_headless.py"
+HEADLESS_NAME = f"{APP_NAME}_Headless"
 ICON_WIN = "icon.ico"  # Windows图标
 ICON_MAC = "icon.icns"  # macOS图标
 
+LAYOUTS = ("onefile", "onedir")
+LAYOUT = "onefile"  # 打包方式，由命令行参数 --layout 设置
+
+# 程序用不到的模块：测试套件、开发工具，以及 PIL/pystray 可能顺带引入的大型库
+EXCLUDE_MODULES = (
+    "test",
+    "tkinter.test",
+    "lib2to3",
+    "idlelib",
+    "pydoc_data",
+    "turtledemo",
+    "numpy",
+    "matplotlib",
+    "IPython",
+    "PIL.ImageQt",
+    "PyQt5",
+    "PyQt6",
+    "PySide2",
+    "PySide6",
+)
+
+# 无头版额外排除的 GUI 依赖
+HEADLESS_EXCLUDE_MODULES = ("tkinter", "_tkinter", "PIL", "pystray")
+
+PLATFORM_NAMES = {"windows": "Windows", "macos": "macOS", "linux": "Linux"}
+
 
 def get_platform():
     """获取当前平台"""
@@ -30,6 +75,26 @@ def get_platform():
     return system
 
 
+def layout_args():
+    """打包方式相关的 PyInstaller 参数"""
+    if LAYOUT == "onedir":
+        # UPX 压缩的动态库每次加载都要解压，onedir 追求启动速度，不使用
+        args = ["--onedir", "--noupx"]
+    else:
+        args = ["--onefile"]
+    for module in EXCLUDE_MODULES:
+        args.extend(["--exclude-module", module])
+    return args
+
+
+def output_path(name):
+    """打包输出的可执行文件路径"""
+    exe = name + (".exe" if get_platform() == "windows" else "")
+    if LAYOUT == "onedir":
+        return f"dist/{name}/{exe}"
+    return f"dist/{exe}"
+
+
 def clean_build():
     """清理构建目录"""
     dirs_to_clean = ["build", "dist", "__pycache__"]
@@ -53,7 +118,7 @@ def build_windows():
 
     cmd = [
         "pyinstaller",
-        "--onefile",
+        *layout_args(),
         "--windowed",
         "--name",
         f"{APP_NAME}_v{APP_VERSION}_Windows",
@@ -87,7 +152,7 @@ def build_windows():
     try:
         subprocess.run(cmd, check=True)
         print(f"\nWindows 版本打包成功!")
-        print(f"输出文件: dist/{APP_NAME}_v{APP_VERSION}_Windows.exe")
+        print(f"输出文件: {output_path(f'{APP_NAME}_v{APP_VERSION}_Windows')}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"打包失败: {e}")
@@ -102,7 +167,7 @@ def build_macos():
 
     cmd = [
         "pyinstaller",
-        "--onefile",
+        *layout_args(),
         "--windowed",
         "--name",
         f"{APP_NAME}_v{APP_VERSION}_macOS",
@@ -137,7 +202,7 @@ def build_macos():
     try:
         subprocess.run(cmd, check=True)
         print(f"\nmacOS 版本打包成功!")
-        print(f"输出文件: dist/{APP_NAME}_v{APP_VERSION}_macOS")
+        print(f"输出文件: {output_path(f'{APP_NAME}_v{APP_VERSION}_macOS')}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"打包失败: {e}")
@@ -152,7 +217,7 @@ def build_linux():
 
     cmd = [
         "pyinstaller",
-        "--onefile",
+        *layout_args(),
         "--windowed",
         "--name",
         f"{APP_NAME}_v{APP_VERSION}_Linux",
@@ -185,7 +250,40 @@ def build_linux():
     try:
         subprocess.run(cmd, check=True)
         print(f"\nLinux 版本打包成功!")
-        print(f"输出文件: dist/{APP_NAME}_v{APP_VERSION}_Linux")
+        print(f"输出文件: {output_path(f'{APP_NAME}_v{APP_VERSION}_Linux')}")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"打包失败: {e}")
+        return False
+
+
+def build_headless():
+    """打包无头版命令行程序（各平台通用）"""
+    print("\n" + "=" * 50)
+    print("开始打包无头版...")
+    print("=" * 50)
+
+    name = f"{HEADLESS_NAME}_v{APP_VERSION}_{PLATFORM_NAMES.get(get_platform(), get_platform())}"
+    cmd = [
+        "pyinstaller",
+        *layout_args(),
+        "--console",
+        "--name",
+        name,
+        "--hidden-import",
+        "DrissionPage",
+        "--clean",
+        "--noconfirm",
+    ]
+    for module in HEADLESS_EXCLUDE_MODULES:
+        cmd.extend(["--exclude-module", module])
+
+    cmd.append(HEADLESS_SCRIPT)
+
+    try:
+        subprocess.run(cmd, check=True)
+        print(f"\n无头版打包成功!")
+        print(f"输出文件: {output_path(name)}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"打包失败: {e}")
@@ -194,23 +292,40 @@ def build_linux():
 
 def main():
     """主函数"""
+    global LAYOUT
+
+    parser = argparse.ArgumentParser(description="Linux.do 刷帖助手打包工具")
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default=LAYOUT, help="打包方式：onefile（默认）或 onedir（启动更快）"
+    )
+    parser.add_argument(
+        "--target", choices=("gui", "headless"), default="gui", help="打包目标：gui（默认）或 headless（无头版）"
+    )
+    args = parser.parse_args()
+    LAYOUT = args.layout
+    script = HEADLESS_SCRIPT if args.target == "headless" else MAIN_SCRIPT
+
     print("=" * 50)
     print(f"Linux.do 刷帖助手 v{APP_VERSION} 打包工具")
     print("=" * 50)
 
     current_platform = get_platform()
     print(f"当前平台: {current_platform}")
+    print(f"打包目标: {args.target}")
+    print(f"打包方式: {LAYOUT}")
 
     # 检查主脚本是否存在
-    if not os.path.exists(MAIN_SCRIPT):
-        print(f"错误: 找不到主脚本 {MAIN_SCRIPT}")
+    if not os.path.exists(script):
+        print(f"错误: 找不到主脚本 {script}")
         sys.exit(1)
 
     # 清理旧的构建文件
     clean_build()
 
-    # 根据当前平台打包
-    if current_platform == "windows":
+    # 根据打包目标和当前平台打包
+    if args.target == "headless":
+        success = build_headless()
+    elif current_platform == "windows":
         success = build_windows()
     elif current_platform == "macos":
         success = build_macos()
@@ -228,6 +343,8 @@ def main():
         print("1. 运行程序需要安装 Chrome 浏览器")
         print("2. 首次运行可能需要允许防火墙访问")
         print("3. macOS/Linux 用户可能需要赋予执行权限: chmod +x <文件名>")
+        if LAYOUT == "onedir":
+            print("4. onedir 方式需要分发整个输出目录，不能只复制其中的可执行文件")
     else:
         print("\n打包失败，请检查错误信息")
         sys.exit(1)
@@ -18,7 +18,6 @@ import os
 import random
 import time
 import json
-from datetime import datetime
 from pathlib import Path
 
 # 设置UTF-8输出
@@ -27,11 +26,16 @@ if sys.platform == 'win32':
 
 from DrissionPage import ChromiumPage, ChromiumOptions
 
+from linux_do_log import Logger
+from linux_do_js import call_helper
+from linux_do_journal import Journal, topic_id_from_url
+from linux_do_proxy import ProxyPool, target_from_url
+
 # ==================== 配置区域 ====================
 
 class Config:
     """配置类"""
-    # 代理设置（如不需要代理，设为None）
+    # 代理设置（如不需要代理，设为None；多个代理用逗号分隔，启动时使用延迟最低的可用代理）
     PROXY = "127.0.0.1:7897"
 
     # 目标URL
@@ -56,21 +60,29 @@ class Config:
     # 日志文件
     LOG_FILE = "linux_do_browse.log"
 
+    # 结构化事件日志（JSON Lines，设为 None 则不写入）
+    JOURNAL_FILE = None
+
 
 # ==================== 日志工具 ====================
 
+_logger = None  # 第一次记录日志时创建（导入模块时不打开日志文件、不启动写线程）
+
+
+def get_logger():
+    """返回日志对象，第一次调用时创建"""
+    global _logger
+    if _logger is None:
+        _logger = Logger(debug=True, log_file=Config.LOG_FILE)
+    return _logger
+
+
 def log(message, level="INFO"):
-    """记录日志"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_line = f"[{timestamp}] [{level}] {message}"
-    print(log_line)
+    """记录日志（由后台线程写入控制台和日志文件）"""
+    get_logger().log(level, message)
 
-    # 写入日志文件
-    try:
-        with open(Config.LOG_FILE, 'a', encoding='utf-8') as f:
-            f.write(log_line + '\n')
-    except:
-        pass
+
+_journal = Journal(Config.JOURNAL_FILE, bot="auto")
 
 
 # ==================== 浏览器管理 ====================
@@ -87,10 +99,13 @@ class BrowserManager:
 
         co = ChromiumOptions()
 
-        # 设置代理
+        # 设置代理（启动前探测，使用延迟最低的可用代理）
         if Config.PROXY:
-            co.set_proxy(Config.PROXY)
-            log(f"已设置代理: {Config.PROXY}")
+            proxy = ProxyPool(
+                Config.PROXY, target=target_from_url(Config.BASE_URL), log=lambda m: log(m, "WARNING")
+            ).best()
+            co.set_proxy(proxy)
+            log(f"已设置代理: {proxy}")
 
         # 反检测设置
         co.set_argument('--disable-blink-features=AutomationControlled')
@@ -125,6 +140,7 @@ class LinuxDoBot:
         self.page = page
         self.visited_topics = set()  # 已访问的帖子
         self.liked_posts = set()     # 已点赞的帖子
+        self.current_topic_id = None  # 当前帖子 ID（写入事件日志用）
         self.stats = {
             "topics_viewed": 0,
             "posts_liked": 0,
@@ -171,7 +187,8 @@ class LinuxDoBot:
             login_btn.click()
             log("已点击登录按钮，请在浏览器中完成登录")
 
-        # 等待用户输入
+        # 等待用户输入（先输出完已排队的日志）
+        get_logger().flush()
         input("按回车键继续...")
 
         # 再次检查登录状态
@@ -188,25 +205,7 @@ class LinuxDoBot:
         topics = []
 
         # 使用JS获取帖子信息
-        topic_data = self.page.run_js("""
-        function getTopics() {
-            const links = document.querySelectorAll('.topic-list a.title');
-            const topics = [];
-            links.forEach(a => {
-                const href = a.href;
-                const title = a.textContent.trim();
-                // 过滤掉分类链接，只保留帖子链接
-                if (href && href.includes('/t/topic/') && title) {
-                    topics.push({
-                        url: href,
-                        title: title.substring(0, 50)
-                    });
-                }
-            });
-            return topics;
-        }
-        return getTopics();
-        """)
+        topic_data = call_helper(self.page, "topicLinks")
 
         if topic_data:
             topics = topic_data
@@ -236,9 +235,7 @@ class LinuxDoBot:
             time.sleep(random.uniform(*Config.SCROLL_INTERVAL))
 
             # 检查是否到底部
-            at_bottom = self.page.run_js("""
-            return (window.innerHeight + window.scrollY) >= document.body.offsetHeight - 100;
-            """)
+            at_bottom = call_helper(self.page, "atBottom")
 
             if at_bottom:
                 log("已滚动到页面底部")
@@ -246,45 +243,17 @@ class LinuxDoBot:
 
         self.stats["scroll_count"] += scroll_count
         log(f"滚动完成，共滚动 {scroll_count} 次")
+        _journal.event(
+            "scroll",
+            topic_id=self.current_topic_id,
+            scrolls=scroll_count,
+            dur=round(time.time() - start_time, 3),
+        )
 
     def find_like_buttons(self):
         """查找所有点赞按钮"""
         # 使用JS查找点赞按钮，更可靠
-        buttons_info = self.page.run_js("""
-        function findLikeButtons() {
-            // 多种选择器尝试
-            const selectors = [
-                'button.btn-toggle-reaction-like',
-                '.discourse-reactions-reaction-button button',
-                'button[title="点赞此帖子"]',
-                '.post-menu-area button.reaction-button'
-            ];
-
-            let buttons = [];
-            for (const sel of selectors) {
-                const found = document.querySelectorAll(sel);
-                if (found.length > 0) {
-                    found.forEach((btn, idx) => {
-                        // 检查是否已点赞
-                        const hasLiked = btn.classList.contains('has-like') ||
-                                        btn.classList.contains('my-likes') ||
-                                        btn.closest('.discourse-reactions-reaction-button')?.classList.contains('has-used');
-
-                        buttons.push({
-                            index: idx,
-                            selector: sel,
-                            hasLiked: hasLiked,
-                            title: btn.title || '',
-                            visible: btn.offsetParent !== null
-                        });
-                    });
-                    break;  // 找到就停止
-                }
-            }
-            return buttons;
-        }
-        return findLikeButtons();
-        """)
+        buttons_info = call_helper(self.page, "likeButtons")
 
         return buttons_info or []
 
@@ -310,35 +279,13 @@ class LinuxDoBot:
                 return False
 
             # 使用JS点击按钮
-            clicked = self.page.run_js(f"""
-            function clickLikeButton(index) {{
-                const selectors = [
-                    'button.btn-toggle-reaction-like',
-                    '.discourse-reactions-reaction-button button',
-                    'button[title="点赞此帖子"]',
-                    '.post-menu-area button.reaction-button'
-                ];
-
-                for (const sel of selectors) {{
-                    const buttons = document.querySelectorAll(sel);
-                    if (buttons.length > index) {{
-                        const btn = buttons[index];
-                        // 滚动到按钮位置
-                        btn.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                        // 等待一下再点击
-                        setTimeout(() => btn.click(), 300);
-                        return true;
-                    }}
-                }}
-                return false;
-            }}
-            return clickLikeButton({button_index});
-            """)
+            clicked = call_helper(self.page, "clickLikeButton", button_index)
 
             if clicked:
                 time.sleep(1)  # 等待点赞动画
                 self.stats["posts_liked"] += 1
                 log(f"成功点赞帖子 #{button_index + 1}")
+                _journal.event("like", topic_id=self.current_topic_id, index=button_index)
                 return True
             else:
                 log(f"点击点赞按钮失败", "DEBUG")
@@ -347,11 +294,13 @@ class LinuxDoBot:
         except Exception as e:
             log(f"点赞失败: {e}", "ERROR")
             self.stats["errors"] += 1
+            _journal.event("error", where="like", error=str(e))
             return False
 
     def browse_topic(self, topic_url, topic_title):
         """浏览单个帖子"""
         log(f"正在浏览: {topic_title}")
+        self.current_topic_id = topic_id_from_url(topic_url)
 
         try:
             # 访问帖子
@@ -393,6 +342,7 @@ class LinuxDoBot:
         except Exception as e:
             log(f"浏览帖子失败: {e}", "ERROR")
             self.stats["errors"] += 1
+            _journal.event("error", where="browse_topic", topic_id=self.current_topic_id, error=str(e))
             return False
 
     def run_session(self):
@@ -400,6 +350,9 @@ class LinuxDoBot:
         log("=" * 50)
         log("开始新的浏览会话")
         log("=" * 50)
+        session_start = time.time()
+        _journal.new_run()
+        _journal.event("run_start", category=Config.CATEGORY_URL)
 
         # 检查登录状态
         if not self.check_login_status():
@@ -435,7 +388,10 @@ class LinuxDoBot:
         for i, topic in enumerate(new_topics[:num_to_browse]):
             log(f"\n--- 帖子 {i + 1}/{num_to_browse} ---")
 
-            self.browse_topic(topic['url'], topic['title'])
+            liked_before = self.stats["posts_liked"]
+            with _journal.span("topic", topic_id=topic_id_from_url(topic['url']), url=topic['url']) as ev:
+                ev["ok"] = self.browse_topic(topic['url'], topic['title'])
+                ev["likes"] = self.stats["posts_liked"] - liked_before
 
             # 帖子之间等待
             if i < num_to_browse - 1:
@@ -445,6 +401,7 @@ class LinuxDoBot:
 
         # 输出统计
         self.print_stats()
+        _journal.event("run_end", dur=round(time.time() - session_start, 1), **self.stats)
 
         return True
 
@@ -492,6 +449,7 @@ def main():
 
     except Exception as e:
         log(f"发生错误: {e}", "ERROR")
+        get_logger().flush()
         import traceback
         traceback.print_exc()
 
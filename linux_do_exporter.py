@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+运行指标导出
+
+把无头版的运行数据导出为 Prometheus 文本格式，供监控系统采集：
+    - 写入 textfile（node_exporter 的 textfile collector 可直接读取），原子替换
+    - 或在本地端口提供 HTTP /metrics
+
+update() 只保存对统计数据的引用，写文件有最小间隔，每个帖子调用一次也几乎没有开销；
+指标在被读取（写文件 / HTTP 请求）时才生成。守护进程模式下每次运行结束调用
+end_run()，把本次数据累加进总计，计数器在多次运行之间保持单调递增。
+
+用法：
+    exporter = MetricsExporter("user", textfile="/var/lib/node_exporter/linuxdo.prom", port=9105)
+    exporter.update(stats=bot.stats, timer=bot.timer, memory=point)   # 每个帖子
+    exporter.end_run(duration=..., ok=True)                           # 每次运行结束
+    exporter.close()
+"""
+
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from linux_do_metrics import BUCKETS
+
+PREFIX = "linuxdo"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# stats 字段 -> (指标名, 说明)
+COUNTERS = {
+    "topics": ("topics_total", "浏览帖子数"),
+    "floors": ("floors_total", "滚动/爬楼数"),
+    "likes": ("likes_total", "点赞数"),
+    "errors": ("errors_total", "出错次数"),
+}
+
+# 数值指标说明
+GAUGES = {
+    "login_duration_seconds": "最近一次登录耗时",
+    "run_duration_seconds": "最近一次运行耗时",
+    "last_run_timestamp_seconds": "最近一次运行结束时间",
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _merge_phases(phases, timer):
+    """把 PhaseTimer 的直方图累加进 {阶段: [桶计数, 合计秒, 次数]}"""
+    for phase, stats in list(timer.phases.items()):
+        merged = phases.setdefault(phase, [[0] * len(stats.buckets), 0.0, 0])
+        merged[0] = [a + b for a, b in zip(merged[0], stats.buckets)]
+        merged[1] += stats.total
+        merged[2] += stats.count
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsExporter:
+    """运行指标导出（Prometheus 文本格式）"""
+
+    def __init__(self, account, textfile=None, port=0, host="127.0.0.1", min_interval=5):
+        """
+        Args:
+            account: 账号名，作为 account 标签
+            textfile: 指标文件路径，可选
+            port: HTTP 端口，0 表示不开启
+            host: HTTP 监听地址
+            min_interval: 两次写文件的最小间隔（秒）
+        """
+        self.account = account
+        self.textfile = textfile
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_write = 0
+
+        # 已结束运行的累计值
+        self._totals = {key: 0 for key in COUNTERS}
+        self._recoveries = {}
+        self._phases = {}  # 阶段 -> [桶计数列表, 合计秒, 次数]
+        self._runs = {"ok": 0, "failed": 0}
+
+        # 当前运行
+        self._stats = {}
+        self._timer = None
+        self._current_recoveries = {}
+        self._memory = None
+        self._gauges = {}
+
+        self._server = None
+        if port:
+            self._server = ThreadingHTTPServer((host, port), _Handler)
+            self._server.daemon_threads = True
+            self._server.exporter = self
+            threading.Thread(
+                target=self._server.serve_forever, name="metrics-http", daemon=True
+            ).start()
+
+    def update(self, stats=None, timer=None, recoveries=None, memory=None, **gauges):
+        """
+        更新当前运行的数据（只保存引用）
+
+        Args:
+            stats: 统计字典（topics/floors/likes/errors）
+            timer: PhaseTimer
+            recoveries: 看门狗恢复计数
+            memory: MemoryMonitor 采样点
+            gauges: 其余数值指标，如 login_duration_seconds=3.2
+        """
+        with self._lock:
+            if stats is not None:
+                self._stats = stats
+            if timer is not None:
+                self._timer = timer
+            if recoveries is not None:
+                self._current_recoveries = recoveries
+            if memory:
+                self._memory = memory
+            self._gauges.update(gauges)
+        if self.textfile and time.time() - self._last_write >= self.min_interval:
+            self.flush()
+
+    def end_run(self, duration, ok=True):
+        """一次运行结束：把本次数据累加进总计"""
+        with self._lock:
+            for key in self._totals:
+                self._totals[key] += self._stats.get(key, 0)
+            for key, value in self._current_recoveries.items():
+                self._recoveries[key] = self._recoveries.get(key, 0) + value
+            if self._timer:
+                _merge_phases(self._phases, self._timer)
+            self._runs["ok" if ok else "failed"] += 1
+            self._gauges["run_duration_seconds"] = duration
+            self._gauges["last_run_timestamp_seconds"] = time.time()
+            self._stats = {}
+            self._timer = None
+            self._current_recoveries = {}
+        if self.textfile:
+            self.flush()
+
+    def render(self):
+        """生成指标文本"""
+        account = self.account
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            full = f"{PREFIX}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{full}{suffix}{_labels(account=account, **labels)} {_number(value)}")
+
+        with self._lock:
+            for key, (name, help_text) in COUNTERS.items():
+                value = self._totals[key] + self._stats.get(key, 0)
+                metric(name, "counter", help_text, [("", {}, value)])
+
+            metric(
+                "runs_total",
+                "counter",
+                "运行次数",
+                [("", {"result": r}, n) for r, n in self._runs.items()],
+            )
+
+            recoveries = dict(self._recoveries)
+            for key, value in self._current_recoveries.items():
+                recoveries[key] = recoveries.get(key, 0) + value
+            if recoveries:
+                metric(
+                    "recoveries_total",
+                    "counter",
+                    "看门狗恢复次数",
+                    [("", {"kind": k}, v) for k, v in sorted(recoveries.items())],
+                )
+
+            phases = {p: [list(b), s, c] for p, (b, s, c) in self._phases.items()}
+            if self._timer:
+                _merge_phases(phases, self._timer)
+            if phases:
+                samples = []
+                for phase, (buckets, total, count) in sorted(phases.items()):
+                    running = 0
+                    for bound, n in zip(BUCKETS + (float("inf"),), buckets):
+                        running += n
+                        samples.append(("_bucket", {"phase": phase, "le": _number(bound)}, running))
+                    samples.append(("_sum", {"phase": phase}, round(total, 3)))
+                    samples.append(("_count", {"phase": phase}, count))
+                metric("phase_duration_seconds", "histogram", "各阶段耗时", samples)
+
+            if self._memory:
+                metric(
+                    "browser_js_heap_bytes",
+                    "gauge",
+                    "JS 堆使用量",
+                    [("", {}, int(self._memory["heap_mb"] * 1048576))],
+                )
+                if self._memory.get("rss_mb") is not None:
+                    metric(
+                        "browser_rss_bytes",
+                        "gauge",
+                        "浏览器进程内存",
+                        [("", {}, int(self._memory["rss_mb"] * 1048576))],
+                    )
+
+            for name, value in sorted(self._gauges.items()):
+                metric(name, "gauge", GAUGES.get(name, name), [("", {}, round(value, 3))])
+
+        lines.append("")
+        return "\n".join(lines)
+
+    def flush(self):
+        """写入指标文件（先写临时文件再替换，采集方不会读到半个文件）"""
+        if not self.textfile:
+            return
+        self._last_write = time.time()
+        tmp = f"{self.textfile}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp, self.textfile)
+        except OSError:
+            pass  # 写文件失败不影响运行
+
+    def close(self):
+        self.flush()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
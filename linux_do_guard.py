@@ -0,0 +1,497 @@
+# -*- coding: utf-8 -*-
+"""
+浏览器看门狗
+
+为页面对象的导航和 JS 调用加上单次操作截止时间。
+页面卡死或渲染进程崩溃时，自动回收标签页；标签页也无法恢复时重启浏览器，
+并重新接管会话，调用方的统计数据不受影响。
+
+另外提供 MemoryMonitor：在帖子之间采样 JS 堆和浏览器进程内存，
+超过阈值或帖子数上限时换一个新标签页，避免长时间运行时内存持续上涨。
+
+用法：
+    page = GuardedPage(ChromiumPage(co), launch=重启浏览器回调, restore=恢复会话回调)
+    page.get(url)      # 超时/崩溃后自动恢复并重试一次
+    page.run_js(js)    # 超时/崩溃后自动恢复，并抛出异常让调用方跳过当前帖子
+
+    # 每次操作前调用 relaunch_when，返回重启原因时（如当前代理已失效）立即重启浏览器
+    page = GuardedPage(ChromiumPage(co), launch=..., relaunch_when=pool_failed)
+
+    mem = MemoryMonitor(page, log=print, heap_limit_mb=512, topic_limit=150)
+    mem.at_boundary(topics)   # 每个帖子开始前调用
+"""
+
+import os
+import threading
+import time
+
+# 各类操作的默认截止时间（秒）
+DEADLINES = {
+    "get": 45,
+    "run_js": 15,
+    "ele": 20,
+}
+
+# relaunch_when 触发的重启失败后，同一原因再次重启前的等待时间（秒，逐次翻倍）
+RELAUNCH_BACKOFF = (30, 600)
+
+# 表示标签页/浏览器已失效的 DrissionPage 异常名
+_DEAD_ERRORS = (
+    "PageDisconnectedError",
+    "ContextLostError",
+    "BrowserConnectError",
+    "TargetCrashedError",
+)
+
+
+class OperationTimeout(Exception):
+    """浏览器操作超过截止时间"""
+
+
+class BrowserRelaunched(Exception):
+    """操作前按 relaunch_when 重启了浏览器，原页面状态已丢失"""
+
+
+def call_with_deadline(fn, args=(), kwargs=None, timeout=None):
+    """在截止时间内执行 fn，超时抛出 OperationTimeout（原调用在后台线程中被放弃）"""
+    kwargs = kwargs or {}
+    if not timeout:
+        return fn(*args, **kwargs)
+
+    result = {}
+
+    def target():
+        try:
+            result["value"] = fn(*args, **kwargs)
+        except BaseException as e:
+            result["error"] = e
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise OperationTimeout(f"操作超过 {timeout}s 未返回")
+    if "error" in result:
+        raise result["error"]
+    return result.get("value")
+
+
+def is_dead_error(e):
+    """判断异常是否表示标签页或浏览器已失效"""
+    if isinstance(e, OperationTimeout):
+        return True
+    name = type(e).__name__
+    return name in _DEAD_ERRORS or "crash" in str(e).lower()
+
+
+def recovery_summary(counters):
+    """恢复计数的单行描述"""
+    return (
+        f"超时 {counters.get('timeouts', 0)} 次，崩溃 {counters.get('crashes', 0)} 次，"
+        f"回收标签页 {counters.get('tab_recycles', 0)} 次，"
+        f"重启浏览器 {counters.get('relaunches', 0)} 次"
+    )
+
+
+class GuardedPage:
+    """带看门狗的页面代理，其余属性和方法原样转发给当前标签页"""
+
+    def __init__(
+        self,
+        page,
+        launch=None,
+        restore=None,
+        log=None,
+        deadlines=None,
+        counters=None,
+        relaunch_when=None,
+    ):
+        """
+        Args:
+            page: ChromiumPage 对象
+            launch: 重启浏览器的回调，返回新的 ChromiumPage
+            restore: 切换标签页或重启后恢复会话的回调（如重新登录）
+            log: 日志函数
+            deadlines: 各操作截止时间，覆盖 DEADLINES
+            counters: 恢复计数字典，传入后可跨浏览器实例累计
+            relaunch_when: 每次操作前调用（不应有副作用），返回重启原因（字符串或 True）时
+                           立即重启浏览器（如当前代理已失效），恢复时也不再尝试回收标签页；
+                           重启失败后同一原因按 RELAUNCH_BACKOFF 退避，不会每次操作都重启
+        """
+        self._root = page
+        self._tab = page
+        self._launch = launch
+        self._restore = restore
+        self._relaunch_when = relaunch_when
+        self._failed_reason = None  # 上次重启失败的原因，退避期间不再因此重启
+        self._retry_at = 0
+        self._backoff = 0
+        self._log = log or print
+        self._recovering = False
+        self.deadlines = {**DEADLINES, **(deadlines or {})}
+        self.recoveries = counters if counters is not None else {}
+        for key in ("timeouts", "crashes", "tab_recycles", "relaunches"):
+            self.recoveries.setdefault(key, 0)
+
+    def __getattr__(self, name):
+        return getattr(self._tab, name)
+
+    @property
+    def raw(self):
+        """当前标签页对象"""
+        return self._tab
+
+    # ------------------------------------------------------------------
+    # 浏览器级操作（始终作用于根页面）
+    # ------------------------------------------------------------------
+
+    @property
+    def tabs_count(self):
+        return self._root.tabs_count
+
+    @property
+    def process_id(self):
+        """浏览器进程号（标签页对象没有这个属性，换过标签页后也要从根页面读取）"""
+        return getattr(self._root, "process_id", None)
+
+    def new_tab(self, *args, **kwargs):
+        return self._root.new_tab(*args, **kwargs)
+
+    def close_tabs(self, *args, **kwargs):
+        return self._root.close_tabs(*args, **kwargs)
+
+    def quit(self, *args, **kwargs):
+        return self._root.quit(*args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 受看门狗保护的操作
+    # ------------------------------------------------------------------
+
+    def get(self, url, *args, **kwargs):
+        return self._guard("get", url, *args, retry=True, **kwargs)
+
+    def run_js(self, script, *args, **kwargs):
+        return self._guard("run_js", script, *args, **kwargs)
+
+    def ele(self, locator, *args, **kwargs):
+        return self._guard("ele", locator, *args, **kwargs)
+
+    def _guard(self, op, *args, retry=False, **kwargs):
+        # 浏览器已不可用（如代理失效）时先重启；导航照常进行，其余操作的页面已不存在
+        reason = None if self._recovering else self._relaunch_reason()
+        if reason:
+            self._log(f"[看门狗] {reason}，{op} 前重启浏览器")
+            if self.recover(relaunch=True):
+                self._failed_reason, self._backoff = None, 0
+                if not retry:
+                    raise BrowserRelaunched(f"{op} 前已重启浏览器")
+            else:
+                low, high = RELAUNCH_BACKOFF
+                self._backoff = min(max(self._backoff * 2, low), high)
+                self._failed_reason = reason
+                self._retry_at = time.time() + self._backoff
+                self._log(f"[看门狗] 重启失败，{self._backoff}s 后再重试")
+
+        # 截止时间需覆盖调用方自己传入的等待时间
+        timeout = self.deadlines.get(op)
+        if timeout and isinstance(kwargs.get("timeout"), (int, float)):
+            timeout = max(timeout, kwargs["timeout"] + 10)
+
+        try:
+            return call_with_deadline(getattr(self._tab, op), args, kwargs, timeout)
+        except Exception as e:
+            if self._recovering or not is_dead_error(e):
+                raise
+            if isinstance(e, OperationTimeout):
+                self.recoveries["timeouts"] += 1
+                self._log(f"[看门狗] {op} 超时: {e}")
+            else:
+                self.recoveries["crashes"] += 1
+                self._log(f"[看门狗] 标签页失效: {e}")
+            self.recover()
+            if not retry:
+                raise
+            return call_with_deadline(getattr(self._tab, op), args, kwargs, timeout)
+
+    # ------------------------------------------------------------------
+    # 恢复
+    # ------------------------------------------------------------------
+
+    def recycle_tab(self):
+        """打开新标签页替换当前标签页，返回是否成功"""
+        old = self._tab
+        try:
+            tab = call_with_deadline(self._root.new_tab, timeout=self.deadlines["get"])
+        except Exception as e:
+            self._log(f"[看门狗] 新建标签页失败: {e}")
+            return False
+
+        self._tab = tab
+        self.recoveries["tab_recycles"] += 1
+        try:
+            call_with_deadline(
+                self._root.close_tabs, (old.tab_id,), timeout=self.deadlines["run_js"]
+            )
+        except Exception:
+            pass  # 旧标签页可能已经不存在
+        return True
+
+    def swap_tab(self, tab):
+        """切换到已打开好的标签页（如后台预加载的帖子），关闭原标签页"""
+        old = self._tab
+        self._tab = tab
+        try:
+            call_with_deadline(self._root.activate_tab, (tab,), timeout=self.deadlines["run_js"])
+        except Exception:
+            pass  # 无头模式下不影响使用
+        try:
+            call_with_deadline(
+                self._root.close_tabs, (old.tab_id,), timeout=self.deadlines["run_js"]
+            )
+        except Exception:
+            pass
+
+    def relaunch(self):
+        """重启浏览器，返回是否成功"""
+        if not self._launch:
+            return False
+        try:
+            self._root.quit()
+        except Exception:
+            pass
+        page = self._launch()
+        if not page:
+            return False
+        self._root = self._tab = page
+        self.recoveries["relaunches"] += 1
+        return True
+
+    def restart(self, between=None):
+        """
+        主动关闭并重新启动浏览器，然后恢复会话；不计入恢复次数，返回是否成功
+
+        Args:
+            between: 浏览器关闭后、重新启动前调用（如把内存盘用户数据目录写回磁盘）
+        """
+        if not self._launch:
+            return False
+        try:
+            self._root.quit()
+        except Exception:
+            pass
+        if between:
+            between()
+        page = self._launch()
+        if not page:
+            return False
+        self._root = self._tab = page
+        if self._restore:
+            self._recovering = True
+            try:
+                self._restore()
+            except Exception as e:
+                self._log(f"[看门狗] 恢复会话失败: {e}")
+            finally:
+                self._recovering = False
+        return True
+
+    def _relaunch_reason(self):
+        """relaunch_when 给出的重启原因，不需要重启或仍在退避期间返回 None"""
+        if not self._relaunch_when:
+            return None
+        try:
+            reason = self._relaunch_when()
+        except Exception:
+            return None
+        if not reason:
+            return None
+        reason = reason if isinstance(reason, str) else "需要重启浏览器"
+        if reason == self._failed_reason and time.time() < self._retry_at:
+            return None
+        return reason
+
+    def recover(self, relaunch=None):
+        """
+        回收标签页，必要时重启浏览器，然后恢复会话
+
+        Args:
+            relaunch: 为 True 时不回收标签页、直接重启浏览器；默认按 relaunch_when 判断
+        """
+        if relaunch is None:
+            relaunch = self._relaunch_reason() is not None
+        self._recovering = True
+        try:
+            if not relaunch and self.recycle_tab():
+                self._log("[看门狗] 已切换到新标签页")
+            elif self.relaunch():
+                self._log("[看门狗] 浏览器已重启")
+            else:
+                self._log("[看门狗] 浏览器恢复失败")
+                return False
+
+            if self._restore:
+                try:
+                    self._restore()
+                except Exception as e:
+                    self._log(f"[看门狗] 恢复会话失败: {e}")
+            return True
+        finally:
+            self._recovering = False
+
+    def summary(self):
+        """恢复统计的单行描述"""
+        return recovery_summary(self.recoveries)
+
+
+# ============================================================================
+# 内存监控
+# ============================================================================
+
+
+def process_tree(pid):
+    """
+    进程及其全部子进程的 /proc/<pid>/stat 字段，仅 Linux 可用，其余平台返回 None
+
+    Returns:
+        dict: {pid: stat 中 comm 之后的字段列表}，第 0 项为 state，第 1 项为 ppid，
+              第 11、12 项为 utime、stime（单位为 SC_CLK_TCK）
+    """
+    if not pid or not os.path.isdir("/proc"):
+        return None
+
+    stats = {}
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # 格式: pid (comm) state ppid ...，comm 中可能有空格
+                fields = f.read().rsplit(b")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+            stats[int(entry)] = fields
+        except (OSError, ValueError, IndexError):
+            continue
+
+    tree = {}
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        if current in stats:
+            tree[current] = stats[current]
+    return tree
+
+
+def _process_rss_mb(pid):
+    """浏览器进程及其全部子进程的 RSS 之和（MB），仅 Linux 可用，其余平台返回 None"""
+    tree = process_tree(pid)
+    if tree is None:
+        return None
+
+    total_kb = 0
+    for current in tree:
+        try:
+            with open(f"/proc/{current}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError, IndexError):
+            continue
+    return round(total_kb / 1024, 1)
+
+
+class MemoryMonitor:
+    """内存监控：通过 CDP Performance 指标采样内存，并在帖子边界回收标签页"""
+
+    def __init__(self, page, log=None, heap_limit_mb=512, topic_limit=150, log_every=10):
+        """
+        Args:
+            page: GuardedPage 对象
+            log: 日志函数
+            heap_limit_mb: JS 堆超过该值（MB）时回收标签页，0 表示不限
+            topic_limit: 同一标签页浏览超过该帖子数时回收，0 表示不限
+            log_every: 每隔多少个帖子把采样写入日志
+        """
+        self.page = page
+        self._log = log or print
+        self.heap_limit_mb = heap_limit_mb
+        self.topic_limit = topic_limit
+        self.log_every = max(1, log_every)
+        self.samples = []  # 内存曲线：[{t, topics, heap_mb, heap_total_mb, rss_mb}]
+        self.recycles = 0
+        self._start = time.time()
+        self._enabled_tab = None
+        self._tab_topics = 0
+
+    def sample(self, topics):
+        """采样一次内存，返回采样点，失败返回 None"""
+        try:
+            tab = getattr(self.page, "raw", self.page)
+            if self._enabled_tab is not tab:
+                self.page.run_cdp("Performance.enable")
+                self._enabled_tab = tab
+            metrics = self.page.run_cdp("Performance.getMetrics") or {}
+        except Exception as e:
+            self._log(f"[内存] 采样失败: {e}")
+            return None
+
+        values = {m.get("name"): m.get("value", 0) for m in metrics.get("metrics", [])}
+        point = {
+            "t": round(time.time() - self._start, 1),
+            "topics": topics,
+            "heap_mb": round(values.get("JSHeapUsedSize", 0) / 1048576, 1),
+            "heap_total_mb": round(values.get("JSHeapTotalSize", 0) / 1048576, 1),
+            "rss_mb": _process_rss_mb(getattr(self.page, "process_id", None)),
+        }
+        self.samples.append(point)
+        return point
+
+    def at_boundary(self, topics):
+        """帖子边界调用：采样内存，超限时换新标签页，返回是否回收了标签页"""
+        point = self.sample(topics)
+        self._tab_topics += 1
+
+        if point and len(self.samples) % self.log_every == 0:
+            self._log(f"[内存] {self.format_point(point)}")
+
+        reason = None
+        if point and self.heap_limit_mb and point["heap_mb"] >= self.heap_limit_mb:
+            reason = f"JS 堆 {point['heap_mb']}MB 超过 {self.heap_limit_mb}MB"
+        elif self.topic_limit and self._tab_topics > self.topic_limit:
+            reason = f"同一标签页已浏览 {self.topic_limit} 个帖子"
+        if not reason:
+            return False
+
+        self._log(f"[内存] {reason}，切换新标签页")
+        if not self.page.recycle_tab():
+            return False
+        self.recycles += 1
+        self._tab_topics = 0
+        self._enabled_tab = None
+        return True
+
+    @staticmethod
+    def format_point(point):
+        """单个采样点的描述"""
+        text = f"帖子 {point['topics']} | JS堆 {point['heap_mb']}/{point['heap_total_mb']}MB"
+        if point.get("rss_mb") is not None:
+            text += f" | 进程 {point['rss_mb']}MB"
+        return text + f" | {point['t']:.0f}s"
+
+    def curve(self, points=10):
+        """内存曲线（最多 points 个均匀抽样的采样点）"""
+        if len(self.samples) <= points:
+            return list(self.samples)
+        step = (len(self.samples) - 1) / (points - 1)
+        return [self.samples[round(i * step)] for i in range(points)]
+
+    def report(self):
+        """返回内存曲线报告（多行文本列表）"""
+        if not self.samples:
+            return []
+        peak = max(p["heap_mb"] for p in self.samples)
+        lines = [f"内存曲线（采样 {len(self.samples)} 次，JS堆峰值 {peak}MB，回收标签页 {self.recycles} 次）:"]
+        lines += ["  " + self.format_point(p) for p in self.curve()]
+        return lines
@@ -15,14 +15,18 @@ Linux.do 论坛刷帖助手 v8.4
 """
 
 import sys, os, random, time, json, threading
-import urllib.request
-import urllib.error
+from collections import deque
 from datetime import datetime, date
 
+# 进程内启动计时起点（用于启动性能探针）
+_T0 = time.perf_counter()
+
 # Linux 输入法兼容性修复（必须在导入 tkinter 之前设置）
 import platform
 
-if platform.system() == "Linux":
+SYSTEM = platform.system()
+
+if SYSTEM == "Linux":
     # 尝试检测并设置输入法环境变量
     if "GTK_IM_MODULE" not in os.environ:
         # 检测 fcitx
@@ -43,13 +47,24 @@ from tkinter import ttk, scrolledtext, messagebox
 VERSION = "8.4.1"
 GITHUB_REPO = "icysaintdx/linuxdosss"
 
-# 跨平台字体配置
-import platform
+# 日志显示：按固定帧率批量刷新，日志框最多保留的行数
+LOG_FLUSH_MS = 100
+LOG_MAX_LINES = 2000
+
+# 进度/倒计时/托盘更新的合并周期（毫秒）
+PROGRESS_FLUSH_MS = 500
 
-if platform.system() == "Darwin":  # macOS
+# 版本检查：缓存上次的 Release 信息，间隔内不再请求；离线时快速失败
+UPDATE_CACHE_FILE = os.path.join(os.getcwd(), "update_cache.json")
+UPDATE_CHECK_INTERVAL = 6 * 3600  # 最短重新检查间隔（秒）
+UPDATE_PROBE_TIMEOUT = 2  # 网络连通性探测超时（秒）
+UPDATE_TIMEOUT = 5  # 请求超时（秒）
+
+# 跨平台字体配置
+if SYSTEM == "Darwin":  # macOS
     FONT_FAMILY = "PingFang SC"
     FONT_MONO = "Menlo"
-elif platform.system() == "Linux":
+elif SYSTEM == "Linux":
     FONT_FAMILY = "Noto Sans CJK SC"
     FONT_MONO = "Monospace"
 else:  # Windows
@@ -57,27 +72,134 @@ else:  # Windows
     FONT_MONO = "Consolas"
 
 # 托盘支持（macOS 上禁用，因为可能导致 UI 问题）
+# pystray / PIL 导入较慢，窗口显示后首次初始化托盘时才导入（见 load_tray）
+pystray = Image = ImageDraw = None
 TRAY_SUPPORT = False
-if platform.system() != "Darwin":  # 非 macOS
+if SYSTEM != "Darwin":  # 非 macOS
+    import importlib.util
+
+    TRAY_SUPPORT = bool(
+        importlib.util.find_spec("pystray") and importlib.util.find_spec("PIL")
+    )
+
+# DrissionPage 导入较慢，首次点击“开始”时才导入（见 load_drission）
+ChromiumPage = ChromiumOptions = None
+
+
+def load_tray():
+    """导入托盘依赖，返回是否可用"""
+    global pystray, Image, ImageDraw, TRAY_SUPPORT
+    if TRAY_SUPPORT and pystray is None:
+        try:
+            import pystray
+            from PIL import Image, ImageDraw
+        except ImportError:
+            TRAY_SUPPORT = False
+    return TRAY_SUPPORT
+
+
+def load_drission():
+    """导入 DrissionPage，返回是否可用"""
+    global ChromiumPage, ChromiumOptions
+    if ChromiumPage is None:
+        try:
+            from DrissionPage import ChromiumPage, ChromiumOptions
+        except ImportError:
+            return False
+    return True
+
+from linux_do_guard import GuardedPage, MemoryMonitor, recovery_summary
+from linux_do_log import Logger
+from linux_do_metrics import CallProfiler, NetworkMeter, PhaseTimer
+from linux_do_js import call_helper, install_helpers
+from linux_do_nav import Navigator, TopicPreloader
+from linux_do_journal import Journal, topic_id_from_url
+from linux_do_record import PageRecorder
+from linux_do_profile import RamProfile, prune_profile, record_launch
+from linux_do_proxy import ProxyPool, target_from_url
+
+
+def _load_update_cache(path):
     try:
-        import pystray
-        from PIL import Image, ImageDraw
-
-        TRAY_SUPPORT = True
-    except ImportError:
-        TRAY_SUPPORT = False
-else:
-    # macOS 上尝试导入 PIL（用于其他功能），但禁用托盘
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_update_cache(path, cache):
+    # 先写临时文件再替换，避免中途退出留下损坏的缓存
+    tmp = path + ".tmp"
     try:
-        from PIL import Image, ImageDraw
-    except ImportError:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
         pass
 
-try:
-    from DrissionPage import ChromiumPage, ChromiumOptions
-except:
-    print("pip install DrissionPage")
-    sys.exit(1)
+
+def _network_reachable(host, port=443):
+    """快速探测网络是否可达（有代理时探测代理），避免离线时等满请求超时"""
+    import socket
+    import urllib.request
+    from urllib.parse import urlsplit
+
+    proxy = urllib.request.getproxies().get("https")
+    if proxy:
+        parts = urlsplit(proxy if "://" in proxy else "http://" + proxy)
+        host, port = parts.hostname, parts.port or 80
+    try:
+        socket.create_connection((host, port), timeout=UPDATE_PROBE_TIMEOUT).close()
+        return True
+    except OSError:
+        return False
+
+
+def fetch_latest_release(cache_path=UPDATE_CACHE_FILE):
+    """
+    获取 GitHub 最新 Release 信息（dict，含 tag_name / html_url），失败返回缓存或 None
+
+    - 距上次成功检查不足 UPDATE_CHECK_INTERVAL 时直接使用缓存，不发请求
+    - 带 If-None-Match 条件请求，未变化时服务器返回 304，不传输内容
+    - 网络不可达时快速返回缓存
+    """
+    import urllib.request
+    import urllib.error
+
+    cache = _load_update_cache(cache_path)
+    cached = cache.get("release")
+    if cached and time.time() - cache.get("checked_at", 0) < UPDATE_CHECK_INTERVAL:
+        return cached
+
+    if not _network_reachable("api.github.com"):
+        return cached
+
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
+    headers = {"User-Agent": "LinuxDoHelper", "Accept": "application/vnd.github+json"}
+    if cached and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=UPDATE_TIMEOUT) as response:
+            data = json.loads(response.read().decode("utf-8"))
+            cache = {
+                "etag": response.headers.get("ETag", ""),
+                "release": {
+                    "tag_name": data.get("tag_name", ""),
+                    "html_url": data.get("html_url", ""),
+                },
+            }
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not cached:
+            return cached
+        # 304：Release 未变化，沿用缓存
+    except Exception:
+        return cached
+
+    cache["checked_at"] = time.time()
+    _save_update_cache(cache_path, cache)
+    return cache["release"]
 
 
 def get_icon_path():
@@ -91,6 +213,27 @@ def get_icon_path():
     return os.path.join(base_path, "icon.ico")
 
 
+_tray_images = {}
+
+
+def get_tray_image(color="#0f3460"):
+    """获取托盘图标图像（按颜色缓存）"""
+    if color not in _tray_images:
+        _tray_images[color] = create_tray_image(color)
+    return _tray_images[color]
+
+
+def metric_stat(name):
+    """升级要求指标名对应的统计项：topic / like / reply，无对应返回 None"""
+    if "浏览" in name or "阅读" in name or "话题" in name:
+        return "topic"
+    if "点赞" in name or "赞" in name:
+        return "like"
+    if "回复" in name or "发帖" in name:
+        return "reply"
+    return None
+
+
 def create_tray_image(color="#0f3460"):
     """创建托盘图标图像"""
     size = 64
@@ -139,8 +282,16 @@ CATS = [
     {"n": "运营反馈", "u": "/c/feedback/2", "e": False},
 ]
 
+def _env_float(name, default=0.0):
+    """读取数值型环境变量，未设置或格式不对时返回 default"""
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
 CFG = {
-    "proxy": "127.0.0.1:7897",
+    "proxy": "127.0.0.1:7897",  # 多个代理用逗号分隔，启动时探测并使用延迟最低的可用代理
     "base": "https://linux.do",
     "connect": "https://connect.linux.do",
     "like_rate": 0.3,
@@ -149,6 +300,20 @@ CFG = {
     "scroll_time": 3,
     "wait_min": 1,
     "wait_max": 3,
+    "mem_heap_mb": 512,  # JS 堆超过该值（MB）时换新标签页
+    "mem_topics": 150,  # 同一标签页最多浏览的帖子数
+    "log_file": "",  # 完整日志写入的文件，留空则不写入
+    "profile": bool(os.environ.get("LINUXDO_PROFILE")),  # 统计浏览器调用次数和耗时
+    "net_stats": True,  # 统计网络流量（请求数和传输字节数，按资源类型/主机）
+    "spa_nav": bool(os.environ.get("LINUXDO_SPA_NAV")),  # 帖子/板块之间用前端路由跳转，不整页刷新
+    "preload": bool(os.environ.get("LINUXDO_PRELOAD")),  # 阅读时在后台标签页预加载下一个帖子
+    "journal_file": os.environ.get("LINUXDO_JOURNAL", ""),  # 结构化事件日志（JSON Lines），留空不写
+    "record_dir": os.environ.get("LINUXDO_RECORD", ""),  # 录制页面快照的目录（回放测试用）
+    "ram_profile": bool(os.environ.get("LINUXDO_RAM_PROFILE")),  # 用户数据目录放在内存盘上运行
+    "ram_dir": "",  # 内存盘目录，留空自动选择（Linux 为 /dev/shm）
+    "profile_sync_min": 10,  # 内存盘模式下板块之间写回磁盘的最短间隔（分钟）
+    # 用户数据目录大小上限（MB），启动前清理缓存，0 表示不限制
+    "profile_budget_mb": _env_float("LINUXDO_PROFILE_BUDGET_MB"),
     "tpl": [
         # 感谢类
         "感谢分享！学习了",
@@ -242,6 +407,7 @@ class Bot:
         enable_reply=True,
         enable_wait=True,
         browse_mode="deep",
+        journal=None,
     ):
         s.cfg = cfg
         s.cats = cats
@@ -262,6 +428,20 @@ class Bot:
         s.level_requirements = []  # 保存升级要求
         s.initial_level_info = None  # 保存初始等级信息用于对比
         s.start_time = None  # 记录开始时间
+        s.recoveries = {}  # 看门狗恢复计数（跨浏览器重启累计）
+        s.mem = None  # 内存监控
+        s.timer = PhaseTimer()  # 各阶段耗时统计
+        s.profiler = None  # 浏览器调用统计（cfg["profile"] 开启时创建）
+        s.net = NetworkMeter() if s.cfg.get("net_stats", True) else None  # 网络流量统计
+        s.journal = journal or Journal()  # 结构化事件日志（未配置时不写入）
+        s._topic_id = None  # 当前帖子 ID（写入事件日志用）
+        s.recorder = None  # 页面录制（cfg["record_dir"] 开启时创建）
+        s.ram = None  # 内存盘用户数据目录（cfg["ram_profile"] 开启时创建）
+        s.proxies = None  # 代理池（cfg["proxy"] 不为空时创建）
+        s._proxy = None  # 当前浏览器使用的代理
+        s.nav = None  # 帖子/板块跳转（浏览器启动后创建）
+        s.preloader = None  # 下一个帖子预加载（cfg["preload"] 开启时创建）
+        s._screen_height = None
 
     def _random_delay(s, min_sec=0.5, max_sec=2.0, reason=""):
         """防风控：随机延迟"""
@@ -270,6 +450,25 @@ class Bot:
             s.lg(f"[防风控] {reason}，等待 {delay:.1f}s")
         time.sleep(delay)
 
+    def _go(s, url):
+        """跳转到帖子/板块，返回使用的方式（"preload" 已预加载 / "spa" / "reload"）"""
+        if s.preloader and s.preloader.take(url):
+            return "preload"
+        if s.nav:
+            return s.nav.go(url)
+        s.pg.get(url)
+        return "reload"
+
+    def _prepare_tab(s, tab):
+        """预加载用的新标签页：挂上网络流量统计，注册页面脚本库"""
+        if s.net:
+            s.net.attach(tab)
+        install_helpers(tab, current=False)
+
+    def _load_wait(s, mode):
+        """跳转后的等待时间：预加载或前端路由已确认到达目标，等待可以短一些"""
+        return (2, 4) if mode == "reload" else (0.5, 1.5)
+
     def start(s):
         # 确保先关闭旧的浏览器实例
         if s.pg:
@@ -281,36 +480,107 @@ class Bot:
                 pass
             s.pg = None
 
+        if not load_drission():
+            s.lg("未安装 DrissionPage，请运行: pip install DrissionPage")
+            return False
+
+        user_data_dir = os.path.join(os.getcwd(), "browser_data")
+        if s.cfg.get("profile_budget_mb"):
+            prune_profile(
+                s.ram.path if s.ram and s.ram.active else user_data_dir,
+                int(s.cfg["profile_budget_mb"] * 1048576),
+                log=s.lg,
+            )
+        if s.cfg.get("ram_profile") and not s.ram:
+            s.ram = RamProfile(
+                user_data_dir,
+                root=s.cfg.get("ram_dir") or None,
+                interval=s.cfg.get("profile_sync_min", 10) * 60,
+                log=s.lg,
+            )
+        if s.ram:
+            s.ram.start()
+
+        if s.cfg["proxy"] and not s.proxies:
+            s.proxies = ProxyPool(s.cfg["proxy"], target=target_from_url(s.cfg["base"]), log=s.lg)
+            s.proxies.check()
+            if len(s.proxies.proxies) > 1:
+                s.lg("[代理] 探测结果:")
+                for line in s.proxies.report():
+                    s.lg(line)
+            s.proxies.start()
+
         s.lg("启动浏览器...")
+        launch_start = time.perf_counter()
+        page = s._launch()
+        if not page:
+            return False
+        elapsed = time.perf_counter() - launch_start
+        s.timer.record("browser.launch", elapsed)
+        previous = record_launch(s.ram.path if s.ram else user_data_dir, elapsed)
+        if previous is not None:
+            s.lg(f"浏览器启动耗时 {elapsed:.1f}s（上次 {previous:.1f}s）")
+        s.pg = GuardedPage(
+            page,
+            launch=s._launch,
+            restore=lambda: s.check_login(wait_for_login=False),
+            log=s.lg,
+            counters=s.recoveries,
+            relaunch_when=s._proxy_failed,
+        )
+        if s.cfg.get("profile"):
+            s.pg = s.profiler = CallProfiler(s.pg)
+        if s.cfg.get("record_dir"):
+            s.recorder = PageRecorder(s.cfg["record_dir"], log=s.lg)
+            s.recorder.listen(s.pg)
+        if s.net:
+            s.net.attach(s.pg)
+        install_helpers(s.pg, current=False)
+        s.nav = Navigator(s.pg, s.cfg["base"], enabled=bool(s.cfg.get("spa_nav")), log=s.lg)
+        if s.cfg.get("preload"):
+            s.preloader = TopicPreloader(s.pg, on_tab=s._prepare_tab, log=s.lg)
+        s.mem = MemoryMonitor(
+            s.pg,
+            log=s.lg,
+            heap_limit_mb=s.cfg.get("mem_heap_mb", 512),
+            topic_limit=s.cfg.get("mem_topics", 150),
+        )
+        s.lg("浏览器就绪")
+        return True
 
+    def _launch(s):
+        """启动 Chrome 并返回页面对象，失败返回 None（看门狗重启浏览器时也会调用）"""
         # 重试机制（处理 404 错误）
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 co = ChromiumOptions()
 
-                # 设置用户数据目录
-                user_data_dir = os.path.join(os.getcwd(), "browser_data")
+                # 设置用户数据目录（内存盘模式下使用内存盘上的副本）
+                user_data_dir = s.ram.path if s.ram else os.path.join(os.getcwd(), "browser_data")
                 co.set_user_data_path(user_data_dir)
 
-                if s.cfg["proxy"]:
-                    co.set_proxy(s.cfg["proxy"])
+                s._proxy = s.proxies.best() if s.proxies else None
+                if s._proxy:
+                    co.set_proxy(s._proxy)
+                    if len(s.proxies.proxies) > 1:
+                        s.lg(f"[代理] 使用 {s._proxy}")
                 co.set_argument("--disable-blink-features=AutomationControlled")
 
                 # 设置浏览器窗口大小为屏幕高度
-                import tkinter as tk
+                if not s._screen_height:
+                    import tkinter as tk
 
-                root = tk.Tk()
-                screen_height = root.winfo_screenheight()
-                root.destroy()
+                    root = tk.Tk()
+                    s._screen_height = root.winfo_screenheight()
+                    root.destroy()
+                screen_height = s._screen_height
 
                 # 设置窗口大小：宽度1200，高度为屏幕高度
                 co.set_argument(f"--window-size=1200,{screen_height}")
                 s.lg(f"设置浏览器窗口大小: 1200x{screen_height}")
 
-                s.pg = ChromiumPage(co)
-                s.lg("浏览器就绪")
-                return True
+                return ChromiumPage(co)
 
             except Exception as e:
                 error_msg = str(e)
@@ -320,14 +590,22 @@ class Bot:
                     continue
                 else:
                     s.lg(f"启动失败: {error_msg}")
-                    return False
+                    return None
 
-        return False
+        return None
+
+    def _proxy_failed(s):
+        """当前代理已失效且有其他可用代理时返回原因（看门狗在每次页面操作前调用，不记日志）"""
+        if s.proxies and s._proxy and s.proxies.failed(s._proxy):
+            return f"代理 {s._proxy} 已失效"
+        return None
 
     def stop(s):
         s.run = False
 
     def close(s):
+        if s.preloader:
+            s.preloader.discard()
         if s.pg:
             try:
                 s.pg.quit()
@@ -335,6 +613,21 @@ class Bot:
             except Exception as e:
                 s.lg(f"关闭浏览器时出错: {e}")
             s.pg = None  # 清空引用
+        if s.ram:
+            s.ram.stop()
+
+    def _checkpoint_profile(s, force=False):
+        """检查点：短暂关闭浏览器，把内存盘用户数据目录写回磁盘后重新启动（force 不管写回间隔）"""
+        if not s.ram or not s.ram.active or not s.pg:
+            return
+        if not force and not s.ram.due():
+            return
+        if s.preloader:
+            s.preloader.discard()  # 预加载的标签页随浏览器一起关闭
+        s.lg("[内存盘] 关闭浏览器写回用户数据目录")
+        if not s.pg.restart(between=s.ram.sync):
+            s.lg("[内存盘] 写回后浏览器重启失败")
+            s.run = False
 
     def check_login(s, wait_for_login=True, max_wait=600, check_interval=15):
         """
@@ -344,8 +637,9 @@ class Bot:
         check_interval: 检查间隔（秒）
         """
         s.lg("检查登录...")
-        s.pg.get(s.cfg["base"])
-        time.sleep(3)
+        with s.timer.span("login.load"):
+            s.pg.get(s.cfg["base"])
+            time.sleep(3)
 
         start_time = time.time()
         check_count = 0
@@ -398,74 +692,21 @@ class Bot:
         s.lg("获取等级信息...")
         try:
             # 如果是最终获取，先强制刷新页面确保数据最新
-            if is_final:
-                s.lg("强制刷新页面获取最新数据...")
-                s.pg.get(s.cfg["connect"])
-                time.sleep(2)
-                # 刷新页面
-                s.pg.run_js("location.reload(true)")
-                time.sleep(4)
-            else:
-                s.pg.get(s.cfg["connect"])
-                time.sleep(4)
-
-            info = s.pg.run_js("""
-            function getLevelInfo() {
-                const result = {
-                    username: '',
-                    level: '',
-                    nextLevel: '',
-                    requirements: []
-                };
-                
-                // 获取用户名和等级
-                const h1 = document.querySelector('h1');
-                if (h1) {
-                    const text = h1.textContent;
-                    const match = text.match(/\\((.+?)\\)\\s*(\\d+)级用户/);
-                    if (match) {
-                        result.username = match[1];
-                        result.level = match[2];
-                    }
-                }
-                
-                // 获取下一级要求
-                const h2s = document.querySelectorAll('h2');
-                h2s.forEach(h2 => {
-                    const text = h2.textContent;
-                    if (text.includes('信任级别')) {
-                        const match = text.match(/信任级别\\s*(\\d+)/);
-                        if (match) {
-                            result.nextLevel = match[1];
-                        }
-                    }
-                });
-                
-                // 获取升级要求表格
-                const tables = document.querySelectorAll('table');
-                tables.forEach(table => {
-                    const rows = table.querySelectorAll('tr');
-                    rows.forEach(row => {
-                        const cells = row.querySelectorAll('td');
-                        if (cells.length >= 3) {
-                            const name = cells[0].textContent.trim();
-                            const current = cells[1].textContent.trim();
-                            const required = cells[2].textContent.trim();
-                            if (name && current && required && name !== '要求') {
-                                result.requirements.push({
-                                    name: name,
-                                    current: current,
-                                    required: required
-                                });
-                            }
-                        }
-                    });
-                });
-                
-                return result;
-            }
-            return getLevelInfo();
-            """)
+            with s.timer.span("level.load"):
+                if is_final:
+                    s.lg("强制刷新页面获取最新数据...")
+                    s.pg.get(s.cfg["connect"])
+                    time.sleep(2)
+                    # 刷新页面
+                    s.pg.run_js("location.reload(true)")
+                    time.sleep(4)
+                else:
+                    s.pg.get(s.cfg["connect"])
+                    time.sleep(4)
+
+            parse_start = time.perf_counter()
+            info = call_helper(s.pg, "level")
+            s.timer.record("level.parse", time.perf_counter() - parse_start)
 
             if info:
                 s.user_info = info
@@ -491,6 +732,18 @@ class Bot:
 
                 # 保存升级要求用于进度追踪
                 s.level_requirements = info.get("requirements", [])
+                if s.recorder:
+                    s.recorder.capture("connect", s.pg, expect={"level": info})
+                s.journal.event(
+                    "level",
+                    final=is_final,
+                    level=info.get("level"),
+                    next_level=info.get("nextLevel"),
+                    requirements={
+                        r["name"]: [r["current"], r["required"]]
+                        for r in s.level_requirements
+                    },
+                )
 
                 # 首次获取时保存初始等级信息
                 if not is_final and s.initial_level_info is None:
@@ -505,55 +758,30 @@ class Bot:
         """使用JS获取帖子列表（按回复数排序）"""
         url = s.cfg["base"] + cat["u"]
         s.lg("进入板块: " + cat["n"])
-        s.pg.get(url)
-        s._random_delay(2, 4, "页面加载")
+        with s.timer.span("cat.load"):
+            mode = s._go(url)
+            s._random_delay(*s._load_wait(mode), "页面加载")
 
         # 点击"回复"按钮进行排序
         s.lg("点击'回复'按钮进行排序...")
-        clicked = s.pg.run_js("""
-        function clickRepliesSort() {
-            // 查找回复排序按钮
-            const replyButton = document.querySelector('th[data-sort-order="posts"] button');
-            if (replyButton) {
-                replyButton.click();
-                return true;
-            }
-            return false;
-        }
-        return clickRepliesSort();
-        """)
+        sort_start = time.perf_counter()
+        clicked = call_helper(s.pg, "sortByReplies")
 
         if clicked:
             s.lg("已点击回复排序按钮")
             time.sleep(2)  # 等待排序完成
         else:
             s.lg("未找到回复排序按钮，使用默认排序")
+        s.timer.record("cat.sort", time.perf_counter() - sort_start)
 
         # 使用JS获取帖子 - 基于实际HTML结构
-        topics = s.pg.run_js("""
-        function getTopics() {
-            const rows = document.querySelectorAll('tr.topic-list-item');
-            const topics = [];
-            rows.forEach(row => {
-                const link = row.querySelector('a.title.raw-link.raw-topic-link');
-                if (link) {
-                    const href = link.getAttribute('href');
-                    const title = link.textContent.trim();
-                    const topicId = row.getAttribute('data-topic-id');
-                    // 跳过置顶帖
-                    if (href && title && !row.classList.contains('pinned')) {
-                        topics.push({
-                            url: href,
-                            title: title.substring(0, 50),
-                            id: topicId
-                        });
-                    }
-                }
-            });
-            return topics;
-        }
-        return getTopics();
-        """)
+        list_start = time.perf_counter()
+        topics = call_helper(s.pg, "topics")
+        s.timer.record("cat.list", time.perf_counter() - list_start)
+        if s.recorder:
+            s.recorder.capture(
+                "category", s.pg, expect={"topics": [t["url"] for t in topics or []]}
+            )
 
         return topics or []
 
@@ -564,45 +792,7 @@ class Bot:
         1. 宽窗口：.timeline-replies 显示 "1/169"
         2. 窄窗口：#topic-progress .nums 显示 <span>69</span><span>/</span><span>74</span>
         """
-        floor_info = s.pg.run_js("""
-        function getFloorInfo() {
-            // 方法1：尝试从 .timeline-replies 获取（宽窗口）
-            const timelineElement = document.querySelector('.timeline-replies');
-            if (timelineElement) {
-                const text = timelineElement.textContent.trim();
-                const match = text.match(/(\\d+)\\s*\\/\\s*(\\d+)/);
-                if (match) {
-                    return {
-                        current: parseInt(match[1]),
-                        total: parseInt(match[2]),
-                        source: 'timeline-replies'
-                    };
-                }
-            }
-            
-            // 方法2：尝试从 #topic-progress .nums 获取（窄窗口）
-            const progressElement = document.querySelector('#topic-progress .nums');
-            if (progressElement) {
-                const spans = progressElement.querySelectorAll('span');
-                if (spans.length >= 3) {
-                    const current = parseInt(spans[0].textContent);
-                    const total = parseInt(spans[2].textContent);
-                    if (!isNaN(current) && !isNaN(total)) {
-                        return {
-                            current: current,
-                            total: total,
-                            source: 'topic-progress'
-                        };
-                    }
-                }
-            }
-            
-            return null;
-        }
-        return getFloorInfo();
-        """)
-
-        return floor_info
+        return call_helper(s.pg, "floor")
 
     def scroll_page(s, duration=None, quick_mode=False):
         """爬楼模式 - 使用楼层计数器跟踪进度
@@ -783,9 +973,7 @@ class Bot:
             s.pg.run_js(f"window.scrollBy(0, {dist})")
             time.sleep(random.uniform(1.0, 3.0))
 
-            at_bottom = s.pg.run_js("""
-            return (window.innerHeight + window.scrollY) >= document.body.offsetHeight - 100;
-            """)
+            at_bottom = call_helper(s.pg, "atBottom")
             if at_bottom:
                 s._random_delay(1, 3, "阅读完毕")
                 break
@@ -794,23 +982,10 @@ class Bot:
     def do_like(s, index=0):
         """点赞"""
         try:
-            result = s.pg.run_js(f"""
-            function clickLike(idx) {{
-                const buttons = document.querySelectorAll('button.btn-toggle-reaction-like');
-                if (buttons.length > idx) {{
-                    const btn = buttons[idx];
-                    if (!btn.classList.contains('has-like') && !btn.classList.contains('my-likes')) {{
-                        btn.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                        setTimeout(() => btn.click(), 300);
-                        return true;
-                    }}
-                }}
-                return false;
-            }}
-            return clickLike({index});
-            """)
+            result = call_helper(s.pg, "like", index, True)
 
             if result:
+                s.journal.event("like", topic_id=s._topic_id, index=index)
                 s._random_delay(0.8, 1.5, "点赞后")
                 if index == 0:
                     s.stats["like"] += 1
@@ -824,6 +999,7 @@ class Bot:
                 return True
         except Exception as e:
             s.lg("点赞失败: " + str(e))
+            s.journal.event("error", where="like", topic_id=s._topic_id, error=str(e))
         return False
 
     def do_reply(s, content=None):
@@ -849,6 +1025,7 @@ class Bot:
 
             if not clicked:
                 s.lg("未找到回复按钮")
+                s.journal.event("reply", topic_id=s._topic_id, ok=False, reason="no_button")
                 return False
 
             s._random_delay(1.5, 3, "等待编辑器")
@@ -880,6 +1057,7 @@ class Bot:
             return submit();
             """)
 
+            s.journal.event("reply", topic_id=s._topic_id, ok=bool(submitted), chars=len(content))
             if submitted:
                 s._random_delay(2, 4, "回复提交后")
                 s.stats["reply"] += 1
@@ -893,21 +1071,37 @@ class Bot:
 
         except Exception as e:
             s.lg("回复失败: " + str(e))
+            s.journal.event("error", where="reply", topic_id=s._topic_id, error=str(e))
         return False
 
-    def browse_topic(s, topic):
-        """浏览帖子"""
+    def browse_topic(s, topic, next_topic=None):
+        """浏览帖子（开启预加载时，阅读期间在后台标签页加载 next_topic）"""
         url = (
             s.cfg["base"] + topic["url"]
             if topic["url"].startswith("/")
             else topic["url"]
         )
         title = topic["title"]
+        s._topic_id = topic_id_from_url(url)
 
         s.lg("浏览: " + title)
         try:
-            s.pg.get(url)
-            s._random_delay(2, 4, "帖子加载")
+            with s.timer.span("topic.load"):
+                mode = s._go(url)
+            if s.preloader and next_topic:
+                next_url = next_topic["url"]
+                s.preloader.start(s.cfg["base"] + next_url if next_url.startswith("/") else next_url)
+            with s.timer.span("topic.ready"):
+                s._random_delay(*s._load_wait(mode), "帖子加载")
+            if s.recorder:
+                s.recorder.capture(
+                    "topic",
+                    s.pg,
+                    expect=lambda: {
+                        "floor": s.get_floor_info(),
+                        "like_buttons": call_helper(s.pg, "likeCount"),
+                    },
+                )
             s.stats["topic"] += 1
 
             # 更新进度
@@ -918,23 +1112,22 @@ class Bot:
             s._update_countdown_display()
 
             # 爬楼阅读（scroll_page内部会实时更新stats["floors"]和进度）
-            s.scroll_page()
+            with s.timer.span("topic.climb"), s.journal.span(
+                "scroll", topic_id=s._topic_id, mode=s.browse_mode
+            ) as ev:
+                ev["floors"] = s.scroll_page()
 
             s._random_delay(1, 2, "阅读后")
 
             # 获取点赞按钮数量
-            btn_count = (
-                s.pg.run_js("""
-            return document.querySelectorAll('button.btn-toggle-reaction-like').length;
-            """)
-                or 0
-            )
+            btn_count = call_helper(s.pg, "likeCount") or 0
 
             s.lg(f"找到 {btn_count} 个点赞按钮")
 
             # 随机点赞主帖（检查开关）
             if s.enable_like and btn_count > 0 and random.random() < s.cfg["like_rate"]:
-                s.do_like(0)
+                with s.timer.span("topic.like"):
+                    s.do_like(0)
                 if s.enable_wait:
                     s._random_delay(s.cfg["wait_min"], s.cfg["wait_max"], "点赞后休息")
 
@@ -942,7 +1135,8 @@ class Bot:
             if s.enable_like and btn_count > 1:
                 for i in range(1, min(btn_count, 5)):
                     if random.random() < s.cfg["like_reply_rate"]:
-                        s.do_like(i)
+                        with s.timer.span("topic.like"):
+                            s.do_like(i)
                         if s.enable_wait:
                             s._random_delay(
                                 s.cfg["wait_min"], s.cfg["wait_max"], "点赞回复后"
@@ -952,11 +1146,13 @@ class Bot:
             if s.enable_reply and random.random() < s.cfg["reply_rate"]:
                 if s.enable_wait:
                     s._random_delay(s.cfg["wait_min"], s.cfg["wait_max"], "准备回帖")
-                s.do_reply()
+                with s.timer.span("topic.reply"):
+                    s.do_reply()
 
             return True
         except Exception as e:
             s.lg("浏览失败: " + str(e))
+            s.journal.event("error", where="browse_topic", topic_id=s._topic_id, error=str(e))
             return False
 
     def _update_countdown_display(s):
@@ -1030,7 +1226,7 @@ class Bot:
         selected = random.sample(topics, count)
 
         browsed = 0
-        for topic in selected:
+        for i, topic in enumerate(selected):
             if not s.run:
                 break
 
@@ -1039,7 +1235,26 @@ class Bot:
                 s.run = False
                 break
 
-            s.browse_topic(topic)
+            # 帖子边界：采样内存，超限时换新标签页
+            if s.mem:
+                s.mem.at_boundary(s.stats["topic"])
+            if s.net:
+                s.net.attach(s.pg)  # 换过标签页或重启过浏览器时重新挂上
+                s.net.delta()  # 帖子之间的流量（板块列表等）只计入总量
+
+            before = dict(s.stats)
+            with s.journal.span(
+                "topic",
+                topic_id=topic_id_from_url(topic["url"]),
+                category=cat["n"],
+                url=topic["url"],
+            ) as ev:
+                next_topic = selected[i + 1] if i + 1 < len(selected) else None
+                ev["ok"] = s.browse_topic(topic, next_topic)
+                for key in ("floors", "like", "like_reply", "reply"):
+                    ev[key] = s.stats[key] - before[key]
+                if s.net:
+                    ev["requests"], ev["bytes"] = s.net.delta()
             browsed += 1
 
             # 再次检查是否已达到目标
@@ -1056,7 +1271,15 @@ class Bot:
     def run_session(s):
         s.run = True
         s.stats = {"topic": 0, "like": 0, "reply": 0, "like_reply": 0, "floors": 0}
+        s.recoveries.clear()
+        s.timer = PhaseTimer()
+        if s.net:
+            s.net.reset()
         s.start_time = time.time()  # 记录开始时间
+        s.journal.new_run()
+        s.journal.event(
+            "run_start", mode=s.mode, target=s.target_value, browse_mode=s.browse_mode
+        )
 
         if not s.start():
             return
@@ -1069,6 +1292,7 @@ class Bot:
                 return
 
             login_success = True
+            s._checkpoint_profile(force=True)  # 尽早保存登录状态
 
             # 获取等级信息
             s.get_level_info()
@@ -1126,6 +1350,7 @@ class Bot:
                         s.run = False
                         break
 
+                    s._checkpoint_profile()  # 板块之间：到了写回间隔就写回内存盘
                     s.browse_cat(cat)
 
                     # 再次检查是否达到目标（browse_cat后可能已达到）
@@ -1200,6 +1425,25 @@ class Bot:
             s.lg(f"点赞回复: {s.stats['like_reply']}")
             s.lg(f"回帖数量: {s.stats['reply']}")
             s.lg(f"耗时: {elapsed_minutes} 分 {elapsed_seconds} 秒")
+            if any(s.recoveries.values()):
+                s.lg(f"浏览器恢复: {recovery_summary(s.recoveries)}")
+            if s.mem:
+                for line in s.mem.report():
+                    s.lg(line)
+            for line in s.timer.report():
+                s.lg(line)
+            if s.net:
+                for line in s.net.report(s.stats["topic"]):
+                    s.lg(line)
+            if s.nav:
+                for line in s.nav.report():
+                    s.lg(line)
+            if s.preloader:
+                for line in s.preloader.report():
+                    s.lg(line)
+            if s.profiler:
+                for line in s.profiler.report():
+                    s.lg(line)
             s.lg("=" * 30)
 
             # 重新获取等级信息以验证效果（在关闭浏览器前）
@@ -1246,6 +1490,9 @@ class Bot:
 
         finally:
             s.run = False
+            if s.proxies:
+                s.proxies.stop()
+            s.journal.event("run_end", dur=round(time.time() - s.start_time, 1), **s.stats)
             # 只有登录成功后才关闭浏览器，否则保留让用户查看
             if login_success:
                 s.close()
@@ -1285,15 +1532,31 @@ class GUI:
         s.tray_icon = None
         s.tray_thread = None
         s._running_status = "就绪"
+        s._tray_color = "#0f3460"
+
+        # 进度更新合并：后台线程只记录最新值，由主线程按周期统一刷新
+        s._pending_progress = None
+        s._pending_countdown = None
+
+        # 日志队列：后台线程只入队，由主线程按帧率批量写入日志框
+        s._log_queue = deque()
+        s._log_dropped = 0
+        s._stats_shown = None
+        s._history = None
+        if s.cfg.get("log_file"):
+            s._history = Logger(log_file=s.cfg["log_file"], console=False)
+        s._journal = Journal(s.cfg.get("journal_file"), bot="gui")
 
         s._ui()
+        s.rt.after(LOG_FLUSH_MS, s._flush_log)
+        s.rt.after(PROGRESS_FLUSH_MS, s._flush_progress)
 
         # 窗口居中
         s._center_window()
 
-        # 初始化托盘
+        # 初始化托盘（窗口显示后再导入 pystray/PIL）
         if TRAY_SUPPORT:
-            s._init_tray()
+            s.rt.after(100, s._init_tray)
 
         # 窗口关闭时的处理
         s.rt.protocol("WM_DELETE_WINDOW", s._on_close_window)
@@ -1306,26 +1569,19 @@ class GUI:
 
         def check():
             try:
-                # 获取 GitHub Releases 最新版本
-                url = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
-                req = urllib.request.Request(
-                    url, headers={"User-Agent": "LinuxDoHelper"}
-                )
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    data = json.loads(response.read().decode("utf-8"))
-                    latest_version = data.get("tag_name", "").lstrip("v")
-                    release_url = data.get("html_url", "")
-
-                    # 比较版本号
-                    if (
-                        latest_version
-                        and s._compare_versions(latest_version, VERSION) > 0
-                    ):
-                        # 有新版本，在主线程显示提示
-                        s.rt.after(
-                            0,
-                            lambda: s._show_update_dialog(latest_version, release_url),
-                        )
+                release = fetch_latest_release()
+                if not release:
+                    return
+                latest_version = release.get("tag_name", "").lstrip("v")
+                release_url = release.get("html_url", "")
+
+                # 比较版本号
+                if latest_version and s._compare_versions(latest_version, VERSION) > 0:
+                    # 有新版本，在主线程显示提示
+                    s.rt.after(
+                        0,
+                        lambda: s._show_update_dialog(latest_version, release_url),
+                    )
             except Exception as e:
                 # 网络错误等，静默忽略
                 pass
@@ -1371,7 +1627,7 @@ class GUI:
 
     def _init_tray(s):
         """初始化系统托盘"""
-        if not TRAY_SUPPORT:
+        if not load_tray():
             return
 
         def create_menu():
@@ -1386,7 +1642,7 @@ class GUI:
         # 创建托盘图标
         s.tray_icon = pystray.Icon(
             "LinuxDoHelper",
-            create_tray_image("#0f3460"),
+            get_tray_image("#0f3460"),
             "Linux.do 刷帖助手 - 就绪",
             create_menu(),
         )
@@ -1410,8 +1666,10 @@ class GUI:
         else:
             color = "#0f3460"  # 默认蓝色
 
-        # 更新图标
-        s.tray_icon.icon = create_tray_image(color)
+        # 更新图标（颜色变化时才替换）
+        if color != s._tray_color:
+            s._tray_color = color
+            s.tray_icon.icon = get_tray_image(color)
 
         # 更新提示文字
         tooltip = f"Linux.do 刷帖助手 v{VERSION} - {status}\n"
@@ -1525,6 +1783,9 @@ class GUI:
                 s.tray_icon.stop()
             except:
                 pass
+        if s._history:
+            s._history.close()
+        s._journal.close()
         s.rt.destroy()
 
     def _ui(s):
@@ -2140,77 +2401,116 @@ class GUI:
                 anchor="w",
             ).grid(row=row, column=4, padx=col_padx[4], pady=3, sticky="w")
 
-            # 保存引用
+            # 保存引用（指标对应的统计项和初始值在建表时算好）
+            try:
+                initial_val = int(current.replace(",", ""))
+            except ValueError:
+                initial_val = None
             s.req_labels[name] = {
                 "initial": current,
+                "initial_val": initial_val,
+                "stat": metric_stat(name),
+                "shown": 0,
                 "current_var": current_var,
                 "added_var": added_var,
             }
 
     def _update_progress(s, stats):
-        """根据统计更新进度显示"""
-
-        def update():
-            if not s.req_labels:
-                return
-
-            # 根据统计数据更新相关指标
-            for name, labels in s.req_labels.items():
-                try:
-                    initial = int(labels["initial"].replace(",", ""))
-                    added = 0
-
-                    # 根据指标名匹配统计
-                    name_lower = name.lower()
-                    if "浏览" in name or "阅读" in name or "话题" in name:
-                        added = stats.get("topic", 0)
-                    elif "点赞" in name or "赞" in name:
-                        added = stats.get("like", 0) + stats.get("like_reply", 0)
-                    elif "回复" in name or "发帖" in name:
-                        added = stats.get("reply", 0)
-
-                    if added > 0:
-                        new_val = initial + added
-                        labels["current_var"].set(str(new_val))
-                        labels["added_var"].set(f"+{added}")
-                except:
-                    pass
-
-            # 更新托盘状态（实时显示统计）
-            s._update_tray_status("运行中", stats)
-
-        s.rt.after(0, update)
+        """根据统计更新进度显示（只记录最新值，由 _flush_progress 合并刷新）"""
+        s._pending_progress = dict(stats)
 
     def _update_countdown(s, text):
-        """更新倒计时显示"""
-
-        def update():
-            s.countdown_var.set(text)
+        """更新倒计时显示（只记录最新值，由 _flush_progress 合并刷新）"""
+        s._pending_countdown = text
 
-        s.rt.after(0, update)
+    def _flush_progress(s):
+        """主线程定时刷新进度面板、倒计时和托盘"""
+        try:
+            text, s._pending_countdown = s._pending_countdown, None
+            if text is not None:
+                s.countdown_var.set(text)
+
+            stats, s._pending_progress = s._pending_progress, None
+            if stats is not None:
+                s._apply_progress(stats)
+                # 更新托盘状态（实时显示统计；任务结束后保留最终状态）
+                running = s.bot is not None and s.bot.run
+                s._update_tray_status("运行中" if running else s._running_status, stats)
+        finally:
+            s.rt.after(PROGRESS_FLUSH_MS, s._flush_progress)
+
+    def _apply_progress(s, stats):
+        """把统计数据累加到升级进度面板"""
+        added_by_stat = {
+            "topic": stats.get("topic", 0),
+            "like": stats.get("like", 0) + stats.get("like_reply", 0),
+            "reply": stats.get("reply", 0),
+        }
+        for labels in s.req_labels.values():
+            stat = labels["stat"]
+            if stat is None or labels["initial_val"] is None:
+                continue
+            added = added_by_stat[stat]
+            if added > 0 and added != labels["shown"]:
+                labels["shown"] = added
+                labels["current_var"].set(str(labels["initial_val"] + added))
+                labels["added_var"].set(f"+{added}")
 
     def _lg(s, msg):
-        def log():
-            ts = datetime.now().strftime("%H:%M:%S")
-            s.log.config(state=tk.NORMAL)
-            s.log.insert(tk.END, "[" + ts + "] " + msg + "\n")
-            s.log.see(tk.END)
-            s.log.config(state=tk.DISABLED)
-
-            # 更新统计
-            if s.bot:
-                topics = s.bot.stats.get("topic", 0)
-                floors = s.bot.stats.get("floors", 0)
-                total_read = topics + floors
-                s.stats_topic.set(f"帖子: {topics}")
-                s.stats_floors.set(f"爬楼: {floors}")
-                s.stats_total.set(f"已读: {total_read}")
-                s.stats_like.set(
-                    f"点赞: {s.bot.stats['like'] + s.bot.stats['like_reply']}"
-                )
-                s.stats_reply.set(f"回复: {s.bot.stats['reply']}")
+        """记录日志（可在任意线程调用，只入队不触碰 Tk）"""
+        line = "[" + datetime.now().strftime("%H:%M:%S") + "] " + msg
+        s._log_queue.append(line)
+        if s._history:
+            s._history.info(msg)
+
+    def _flush_log(s):
+        """主线程定时批量写入日志框，并裁剪到 LOG_MAX_LINES 行"""
+        try:
+            lines = []
+            while s._log_queue:
+                lines.append(s._log_queue.popleft())
+
+            # 单帧积压过多时只显示最后 LOG_MAX_LINES 行
+            if len(lines) > LOG_MAX_LINES:
+                s._log_dropped += len(lines) - LOG_MAX_LINES
+                lines = lines[-LOG_MAX_LINES:]
+
+            if lines:
+                s.log.config(state=tk.NORMAL)
+                if s._log_dropped:
+                    s.log.insert(tk.END, f"... 省略 {s._log_dropped} 行日志 ...\n")
+                    s._log_dropped = 0
+                s.log.insert(tk.END, "\n".join(lines) + "\n")
+                excess = int(s.log.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+                if excess > 0:
+                    s.log.delete("1.0", f"{excess + 1}.0")
+                s.log.see(tk.END)
+                s.log.config(state=tk.DISABLED)
+
+            s._refresh_stats()
+        finally:
+            s.rt.after(LOG_FLUSH_MS, s._flush_log)
 
-        s.rt.after(0, log)
+    def _refresh_stats(s):
+        """更新统计栏（数值变化时才写入 StringVar）"""
+        if not s.bot:
+            return
+        st = s.bot.stats
+        shown = (
+            st.get("topic", 0),
+            st.get("floors", 0),
+            st.get("like", 0) + st.get("like_reply", 0),
+            st.get("reply", 0),
+        )
+        if shown == s._stats_shown:
+            return
+        s._stats_shown = shown
+        topics, floors, likes, replies = shown
+        s.stats_topic.set(f"帖子: {topics}")
+        s.stats_floors.set(f"爬楼: {floors}")
+        s.stats_total.set(f"已读: {topics + floors}")
+        s.stats_like.set(f"点赞: {likes}")
+        s.stats_reply.set(f"回复: {replies}")
 
     def _start(s):
         if s.th and s.th.is_alive():
@@ -2276,6 +2576,7 @@ class GUI:
             enable_reply=enable_reply,
             enable_wait=enable_wait,
             browse_mode=browse_mode,
+            journal=s._journal,
         )
         s.th = threading.Thread(target=s._run, daemon=True)
         s.th.start()
@@ -2304,8 +2605,16 @@ class GUI:
         s._update_tray_status("已停止")
 
     def run(s):
+        if os.environ.get("LINUXDO_STARTUP_PROBE"):
+            s.rt.after(0, s._startup_probe)
         s.rt.mainloop()
 
+    def _startup_probe(s):
+        """启动性能探针：窗口首次绘制完成后输出耗时并退出（供 bench/bench_gui_startup.py 使用）"""
+        s.rt.update_idletasks()
+        print(f"STARTUP_PROBE first_window={time.perf_counter() - _T0:.4f}", flush=True)
+        s.rt.after(0, s._close)
+
 
 if __name__ == "__main__":
     GUI().run()
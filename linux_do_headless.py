@@ -29,11 +29,31 @@ Linux.do 论坛自动浏览脚本 (无头版 / Headless)
     python linux_do_headless.py
 
 可选参数：
-    --proxy         代理地址，如 127.0.0.1:7897
+    --proxy         代理地址，如 127.0.0.1:7897；多个用逗号分隔，启动时探测并使用延迟最低的
+                    可用代理，运行中代理失效时自动切换
     --topics        浏览帖子数量，默认 30
     --like-rate     点赞概率，0-100，默认 30
     --headless      是否无头模式，默认 true
     --debug         调试模式，显示更多日志
+    --log-file      日志文件路径（后台线程写入，按 5MB 自动轮转）
+    --profile       统计每个浏览器调用的次数和耗时，运行结束时输出排序报告
+    --no-net-stats  不统计网络流量（默认按资源类型/主机统计请求数和传输字节数）
+    --spa-nav       帖子/板块之间用论坛前端路由跳转，不整页刷新（失败时自动整页加载）
+    --preload       阅读当前帖子时在后台标签页预加载下一个帖子，读完直接切换
+    --low-render    低渲染开销模式：减少动态效果、关闭 CSS 动画和过渡、使用较小的视口
+    --record        录制板块/帖子页面快照到目录，供 bench/bench_replay.py 离线回放
+    --journal       结构化事件日志（JSON Lines）路径，每个帖子/滚动/点赞/错误一行
+    --metrics-file  Prometheus 指标文件路径（node_exporter textfile collector）
+    --metrics-port  在本地端口提供 Prometheus /metrics
+    --user-data-dir 浏览器用户数据目录，HTTP 缓存和登录状态跨运行保留
+    --profile-archive  用户数据目录归档（tar.gz），启动前解包、退出后打包，
+                    用于在临时运行环境（Actions/容器）之间传递缓存
+    --ram-profile   用户数据目录复制到内存盘（/dev/shm）运行，检查点和退出时原子写回
+    --profile-budget  用户数据目录大小上限（MB），启动前按从旧到新删除缓存，保留登录数据
+    --daemon        守护进程模式，常驻运行并按间隔自动执行（复用已登录的浏览器）
+    --interval      守护进程运行间隔（分钟），默认 120
+    --jitter        运行间隔随机抖动（±分钟），默认 15
+    --max-runs      守护进程最多运行次数，默认不限
 
 示例：
     # 基本使用
@@ -45,6 +65,9 @@ Linux.do 论坛自动浏览脚本 (无头版 / Headless)
     # 使用代理
     python linux_do_headless.py -u myuser -p mypass --proxy 127.0.0.1:7897
 
+    # 守护进程模式（自建服务器，每 2 小时左右运行一次，浏览器常驻）
+    python linux_do_headless.py -u myuser -p mypass --daemon --interval 120 --jitter 15
+
 ================================================================================
 GitHub Actions 配置
 ================================================================================
@@ -86,6 +109,24 @@ except ImportError:
     print("运行: pip install DrissionPage")
     sys.exit(1)
 
+from linux_do_guard import GuardedPage, MemoryMonitor, recovery_summary
+from linux_do_log import Logger
+from linux_do_metrics import CallProfiler, NetworkMeter, PhaseTimer, page_load_stats
+from linux_do_js import LOW_RENDER_VIEWPORT, LowRenderMode, call_helper, install_helpers
+from linux_do_nav import Navigator, TopicPreloader
+from linux_do_exporter import MetricsExporter
+from linux_do_journal import Journal, topic_id_from_url
+from linux_do_record import PageRecorder
+from linux_do_proxy import ProxyPool, target_from_url
+from linux_do_profile import (
+    RamProfile,
+    dir_size,
+    pack_profile,
+    prune_profile,
+    record_launch,
+    unpack_profile,
+)
+
 
 # ============================================================================
 # 配置
@@ -119,41 +160,27 @@ DEFAULT_CONFIG = {
     "scroll_max": 8,  # 最大滚动次数
     "wait_min": 1,  # 最小等待时间（秒）
     "wait_max": 3,  # 最大等待时间（秒）
+    "mem_heap_mb": 512,  # JS 堆超过该值（MB）时换新标签页
+    "mem_topics": 150,  # 同一标签页最多浏览的帖子数
+    "profile": False,  # 统计每个浏览器调用的次数和耗时（--profile）
+    "net_stats": True,  # 统计网络流量（CDP 网络事件，--no-net-stats 关闭）
+    "spa_nav": False,  # 帖子/板块之间用前端路由跳转，不整页刷新（--spa-nav）
+    "preload": False,  # 在后台标签页预加载下一个帖子（--preload）
+    "low_render": False,  # 低渲染开销模式（--low-render）
+    "metrics_file": None,  # Prometheus 指标文件路径（--metrics-file）
+    "metrics_port": 0,  # Prometheus 指标 HTTP 端口，0 表示不开启（--metrics-port）
+    "journal_file": None,  # 结构化事件日志（JSON Lines）路径（--journal）
+    "record_dir": None,  # 录制页面快照的目录，用于离线回放测试（--record）
+    "user_data_dir": None,  # 浏览器用户数据目录，缓存和登录状态跨运行保留（--user-data-dir）
+    "profile_archive": None,  # 用户数据目录归档，启动前解包、退出后打包（--profile-archive）
+    "ram_profile": False,  # 用户数据目录放在内存盘上运行（--ram-profile）
+    "ram_dir": None,  # 内存盘目录，为空自动选择（Linux 为 /dev/shm）
+    "profile_sync_min": 10,  # 内存盘模式下板块之间写回磁盘的最短间隔（分钟）
+    "profile_budget_mb": 0,  # 用户数据目录大小上限（MB），0 表示不限制（--profile-budget）
 }
 
 
 
-# ============================================================================
-# 日志工具
-# ============================================================================
-
-
-class Logger:
-    """简单的日志工具"""
-
-    def __init__(self, debug=False):
-        self.debug_mode = debug
-
-    def _timestamp(self):
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    def info(self, msg):
-        print(f"[{self._timestamp()}] [INFO] {msg}")
-
-    def success(self, msg):
-        print(f"[{self._timestamp()}] [OK] {msg}")
-
-    def warning(self, msg):
-        print(f"[{self._timestamp()}] [WARN] {msg}")
-
-    def error(self, msg):
-        print(f"[{self._timestamp()}] [ERROR] {msg}")
-
-    def debug(self, msg):
-        if self.debug_mode:
-            print(f"[{self._timestamp()}] [DEBUG] {msg}")
-
-
 # ============================================================================
 # 核心类
 # ============================================================================
@@ -181,7 +208,33 @@ class LinuxDoBot:
             "topics": 0,  # 浏览帖子数
             "likes": 0,  # 点赞数
             "floors": 0,  # 爬楼数
+            "errors": 0,  # 出错次数
         }
+        self.recoveries = {}  # 看门狗恢复计数
+        self.mem = None  # 内存监控
+        self.timer = PhaseTimer()  # 各阶段耗时统计
+        self.profiler = None  # 浏览器调用统计（config["profile"] 开启时创建）
+        self.net = NetworkMeter() if self.config["net_stats"] else None  # 网络流量统计
+        self.journal = Journal(self.config["journal_file"], bot="headless", account=username)
+        self.recorder = None  # 页面录制（config["record_dir"] 开启时创建）
+        self._load_logged = False  # 是否已记录首个页面的加载统计
+        self.ram = None  # 内存盘用户数据目录（config["ram_profile"] 开启时创建）
+        self.proxies = None  # 代理池（配置了代理时创建）
+        self.proxy = None  # 当前浏览器使用的代理
+        self.nav = None  # 帖子/板块跳转（浏览器启动后创建）
+        self.preloader = None  # 下一个帖子预加载（config["preload"] 开启时创建）
+        self.low_render = LowRenderMode() if self.config["low_render"] else None
+        if (self.config["profile_archive"] or self.config["ram_profile"]) and not self.config[
+            "user_data_dir"
+        ]:
+            self.config["user_data_dir"] = os.path.join(os.getcwd(), "browser_data")
+        self.exporter = None  # 指标导出
+        if self.config["metrics_file"] or self.config["metrics_port"]:
+            self.exporter = MetricsExporter(
+                username,
+                textfile=self.config["metrics_file"],
+                port=self.config["metrics_port"],
+            )
 
     def _random_delay(self, min_sec=None, max_sec=None, reason=""):
         """随机延迟（防风控）"""
@@ -192,6 +245,23 @@ class LinuxDoBot:
             self.log.debug(f"等待 {delay:.1f}s ({reason})")
         time.sleep(delay)
 
+    def _go(self, url):
+        """跳转到帖子/板块，返回使用的方式（"preload" 已预加载 / "spa" / "reload"）"""
+        if self.preloader and self.preloader.take(url):
+            return "preload"
+        if self.nav:
+            return self.nav.go(url)
+        self.page.get(url)
+        return "reload"
+
+    def _prepare_tab(self, tab):
+        """预加载用的新标签页：挂上网络流量统计，注册页面脚本库"""
+        if self.net:
+            self.net.attach(tab)
+        if self.low_render:
+            self.low_render.apply(tab, current=False)
+        install_helpers(tab, current=False)
+
     def start_browser(self, headless=True, proxy=None):
         """
         启动浏览器
@@ -205,39 +275,121 @@ class LinuxDoBot:
         """
         self.log.info("启动浏览器...")
 
-        try:
-            options = ChromiumOptions()
-
-            # 无头模式
-            if headless:
-                options.set_argument("--headless=new")
-                self.log.info("无头模式已启用")
-
-            # 代理设置
-            if proxy:
-                options.set_proxy(proxy)
-                self.log.info(f"代理已设置: {proxy}")
-
-            # 反自动化检测
-            options.set_argument("--disable-blink-features=AutomationControlled")
-            options.set_argument("--no-sandbox")
-            options.set_argument("--disable-dev-shm-usage")
-            options.set_argument("--disable-gpu")
-            options.set_argument("--window-size=1920,1080")
-
-            # 设置 User-Agent
-            options.set_argument(
-                "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        directory = self.config["user_data_dir"]
+        if directory and self.config["profile_budget_mb"]:
+            prune_profile(
+                directory, int(self.config["profile_budget_mb"] * 1048576), log=self.log.info
+            )
+        if self.config["ram_profile"] and not self.ram:
+            self.ram = RamProfile(
+                self.config["user_data_dir"],
+                root=self.config["ram_dir"],
+                interval=self.config["profile_sync_min"] * 60,
+                log=self.log.info,
             )
+        if self.ram:
+            self.ram.start()
 
-            self.page = ChromiumPage(options)
-            self.log.success("浏览器启动成功")
-            return True
+        if proxy and not self.proxies:
+            self.proxies = ProxyPool(
+                proxy, target=target_from_url(self.config["base_url"]), log=self.log.warning
+            )
+            self.proxies.check()
+            if len(self.proxies.proxies) > 1:
+                for line in self.proxies.report():
+                    self.log.info(f"代理 {line.strip()}")
+            self.proxies.start()
 
+        launch_start = time.perf_counter()
+        try:
+            page = self._launch_browser(headless=headless, proxy=proxy)
         except Exception as e:
             self.log.error(f"浏览器启动失败: {e}")
             return False
+        elapsed = time.perf_counter() - launch_start
+        self.timer.record("browser.launch", elapsed)
+        if directory:
+            previous = record_launch(self.ram.path if self.ram else directory, elapsed)
+            if previous is not None:
+                self.log.info(f"浏览器启动耗时 {elapsed:.1f}s（上次 {previous:.1f}s）")
+
+        self.page = GuardedPage(
+            page,
+            launch=lambda: self._relaunch_browser(headless, proxy),
+            restore=lambda: self._check_login() or self.login(),
+            log=self.log.warning,
+            counters=self.recoveries,
+            relaunch_when=self._proxy_failed,
+        )
+        if self.config["profile"]:
+            self.page = self.profiler = CallProfiler(self.page)
+        if self.config["record_dir"]:
+            self.recorder = PageRecorder(self.config["record_dir"], log=self.log.debug)
+            self.recorder.listen(self.page)
+        if self.net and not self.net.attach(self.page):
+            self.log.debug("网络流量统计不可用")
+        if self.low_render and not self.low_render.apply(self.page):
+            self.log.debug("低渲染开销模式设置失败")
+        install_helpers(self.page, current=False)
+        self.nav = Navigator(
+            self.page, self.config["base_url"], enabled=self.config["spa_nav"], log=self.log.debug
+        )
+        if self.config["preload"]:
+            self.preloader = TopicPreloader(
+                self.page, on_tab=self._prepare_tab, log=self.log.debug
+            )
+        self.log.success("浏览器启动成功")
+        return True
+
+    def _relaunch_browser(self, headless, proxy):
+        """看门狗重启浏览器时调用，失败返回 None"""
+        try:
+            return self._launch_browser(headless=headless, proxy=proxy)
+        except Exception as e:
+            self.log.error(f"浏览器重启失败: {e}")
+            return None
+
+    def _launch_browser(self, headless=True, proxy=None):
+        """创建 ChromiumPage"""
+        options = ChromiumOptions()
+
+        # 无头模式
+        if headless:
+            options.set_argument("--headless=new")
+            self.log.info("无头模式已启用")
+
+        # 代理设置（配置了多个代理时使用延迟最低的可用代理）
+        if self.proxies:
+            proxy = self.proxies.best()
+        self.proxy = proxy
+        if proxy:
+            options.set_proxy(proxy)
+            self.log.info(f"代理已设置: {proxy}")
+
+        # 用户数据目录（HTTP 缓存和登录状态跨运行保留，内存盘模式下使用内存盘上的副本）
+        if self.config["user_data_dir"]:
+            options.set_user_data_path(self.ram.path if self.ram else self.config["user_data_dir"])
+
+        # 反自动化检测
+        options.set_argument("--disable-blink-features=AutomationControlled")
+        options.set_argument("--no-sandbox")
+        options.set_argument("--disable-dev-shm-usage")
+        options.set_argument("--disable-gpu")
+        if self.low_render:
+            # 低渲染开销模式：小窗口、不使用平滑滚动
+            width, height = LOW_RENDER_VIEWPORT
+            options.set_argument(f"--window-size={width},{height}")
+            options.set_argument("--disable-smooth-scrolling")
+        else:
+            options.set_argument("--window-size=1920,1080")
+
+        # 设置 User-Agent
+        options.set_argument(
+            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        )
+
+        return ChromiumPage(options)
 
     def login(self):
         """
@@ -246,13 +398,23 @@ class LinuxDoBot:
         Returns:
             bool: 是否成功
         """
+        with self.journal.span("login") as ev:
+            ev["ok"] = self._login()
+        if ev["ok"]:
+            self._export(login_duration_seconds=ev["dur"])
+        return ev["ok"]
+
+    def _login(self):
+        """填写并提交登录表单，然后验证登录状态"""
         self.log.info("开始登录...")
 
         try:
             # 访问登录页面
             login_url = f"{self.config['base_url']}/login"
-            self.page.get(login_url)
-            self._random_delay(2, 4, "页面加载")
+            with self.timer.span("login.load"):
+                self.page.get(login_url)
+                self._random_delay(2, 4, "页面加载")
+            self._log_load_stats()
 
             # 输入用户名
             self.log.debug("输入用户名...")
@@ -295,14 +457,18 @@ class LinuxDoBot:
 
         except Exception as e:
             self.log.error(f"登录过程出错: {e}")
+            self.stats["errors"] += 1
+            self.journal.event("error", where="login", error=str(e))
             return False
 
     def _check_login(self):
         """检查是否已登录"""
         try:
             # 访问首页
-            self.page.get(self.config["base_url"])
-            self._random_delay(2, 3)
+            with self.timer.span("login.check"):
+                self.page.get(self.config["base_url"])
+                self._random_delay(2, 3)
+            self._log_load_stats()
 
             # 检查用户头像元素
             user_ele = self.page.ele("#current-user", timeout=5)
@@ -310,6 +476,26 @@ class LinuxDoBot:
         except:
             return False
 
+    def _proxy_failed(self):
+        """当前代理已失效且有其他可用代理时返回原因（看门狗在每次页面操作前调用，不记日志）"""
+        if self.proxies and self.proxy and self.proxies.failed(self.proxy):
+            return f"代理 {self.proxy} 已失效"
+        return None
+
+    def _log_load_stats(self):
+        """记录首个页面的加载耗时和传输量（比较冷/热缓存）"""
+        if self._load_logged:
+            return
+        self._load_logged = True
+        stats = page_load_stats(self.page)
+        if not stats:
+            return
+        self.log.info(
+            f"首个页面加载: {stats['load']:.2f}s，{stats['requests']} 个请求，"
+            f"传输 {stats['bytes'] / 1024:.0f} KB，缓存命中 {stats['cached']} 个"
+        )
+        self.journal.event("first_load", **stats)
+
     def get_topics(self, category):
         """
         获取板块帖子列表
@@ -324,46 +510,36 @@ class LinuxDoBot:
         self.log.info(f"进入板块: {category['name']}")
 
         try:
-            self.page.get(url)
-            self._random_delay(2, 4, "板块加载")
+            with self.timer.span("cat.load"):
+                # 前端路由已确认到达目标，等待可以短一些
+                loaded = self._go(url) != "reload"
+                self._random_delay(*((0.5, 1.5) if loaded else (2, 4)), "板块加载")
 
             # 使用 JS 获取帖子列表
-            topics = self.page.run_js("""
-            function getTopics() {
-                const rows = document.querySelectorAll('tr.topic-list-item');
-                const topics = [];
-                rows.forEach(row => {
-                    const link = row.querySelector('a.title.raw-link.raw-topic-link');
-                    if (link) {
-                        const href = link.getAttribute('href');
-                        const title = link.textContent.trim();
-                        // 跳过置顶帖
-                        if (href && title && !row.classList.contains('pinned')) {
-                            topics.push({
-                                url: href,
-                                title: title.substring(0, 50)
-                            });
-                        }
-                    }
-                });
-                return topics;
-            }
-            return getTopics();
-            """)
+            list_start = time.perf_counter()
+            topics = call_helper(self.page, "topics")
+            self.timer.record("cat.list", time.perf_counter() - list_start)
+            if self.recorder:
+                self.recorder.capture(
+                    "category", self.page, expect={"topics": [t["url"] for t in topics or []]}
+                )
 
             self.log.debug(f"找到 {len(topics or [])} 个帖子")
             return topics or []
 
         except Exception as e:
             self.log.error(f"获取帖子列表失败: {e}")
+            self.stats["errors"] += 1
+            self.journal.event("error", where="get_topics", category=category["name"], error=str(e))
             return []
 
-    def browse_topic(self, topic):
+    def browse_topic(self, topic, next_topic=None):
         """
         浏览单个帖子
 
         Args:
             topic: 帖子信息字典
+            next_topic: 下一个要浏览的帖子，开启预加载时在阅读本帖期间后台加载
 
         Returns:
             bool: 是否成功
@@ -378,66 +554,282 @@ class LinuxDoBot:
         self.log.info(f"浏览: {title}")
 
         try:
-            self.page.get(url)
-            self._random_delay(2, 3, "帖子加载")
+            with self.timer.span("topic.load"):
+                # 预加载或前端路由已确认到达目标，等待可以短一些
+                loaded = self._go(url) != "reload"
+            if self.preloader and next_topic:
+                next_url = next_topic["url"]
+                if next_url.startswith("/"):
+                    next_url = self.config["base_url"] + next_url
+                self.preloader.start(next_url)
+            with self.timer.span("topic.ready"):
+                self._random_delay(*((0.5, 1.5) if loaded else (2, 3)), "帖子加载")
+            if self.recorder:
+                self.recorder.capture(
+                    "topic",
+                    self.page,
+                    expect=lambda: {
+                        "like_buttons": call_helper(self.page, "likeCount")
+                    },
+                )
 
             # 滚动阅读
             scroll_count = random.randint(
                 self.config["scroll_min"], self.config["scroll_max"]
             )
 
+            scroll_start = time.perf_counter()
+            scrolled = 0
             for i in range(scroll_count):
+                scrolled += 1
                 # 随机滚动距离
                 distance = random.randint(300, 800)
                 self.page.run_js(f"window.scrollBy(0, {distance})")
                 self._random_delay(1, 2.5, f"滚动 {i + 1}/{scroll_count}")
 
                 # 检查是否到底部
-                at_bottom = self.page.run_js("""
-                return (window.innerHeight + window.scrollY) >= document.body.offsetHeight - 100;
-                """)
+                at_bottom = call_helper(self.page, "atBottom")
                 if at_bottom:
                     self.log.debug("已到达页面底部")
                     break
+            scroll_seconds = time.perf_counter() - scroll_start
+            self.timer.record("topic.scroll", scroll_seconds)
+            self.journal.event(
+                "scroll",
+                topic_id=topic_id_from_url(url),
+                scrolls=scrolled,
+                bottom=bool(at_bottom) if scrolled else False,
+                dur=round(scroll_seconds, 3),
+            )
 
             self.stats["topics"] += 1
             self.stats["floors"] += scroll_count
 
             # 随机点赞
             if random.random() < self.config["like_rate"]:
-                self._do_like()
+                with self.timer.span("topic.like"):
+                    self._do_like(topic_id_from_url(url))
 
             return True
 
         except Exception as e:
             self.log.error(f"浏览帖子失败: {e}")
+            self.stats["errors"] += 1
+            self.journal.event(
+                "error", where="browse_topic", topic_id=topic_id_from_url(url), error=str(e)
+            )
             return False
 
-    def _do_like(self):
+    def _do_like(self, topic_id=None):
         """点赞主帖"""
         try:
-            result = self.page.run_js("""
-            function clickLike() {
-                const buttons = document.querySelectorAll('button.btn-toggle-reaction-like');
-                if (buttons.length > 0) {
-                    const btn = buttons[0];
-                    if (!btn.classList.contains('has-like') && !btn.classList.contains('my-likes')) {
-                        btn.click();
-                        return true;
-                    }
-                }
-                return false;
-            }
-            return clickLike();
-            """)
+            result = call_helper(self.page, "like", 0, False)
 
             if result:
                 self.stats["likes"] += 1
                 self.log.success("点赞成功")
+                self.journal.event("like", topic_id=topic_id, index=0)
                 self._random_delay(0.5, 1.5, "点赞后")
 
         except Exception as e:
             self.log.debug(f"点赞失败: {e}")
+            self.journal.event("error", where="like", topic_id=topic_id, error=str(e))
+
+    def browse(self, target_topics):
+        """
+        浏览帖子直到达到目标数量（浏览器需已启动并登录）
+
+        Args:
+            target_topics: 目标浏览帖子数
+        """
+        self.mem = MemoryMonitor(
+            self.page,
+            log=self.log.info,
+            heap_limit_mb=self.config["mem_heap_mb"],
+            topic_limit=self.config["mem_topics"],
+        )
+
+        # 获取启用的板块
+        enabled_categories = [c for c in CATEGORIES if c.get("enabled", True)]
+        random.shuffle(enabled_categories)
+
+        self.log.info(f"将浏览 {len(enabled_categories)} 个板块")
+
+        # 开始浏览
+        while self.stats["topics"] < target_topics:
+            for category in enabled_categories:
+                if self.stats["topics"] >= target_topics:
+                    break
+
+                self._checkpoint_profile()  # 板块之间：到了写回间隔就写回内存盘
+
+                # 获取帖子列表
+                topics = self.get_topics(category)
+                if not topics:
+                    continue
+
+                # 随机选择几个帖子
+                count = min(random.randint(2, 5), len(topics))
+                selected = random.sample(topics, count)
+
+                for i, topic in enumerate(selected):
+                    if self.stats["topics"] >= target_topics:
+                        break
+                    next_topic = None
+                    if i + 1 < len(selected) and self.stats["topics"] + 1 < target_topics:
+                        next_topic = selected[i + 1]
+
+                    # 帖子边界：采样内存，超限时换新标签页
+                    self.mem.at_boundary(self.stats["topics"])
+                    if self.net:
+                        self.net.attach(self.page)  # 换过标签页或重启过浏览器时重新挂上
+                        self.net.delta()  # 帖子之间的流量（板块列表等）只计入总量
+                    if self.low_render:
+                        self.low_render.apply(self.page)
+                    before = dict(self.stats)
+                    with self.journal.span(
+                        "topic",
+                        topic_id=topic_id_from_url(topic["url"]),
+                        category=category["name"],
+                        url=topic["url"],
+                    ) as ev:
+                        ev["ok"] = self.browse_topic(topic, next_topic)
+                        for key in ("floors", "likes"):
+                            ev[key] = self.stats[key] - before[key]
+                        if self.net:
+                            ev["requests"], ev["bytes"] = self.net.delta()
+                    self._export()
+                    self._random_delay(reason="切换帖子")
+
+            # 如果一轮结束还没达到目标，重新打乱板块顺序
+            random.shuffle(enabled_categories)
+
+    def _export(self, **gauges):
+        """更新导出的指标（未开启导出时不做任何事）"""
+        if not self.exporter:
+            return
+        memory = self.mem.samples[-1] if self.mem and self.mem.samples else None
+        self.exporter.update(
+            stats=self.stats,
+            timer=self.timer,
+            recoveries=self.recoveries,
+            memory=memory,
+            **gauges,
+        )
+
+    def _end_run(self, elapsed):
+        """一次运行结束：输出统计并累计导出的指标"""
+        self._print_summary(elapsed)
+        self.journal.event("run_end", dur=round(elapsed, 1), **self.stats)
+        if self.exporter:
+            self._export()
+            self.exporter.end_run(elapsed, ok=self.stats["topics"] > 0)
+
+    def _print_summary(self, elapsed):
+        """输出统计结果"""
+        elapsed_min = int(elapsed / 60)
+        elapsed_sec = int(elapsed % 60)
+
+        self.log.info("=" * 60)
+        self.log.info("任务完成")
+        self.log.info(f"用时: {elapsed_min}分{elapsed_sec}秒")
+        self.log.info(f"浏览帖子: {self.stats['topics']}")
+        self.log.info(f"点赞数: {self.stats['likes']}")
+        self.log.info(f"滚动次数: {self.stats['floors']}")
+        if self.stats["errors"]:
+            self.log.info(f"出错次数: {self.stats['errors']}")
+        if any(self.recoveries.values()):
+            self.log.info(f"浏览器恢复: {recovery_summary(self.recoveries)}")
+        if self.mem:
+            for line in self.mem.report():
+                self.log.info(line)
+        for line in self.timer.report():
+            self.log.info(line)
+        if self.net:
+            for line in self.net.report(self.stats["topics"]):
+                self.log.info(line)
+        if self.nav:
+            for line in self.nav.report():
+                self.log.info(line)
+        if self.preloader:
+            for line in self.preloader.report():
+                self.log.info(line)
+        if self.profiler:
+            for line in self.profiler.report():
+                self.log.info(line)
+        self.log.info("=" * 60)
+
+    def close_browser(self):
+        """关闭浏览器"""
+        if self.preloader:
+            self.preloader.discard()
+        if self.page:
+            try:
+                self.page.quit()
+            except:
+                pass
+            self.page = None
+        if self.ram:
+            self.ram.stop()
+
+    def _checkpoint_profile(self, force=False, full=False):
+        """
+        检查点：短暂关闭浏览器，把内存盘用户数据目录写回磁盘后重新启动
+
+        Chrome 独占打开 Cookies 等数据库，只有浏览器关闭时才能得到一致的副本。
+
+        Args:
+            force: 不管是否到了写回间隔都写回（如刚登录后）
+            full: 是否连同缓存一起写回
+        """
+        if not self.ram or not self.ram.active or not self.page:
+            return
+        if not force and not self.ram.due():
+            return
+        if self.preloader:
+            self.preloader.discard()  # 预加载的标签页随浏览器一起关闭
+        self.log.info("[内存盘] 关闭浏览器写回用户数据目录")
+        if not self.page.restart(between=lambda: self.ram.sync(full=full)):
+            self.log.warning("[内存盘] 写回后浏览器重启失败")
+            self.close_browser()
+
+    def _restore_profile(self):
+        """启动前：用户数据目录为空时从归档解包"""
+        directory = self.config["user_data_dir"]
+        archive = self.config["profile_archive"]
+        if not directory or not archive:
+            return
+        if os.path.isdir(directory) and os.listdir(directory):
+            self.log.debug(f"用户数据目录已存在，不解包: {directory}")
+            return
+        start = time.perf_counter()
+        try:
+            if unpack_profile(archive, directory):
+                self.log.info(
+                    f"已解包用户数据目录: {archive} -> {directory}"
+                    f"（{dir_size(directory) / 1048576:.1f} MB，{time.perf_counter() - start:.1f}s）"
+                )
+            else:
+                self.log.info(f"没有用户数据归档 {archive}，从空目录开始")
+        except Exception as e:
+            self.log.warning(f"解包用户数据目录失败，从空目录开始: {e}")
+
+    def _save_profile(self):
+        """浏览器退出后：把用户数据目录打包为归档"""
+        directory = self.config["user_data_dir"]
+        archive = self.config["profile_archive"]
+        if not directory or not archive:
+            return
+        start = time.perf_counter()
+        try:
+            size = pack_profile(directory, archive)
+            if size:
+                self.log.info(
+                    f"已打包用户数据目录: {archive}"
+                    f"（{size / 1048576:.1f} MB，{time.perf_counter() - start:.1f}s）"
+                )
+        except Exception as e:
+            self.log.warning(f"打包用户数据目录失败: {e}")
 
     def run(self, target_topics=30, headless=True, proxy=None):
         """
@@ -457,75 +849,185 @@ class LinuxDoBot:
         self.log.info("=" * 60)
 
         start_time = time.time()
+        self.journal.event("run_start", target=target_topics)
+
+        self._restore_profile()
 
         try:
             # 启动浏览器
             if not self.start_browser(headless=headless, proxy=proxy):
                 return self.stats
 
-            # 登录
-            if not self.login():
+            # 登录（用户数据目录中保存了登录状态时跳过）
+            if self.config["user_data_dir"] and self._check_login():
+                self.log.success("已是登录状态")
+            elif self.login():
+                self._checkpoint_profile(force=True)  # 尽早保存登录状态
+            else:
                 return self.stats
 
-            # 获取启用的板块
-            enabled_categories = [c for c in CATEGORIES if c.get("enabled", True)]
-            random.shuffle(enabled_categories)
-
-            self.log.info(f"将浏览 {len(enabled_categories)} 个板块")
-
-            # 开始浏览
-            while self.stats["topics"] < target_topics:
-                for category in enabled_categories:
-                    if self.stats["topics"] >= target_topics:
-                        break
-
-                    # 获取帖子列表
-                    topics = self.get_topics(category)
-                    if not topics:
-                        continue
-
-                    # 随机选择几个帖子
-                    count = min(random.randint(2, 5), len(topics))
-                    selected = random.sample(topics, count)
-
-                    for topic in selected:
-                        if self.stats["topics"] >= target_topics:
-                            break
-
-                        self.browse_topic(topic)
-                        self._random_delay(reason="切换帖子")
-
-                # 如果一轮结束还没达到目标，重新打乱板块顺序
-                random.shuffle(enabled_categories)
+            self.browse(target_topics)
 
         except KeyboardInterrupt:
             self.log.warning("用户中断")
 
         except Exception as e:
             self.log.error(f"运行出错: {e}")
+            self.stats["errors"] += 1
 
         finally:
             # 关闭浏览器
-            if self.page:
-                try:
-                    self.page.quit()
-                except:
-                    pass
+            self.close_browser()
+            self._save_profile()
 
         # 统计结果
-        elapsed = time.time() - start_time
-        elapsed_min = int(elapsed / 60)
-        elapsed_sec = int(elapsed % 60)
+        self._end_run(time.time() - start_time)
+
+        return self.stats
 
+    # ------------------------------------------------------------------------
+    # 守护进程模式
+    # ------------------------------------------------------------------------
+
+    def _ensure_session(self, headless=True, proxy=None):
+        """确保浏览器存活且已登录（守护进程模式下复用热浏览器）"""
+        if self.page:
+            try:
+                if self._check_login():
+                    self.log.debug("复用已登录的浏览器")
+                    return True
+                self.log.warning("登录状态已失效，重新登录")
+                if self.login():
+                    self._checkpoint_profile(force=True)
+                    return True
+                # 登录失败可能是浏览器本身已失效，重启后再试一次
+                self.close_browser()
+            except Exception as e:
+                self.log.warning(f"浏览器已失效，重新启动: {e}")
+                self.close_browser()
+
+        if not self.start_browser(headless=headless, proxy=proxy):
+            return False
+        if not self.login():
+            return False
+        self._checkpoint_profile(force=True)  # 尽早保存登录状态
+        return True
+
+    def _trim_idle(self):
+        """两次运行之间：关闭多余标签页并释放内存"""
+        if not self.page:
+            return
+        try:
+            if self.page.tabs_count > 1:
+                self.page.close_tabs(self.page.tab_id, others=True)
+                self.log.debug("已关闭空闲标签页")
+        except Exception as e:
+            self.log.debug(f"关闭标签页失败: {e}")
+
+        try:
+            # 离开论坛页面，释放 Ember 应用占用的内存
+            self.page.get("about:blank")
+            self.page.run_cdp("HeapProfiler.collectGarbage")
+            self.page.run_cdp("Memory.simulatePressureNotification", level="critical")
+            self.log.debug("已释放浏览器内存")
+        except Exception as e:
+            self.log.debug(f"释放内存失败: {e}")
+
+    def run_daemon(
+        self,
+        target_topics=30,
+        interval=120,
+        jitter=15,
+        headless=True,
+        proxy=None,
+        max_runs=0,
+    ):
+        """
+        守护进程模式：常驻运行，内置带随机抖动的定时调度，
+        两次运行之间保持浏览器和登录状态
+
+        Args:
+            target_topics: 每次运行的目标浏览帖子数
+            interval: 运行间隔（分钟）
+            jitter: 间隔随机抖动范围（±分钟）
+            headless: 是否无头模式
+            proxy: 代理地址
+            max_runs: 最多运行次数，0 表示不限
+
+        Returns:
+            dict: 累计统计结果
+        """
         self.log.info("=" * 60)
-        self.log.info("任务完成")
-        self.log.info(f"用时: {elapsed_min}分{elapsed_sec}秒")
-        self.log.info(f"浏览帖子: {self.stats['topics']}")
-        self.log.info(f"点赞数: {self.stats['likes']}")
-        self.log.info(f"滚动次数: {self.stats['floors']}")
+        self.log.info("Linux.do 自动浏览守护进程启动")
+        self.log.info(f"每次浏览 {target_topics} 个帖子，间隔 {interval}±{jitter} 分钟")
         self.log.info("=" * 60)
 
-        return self.stats
+        totals = {key: 0 for key in self.stats}
+        runs = 0
+        self._restore_profile()
+
+        try:
+            while not max_runs or runs < max_runs:
+                runs += 1
+                self.log.info(f"第 {runs} 次运行开始")
+                self.stats = {key: 0 for key in totals}
+                self.recoveries.clear()
+                self.mem = None
+                self.timer = PhaseTimer()
+                if self.net:
+                    self.net.reset()
+                if self.nav:
+                    self.nav.reset()
+                if self.preloader:
+                    self.preloader.reset()
+                if self.profiler:
+                    self.profiler.reset()
+                start_time = time.time()
+                self.journal.new_run()
+                self.journal.event("run_start", target=target_topics, daemon_run=runs)
+
+                try:
+                    if self._ensure_session(headless=headless, proxy=proxy):
+                        self.browse(target_topics)
+                    else:
+                        self.log.error("浏览器启动或登录失败，本次运行跳过")
+                        self.close_browser()
+                except KeyboardInterrupt:
+                    raise
+                except Exception as e:
+                    self.log.error(f"运行出错: {e}")
+                    self.stats["errors"] += 1
+                    self.close_browser()
+
+                self._end_run(time.time() - start_time)
+                for key in totals:
+                    totals[key] += self.stats[key]
+
+                if max_runs and runs >= max_runs:
+                    break
+
+                self._checkpoint_profile(full=True)  # 两次运行之间写回内存盘
+                self._trim_idle()
+
+                # 带随机抖动的下次运行时间
+                delay = max(60, (interval + random.uniform(-jitter, jitter)) * 60)
+                next_run = datetime.fromtimestamp(time.time() + delay)
+                self.log.info(f"下次运行时间: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+                time.sleep(delay)
+
+        except KeyboardInterrupt:
+            self.log.warning("用户中断")
+
+        finally:
+            self.close_browser()
+            self._save_profile()
+
+        self.log.info(
+            f"守护进程退出，共运行 {runs} 次，累计浏览 {totals['topics']} 个帖子，"
+            f"点赞 {totals['likes']} 次"
+        )
+        self.stats = totals
+        return totals
 
 
 # ============================================================================
@@ -543,11 +1045,12 @@ def parse_args():
   python linux_do_headless.py -u myuser -p mypass
   python linux_do_headless.py -u myuser -p mypass --topics 50
   python linux_do_headless.py -u myuser -p mypass --proxy 127.0.0.1:7897
+  python linux_do_headless.py -u myuser -p mypass --daemon --interval 120
 
 环境变量:
   LINUXDO_USERNAME  用户名
   LINUXDO_PASSWORD  密码
-  LINUXDO_PROXY     代理地址（可选）
+  LINUXDO_PROXY     代理地址（可选，多个用逗号分隔）
         """,
     )
 
@@ -557,7 +1060,7 @@ def parse_args():
     parser.add_argument(
         "-p", "--password", help="Linux.do 密码（或设置环境变量 LINUXDO_PASSWORD）"
     )
-    parser.add_argument("--proxy", help="代理地址，如 127.0.0.1:7897")
+    parser.add_argument("--proxy", help="代理地址，如 127.0.0.1:7897，多个用逗号分隔")
     parser.add_argument("--topics", type=int, default=30, help="浏览帖子数量，默认 30")
     parser.add_argument(
         "--like-rate", type=int, default=40, help="点赞概率（0-100），默认 40"
@@ -566,6 +1069,52 @@ def parse_args():
         "--no-headless", action="store_true", help="禁用无头模式（显示浏览器窗口）"
     )
     parser.add_argument("--debug", action="store_true", help="调试模式")
+    parser.add_argument("--log-file", help="日志文件路径（按 5MB 自动轮转）")
+    parser.add_argument("--record", help="录制页面快照到该目录（用于离线回放测试）")
+    parser.add_argument("--journal", help="结构化事件日志路径（JSON Lines，按 20MB 自动轮转）")
+    parser.add_argument("--metrics-file", help="Prometheus 指标文件路径（textfile collector）")
+    parser.add_argument(
+        "--metrics-port", type=int, default=0, help="在本地端口提供 Prometheus /metrics，默认不开启"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="统计浏览器调用（get/run_js/ele）的次数和耗时"
+    )
+    parser.add_argument(
+        "--no-net-stats", action="store_true", help="不统计网络流量（请求数和传输字节数）"
+    )
+    parser.add_argument(
+        "--spa-nav", action="store_true", help="帖子/板块之间用前端路由跳转，不整页刷新"
+    )
+    parser.add_argument(
+        "--preload", action="store_true", help="在后台标签页预加载下一个帖子，读完直接切换"
+    )
+    parser.add_argument(
+        "--low-render", action="store_true", help="低渲染开销模式（减少动态效果、关闭动画、小视口）"
+    )
+    parser.add_argument("--user-data-dir", help="浏览器用户数据目录（缓存和登录状态跨运行保留）")
+    parser.add_argument(
+        "--profile-archive", help="用户数据目录归档（tar.gz），启动前解包、退出后打包"
+    )
+    parser.add_argument(
+        "--ram-profile",
+        action="store_true",
+        help="用户数据目录复制到内存盘运行，检查点短暂关闭浏览器原子写回磁盘",
+    )
+    parser.add_argument(
+        "--profile-budget", type=float, default=0, help="用户数据目录大小上限（MB），默认不限制"
+    )
+    parser.add_argument(
+        "--daemon", action="store_true", help="守护进程模式（常驻运行，内置定时调度）"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=120, help="守护进程运行间隔（分钟），默认 120"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=15, help="运行间隔随机抖动（±分钟），默认 15"
+    )
+    parser.add_argument(
+        "--max-runs", type=int, default=0, help="守护进程最多运行次数，默认 0（不限）"
+    )
 
     return parser.parse_args()
 
@@ -593,19 +1142,48 @@ def main():
         sys.exit(1)
 
     # 创建日志工具
-    logger = Logger(debug=args.debug)
+    logger = Logger(debug=args.debug, log_file=args.log_file)
 
     # 配置
     config = {
         "like_rate": args.like_rate / 100,  # 转换为小数
+        "profile": args.profile,
+        "net_stats": not args.no_net_stats,
+        "spa_nav": args.spa_nav,
+        "preload": args.preload,
+        "low_render": args.low_render,
+        "metrics_file": args.metrics_file,
+        "metrics_port": args.metrics_port,
+        "journal_file": args.journal,
+        "record_dir": args.record,
+        "user_data_dir": args.user_data_dir,
+        "profile_archive": args.profile_archive,
+        "ram_profile": args.ram_profile,
+        "profile_budget_mb": args.profile_budget,
     }
 
     # 创建机器人并运行
     bot = LinuxDoBot(username=username, password=password, config=config, logger=logger)
 
-    stats = bot.run(
-        target_topics=args.topics, headless=not args.no_headless, proxy=proxy
-    )
+    if args.daemon:
+        stats = bot.run_daemon(
+            target_topics=args.topics,
+            interval=args.interval,
+            jitter=args.jitter,
+            headless=not args.no_headless,
+            proxy=proxy,
+            max_runs=args.max_runs,
+        )
+    else:
+        stats = bot.run(
+            target_topics=args.topics, headless=not args.no_headless, proxy=proxy
+        )
+
+    if bot.exporter:
+        bot.exporter.close()
+    if bot.proxies:
+        bot.proxies.stop()
+    bot.journal.close()
 
     # 返回状态码
     sys.exit(0 if stats["topics"] > 0 else 1)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+运行事件日志（JSON Lines）
+
+每个动作一行 JSON：帖子浏览、滚动、点赞、回复、错误、等级快照……
+字段固定、可直接用 jq / pandas 分析，是性能分析的数据来源。
+
+文件只追加写入，每行一个事件。事件在调用线程中直接写入并 flush 到操作系统
+（不经过后台队列），进程崩溃或被杀时已写出的事件不会丢失；写到一半被中断的
+最后一行下次打开时补上换行，read_journal() 会跳过这种无法解析的行。
+不做 fsync，机器断电时仍可能丢失最近的事件。按大小轮转。
+
+事件公共字段：
+    ts      Unix 时间戳（秒，毫秒精度）
+    run     本次运行的 ID
+    bot     gui / headless / auto
+    account 账号（可选）
+    event   事件类型
+    dur     耗时（秒，span 事件才有）
+    ok      是否成功（span 事件才有）
+
+用法：
+    journal = Journal("linux_do_journal.jsonl", bot="headless", account="user")
+    journal.event("like", topic_id=123, index=0)
+    with journal.span("topic", topic_id=123) as ev:
+        ...
+        ev["floors"] = 12          # 补充字段，结束时一起写出
+"""
+
+import re
+import json
+import time
+import uuid
+from contextlib import contextmanager
+
+from linux_do_log import LogBackend
+
+_TOPIC_ID = re.compile(r"/t/(?:[^/?#]+/)?(\d+)")
+
+
+def topic_id_from_url(url):
+    """从帖子链接中取出帖子 ID，取不到返回 None"""
+    match = _TOPIC_ID.search(url or "")
+    return int(match.group(1)) if match else None
+
+
+def read_journal(path):
+    """逐条读取事件日志，跳过不完整或损坏的行"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class Journal:
+    """运行事件日志，path 为空时不写入（调用方无需判断）"""
+
+    def __init__(self, path=None, bot="", account=None, backend=None, **rotation):
+        """
+        Args:
+            path: 日志文件路径，为空则不写入
+            bot: 脚本名（gui / headless / auto）
+            account: 账号
+            backend: 共用的 LogBackend，传入时忽略 path/rotation
+            rotation: 传给 LogBackend 的轮转参数（max_bytes/backups/rotate_every）
+        """
+        self.bot = bot
+        self.account = account
+        self.run_id = None
+        self.backend = backend
+        if not backend and path:
+            rotation.setdefault("max_bytes", 20 * 1024 * 1024)
+            rotation.setdefault("backups", 5)
+            self.backend = LogBackend(path, console=False, sync=True, **rotation)
+        self.new_run()
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def new_run(self):
+        """开始新的一次运行（生成新的运行 ID）"""
+        self.run_id = uuid.uuid4().hex[:12]
+        return self.run_id
+
+    def event(self, event, **fields):
+        """写入一个事件"""
+        if not self.backend:
+            return
+        record = {"ts": round(time.time(), 3), "run": self.run_id, "bot": self.bot}
+        if self.account:
+            record["account"] = self.account
+        record["event"] = event
+        record.update(fields)
+        self.backend.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+
+    @contextmanager
+    def span(self, event, **fields):
+        """计时事件：结束时写出，附带 dur 和 ok；出错时记录 error 并继续抛出"""
+        start = time.perf_counter()
+        fields["ok"] = True
+        try:
+            yield fields
+        except Exception as e:
+            fields["ok"] = False
+            fields["error"] = str(e)[:200]
+            raise
+        finally:
+            fields["dur"] = round(time.perf_counter() - start, 3)
+            self.event(event, **fields)
+
+    def flush(self):
+        if self.backend:
+            self.backend.flush()
+
+    def close(self):
+        if self.backend:
+            self.backend.close()
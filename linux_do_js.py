@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+页面辅助脚本库
+
+三个机器人用到的页面脚本（帖子列表、楼层、等级、点赞按钮等）集中在这里，
+通过 CDP Page.addScriptToEvaluateOnNewDocument 在每个标签页注册一次，
+之后每个新文档加载时自动定义 window.__ldx。调用时只发送一行很短的脚本
+（如 __ldx.floor()），页面不必每次重新解析、编译几十行的函数体。
+
+当前文档还没有 __ldx 时（注册之前已打开的页面、注册失败等），
+call_helper 会先把脚本库注入当前文档再调用，调用方不需要关心是否已注册。
+
+另外提供 LowRenderMode（低渲染开销模式，无头版 --low-render）：模拟"减少动态效果"、
+关闭 CSS 动画和过渡、使用较小的视口，点赞前滚动到按钮也不再使用平滑滚动。
+只用 CPU 渲染的服务器上，没人看的动画和大尺寸光栅化会占去大量 CPU。
+
+用法：
+    install_helpers(page)                 # 可选：浏览器启动后提前注册
+    call_helper(page, "floor")            # {current, total, source} 或 None
+    call_helper(page, "like", 0, True)    # 点赞第 0 个按钮（先滚动到按钮位置）
+
+    low = LowRenderMode()
+    low.apply(page)                       # 每个标签页调用一次（已应用的标签页直接返回）
+"""
+
+# 脚本库本体：每个文档只定义一次，属性不可枚举
+HELPER_JS = r"""
+(() => {
+    if (window.__ldx) return;
+
+    const LIKE_SELECTORS = [
+        'button.btn-toggle-reaction-like',
+        '.discourse-reactions-reaction-button button',
+        'button[title="点赞此帖子"]',
+        '.post-menu-area button.reaction-button'
+    ];
+    const isLiked = btn => btn.classList.contains('has-like') || btn.classList.contains('my-likes');
+    // 开启"减少动态效果"（低渲染开销模式）时直接跳到目标位置
+    const scrollBehavior = () =>
+        matchMedia('(prefers-reduced-motion: reduce)').matches ? 'auto' : 'smooth';
+
+    const ldx = {
+        // 板块页：帖子列表（跳过置顶帖）
+        topics() {
+            const topics = [];
+            document.querySelectorAll('tr.topic-list-item').forEach(row => {
+                const link = row.querySelector('a.title.raw-link.raw-topic-link');
+                if (!link) return;
+                const href = link.getAttribute('href');
+                const title = link.textContent.trim();
+                if (href && title && !row.classList.contains('pinned')) {
+                    topics.push({
+                        url: href,
+                        title: title.substring(0, 50),
+                        id: row.getAttribute('data-topic-id')
+                    });
+                }
+            });
+            return topics;
+        },
+
+        // 板块页：所有帖子链接（完整地址，旧版脚本使用）
+        topicLinks() {
+            const topics = [];
+            document.querySelectorAll('.topic-list a.title').forEach(a => {
+                const title = a.textContent.trim();
+                // 过滤掉分类链接，只保留帖子链接
+                if (a.href && a.href.includes('/t/topic/') && title) {
+                    topics.push({url: a.href, title: title.substring(0, 50)});
+                }
+            });
+            return topics;
+        },
+
+        // 板块页：点击"回复"列按回复数排序
+        sortByReplies() {
+            const button = document.querySelector('th[data-sort-order="posts"] button');
+            if (!button) return false;
+            button.click();
+            return true;
+        },
+
+        // 帖子页：楼层信息（宽窗口 .timeline-replies "1/169"，窄窗口 #topic-progress .nums）
+        floor() {
+            const timeline = document.querySelector('.timeline-replies');
+            if (timeline) {
+                const match = timeline.textContent.trim().match(/(\d+)\s*\/\s*(\d+)/);
+                if (match) {
+                    return {
+                        current: parseInt(match[1]),
+                        total: parseInt(match[2]),
+                        source: 'timeline-replies'
+                    };
+                }
+            }
+            const progress = document.querySelector('#topic-progress .nums');
+            if (progress) {
+                const spans = progress.querySelectorAll('span');
+                if (spans.length >= 3) {
+                    const current = parseInt(spans[0].textContent);
+                    const total = parseInt(spans[2].textContent);
+                    if (!isNaN(current) && !isNaN(total)) {
+                        return {current: current, total: total, source: 'topic-progress'};
+                    }
+                }
+            }
+            return null;
+        },
+
+        // 是否已滚动到页面底部
+        atBottom() {
+            return (window.innerHeight + window.scrollY) >= document.body.offsetHeight - 100;
+        },
+
+        // 帖子页：点赞按钮数量
+        likeCount() {
+            return document.querySelectorAll('button.btn-toggle-reaction-like').length;
+        },
+
+        // 点赞第 index 个帖子（已点赞的跳过）；scroll 为 true 时先滚动到按钮位置再点击
+        like(index, scroll) {
+            const buttons = document.querySelectorAll('button.btn-toggle-reaction-like');
+            if (buttons.length <= index) return false;
+            const btn = buttons[index];
+            if (isLiked(btn)) return false;
+            if (scroll) {
+                btn.scrollIntoView({behavior: scrollBehavior(), block: 'center'});
+                setTimeout(() => btn.click(), 300);
+            } else {
+                btn.click();
+            }
+            return true;
+        },
+
+        // 点赞按钮信息（多种选择器依次尝试，旧版脚本使用）
+        likeButtons() {
+            for (const sel of LIKE_SELECTORS) {
+                const found = document.querySelectorAll(sel);
+                if (found.length === 0) continue;
+                return Array.from(found, (btn, idx) => ({
+                    index: idx,
+                    selector: sel,
+                    hasLiked: isLiked(btn) ||
+                        !!btn.closest('.discourse-reactions-reaction-button')?.classList.contains('has-used'),
+                    title: btn.title || '',
+                    visible: btn.offsetParent !== null
+                }));
+            }
+            return [];
+        },
+
+        // 点击第 index 个点赞按钮（与 likeButtons 使用相同的选择器顺序）
+        clickLikeButton(index) {
+            for (const sel of LIKE_SELECTORS) {
+                const buttons = document.querySelectorAll(sel);
+                if (buttons.length > index) {
+                    const btn = buttons[index];
+                    btn.scrollIntoView({behavior: scrollBehavior(), block: 'center'});
+                    setTimeout(() => btn.click(), 300);
+                    return true;
+                }
+            }
+            return false;
+        },
+
+        // connect 页面：用户名、等级、下一级和升级要求
+        level() {
+            const result = {username: '', level: '', nextLevel: '', requirements: []};
+            const h1 = document.querySelector('h1');
+            if (h1) {
+                const match = h1.textContent.match(/\((.+?)\)\s*(\d+)级用户/);
+                if (match) {
+                    result.username = match[1];
+                    result.level = match[2];
+                }
+            }
+            document.querySelectorAll('h2').forEach(h2 => {
+                const match = h2.textContent.match(/信任级别\s*(\d+)/);
+                if (match) result.nextLevel = match[1];
+            });
+            document.querySelectorAll('table tr').forEach(row => {
+                const cells = row.querySelectorAll('td');
+                if (cells.length < 3) return;
+                const name = cells[0].textContent.trim();
+                const current = cells[1].textContent.trim();
+                const required = cells[2].textContent.trim();
+                if (name && current && required && name !== '要求') {
+                    result.requirements.push({name: name, current: current, required: required});
+                }
+            });
+            return result;
+        },
+
+        // 用论坛前端路由跳转，返回是否已发起（linux_do_nav 使用）
+        route(origin, path) {
+            if (location.origin !== origin || typeof window.require !== 'function') return false;
+            let DiscourseURL;
+            try {
+                DiscourseURL = window.require('discourse/lib/url').default;
+            } catch (e) {
+                return false;
+            }
+            if (!DiscourseURL || typeof DiscourseURL.routeTo !== 'function') return false;
+            DiscourseURL.routeTo(path);
+            return true;
+        },
+
+        // 是否已到达目标路径：帖子地址会被改写成真实的 slug 并带上楼层号，按帖子 ID 比较
+        arrived(path) {
+            const want = path.split('?')[0].replace(/\/$/, '');
+            const have = location.pathname.replace(/\/$/, '');
+            const topic = want.match(/^\/t\/(?:[^\/]+\/)?(\d+)/);
+            if (topic) return new RegExp('^/t/(?:[^/]+/)?' + topic[1] + '(/\\d+)?$').test(have);
+            return have === want;
+        }
+    };
+
+    Object.defineProperty(window, '__ldx', {value: ldx});
+})();
+"""
+
+# 低渲染开销模式的视口：窄窗口布局下楼层计数器显示在 #topic-progress 中，仍能读取
+LOW_RENDER_VIEWPORT = (800, 600)
+
+# 关闭 CSS 动画和过渡：时长压到接近 0 而不是 none，依赖 animationend/transitionend
+# 事件的页面逻辑照常执行；循环动画（加载图标等）只播放一次
+NO_ANIMATION_JS = r"""
+(() => {
+    const css = '*, *::before, *::after {' +
+        'animation-duration: 0.001s !important; animation-delay: 0s !important;' +
+        'animation-iteration-count: 1 !important;' +
+        'transition-duration: 0.001s !important; transition-delay: 0s !important;' +
+        'scroll-behavior: auto !important; }';
+    const add = () => {
+        if (document.getElementById('__ldx-low-render')) return;
+        const style = document.createElement('style');
+        style.id = '__ldx-low-render';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) {
+        add();
+    } else {
+        new MutationObserver((_, observer) => {
+            if (!document.documentElement) return;
+            observer.disconnect();
+            add();
+        }).observe(document, {childList: true});
+    }
+})();
+"""
+
+# 调用脚本库中的函数（参数：函数名、参数...）；当前文档没有脚本库时返回 {ok: false}
+CALL_JS = """
+const [name, ...args] = arguments;
+if (!window.__ldx) return {ok: false};
+return {ok: true, value: window.__ldx[name](...args)};
+"""
+
+
+def install_helpers(page, current=True):
+    """
+    在标签页注册脚本库（之后每个新文档自动定义 __ldx）
+
+    Args:
+        page: 页面或标签页对象
+        current: 是否同时注入当前文档（新建的空白标签页不需要）
+    """
+    try:
+        page.run_cdp("Page.addScriptToEvaluateOnNewDocument", source=HELPER_JS)
+    except Exception:
+        pass  # 注册失败时 call_helper 仍会按需注入当前文档
+    if current:
+        page.run_js(HELPER_JS)
+
+
+def call_helper(page, name, *args):
+    """调用 __ldx.<name>(*args)，返回结果；当前文档还没有脚本库时先注册并注入"""
+    result = page.run_js(CALL_JS, name, *args) or {}
+    if not result.get("ok"):
+        install_helpers(page)
+        result = page.run_js(CALL_JS, name, *args) or {}
+    return result.get("value")
+
+
+class LowRenderMode:
+    """低渲染开销模式：减少动态效果、关闭 CSS 动画和过渡、缩小视口（按标签页应用）"""
+
+    def __init__(self, viewport=LOW_RENDER_VIEWPORT):
+        self.viewport = viewport
+        self._tabs = []  # 已应用的标签页（只保留最近几个）
+
+    def apply(self, page, current=True):
+        """
+        在标签页上开启低渲染开销模式，已开启时不重复操作
+
+        Args:
+            page: 页面或标签页对象
+            current: 是否同时作用于当前文档（新建的空白标签页不需要）
+
+        Returns:
+            bool: 是否成功
+        """
+        tab = getattr(page, "raw", page)
+        if any(t is tab for t in self._tabs):
+            return True
+        width, height = self.viewport
+        try:
+            page.run_cdp(
+                "Emulation.setEmulatedMedia",
+                features=[{"name": "prefers-reduced-motion", "value": "reduce"}],
+            )
+            page.run_cdp(
+                "Emulation.setDeviceMetricsOverride",
+                width=width,
+                height=height,
+                deviceScaleFactor=1,
+                mobile=False,
+            )
+            page.run_cdp("Page.addScriptToEvaluateOnNewDocument", source=NO_ANIMATION_JS)
+            if current:
+                page.run_js(NO_ANIMATION_JS)
+        except Exception:
+            return False
+        self._tabs = self._tabs[-3:] + [tab]
+        return True
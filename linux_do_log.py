@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+共享日志后端
+
+日志行先进入队列，由后台线程批量写入控制台和日志文件，
+浏览循环不会因为磁盘或管道 I/O 而阻塞。日志文件支持按大小和时间轮转。
+
+用法：
+    log = Logger(debug=False, log_file="linux_do.log")
+    log.info("开始浏览")
+    log.flush()   # 需要保证输出顺序时（如等待用户输入前）调用
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+
+# 日志级别（数值越大越重要）
+LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "OK": 20,
+    "WARN": 30,
+    "WARNING": 30,
+    "ERROR": 40,
+}
+
+
+class LogBackend:
+    """后台写日志线程：批量写入控制台和文件，按大小/时间轮转文件"""
+
+    def __init__(
+        self,
+        path=None,
+        console=True,
+        max_bytes=5 * 1024 * 1024,
+        backups=3,
+        rotate_every=0,
+        sync=False,
+    ):
+        """
+        Args:
+            path: 日志文件路径，None 表示不写文件
+            console: 是否输出到控制台
+            max_bytes: 单个日志文件最大字节数，超过后轮转，0 表示不限
+            backups: 轮转保留的历史文件数
+            rotate_every: 按时间轮转的间隔（秒），0 表示不按时间轮转
+            sync: 为 True 时不使用后台线程，每行在调用线程中直接写入并 flush，
+                  进程崩溃时不会丢失已经写入的行
+        """
+        self.path = path
+        self.console = console
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.rotate_every = rotate_every
+        self._file = None
+        self._opened_at = 0
+        self._q = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = None
+        if not sync:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line):
+        """写入一行日志（异步模式下不阻塞）"""
+        if self._closed:
+            return
+        if self._thread:
+            self._q.put(line)
+            return
+        with self._lock:
+            self._write_batch(line + "\n")
+
+    def flush(self, timeout=2):
+        """等待此前的日志全部写出"""
+        if self._closed or not self._thread:
+            return
+        done = threading.Event()
+        self._q.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """写出剩余日志并停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._thread:
+            with self._lock:
+                if self._file:
+                    self._file.close()
+                    self._file = None
+            return
+        self._q.put(None)
+        self._thread.join(timeout=2)
+
+    # ------------------------------------------------------------------
+    # 后台线程
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            # 阻塞等待第一条，然后取走队列中已有的全部日志，合并成一次写入
+            batch = [self._q.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [item for item in batch if isinstance(item, str)]
+            if lines:
+                self._write_batch("\n".join(lines) + "\n")
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if None in batch:
+                if self._file:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write_batch(self, text):
+        if self.console:
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+        if not self.path:
+            return
+        try:
+            self._rotate_if_needed()
+            if not self._file:
+                self._open()
+            self._file.write(text)
+            self._file.flush()
+        except OSError:
+            pass  # 写文件失败不影响运行
+
+    def _open(self):
+        torn = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+        if torn:
+            # 上次写到一半被中断的行没有换行符，补上，否则会和本次的第一行连在一起
+            self._file.write("\n")
+
+    def _rotate_if_needed(self):
+        if not os.path.exists(self.path):
+            return
+        size = self._file.tell() if self._file else os.path.getsize(self.path)
+        too_big = self.max_bytes and size >= self.max_bytes
+        too_old = (
+            self.rotate_every
+            and self._opened_at
+            and time.time() - self._opened_at >= self.rotate_every
+        )
+        if not (too_big or too_old):
+            return
+
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class Logger:
+    """分级日志工具，输出由 LogBackend 异步写出"""
+
+    def __init__(self, debug=False, log_file=None, console=True, backend=None, **rotation):
+        """
+        Args:
+            debug: 是否输出 DEBUG 级别
+            log_file: 日志文件路径，可选
+            console: 是否输出到控制台
+            backend: 共用的 LogBackend，传入时忽略 log_file/console/rotation
+            rotation: 传给 LogBackend 的轮转参数（max_bytes/backups/rotate_every）
+        """
+        self.debug_mode = debug
+        self.backend = backend or LogBackend(log_file, console=console, **rotation)
+
+    def log(self, level, msg):
+        if LEVELS.get(level, 20) < (10 if self.debug_mode else 20):
+            return
+        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.backend.write(f"[{ts}] [{level}] {msg}")
+
+    def info(self, msg):
+        self.log("INFO", msg)
+
+    def success(self, msg):
+        self.log("OK", msg)
+
+    def warning(self, msg):
+        self.log("WARN", msg)
+
+    def error(self, msg):
+        self.log("ERROR", msg)
+
+    def debug(self, msg):
+        self.log("DEBUG", msg)
+
+    def flush(self):
+        self.backend.flush()
+
+    def close(self):
+        self.backend.close()
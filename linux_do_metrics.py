@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+运行指标
+
+PhaseTimer：记录各阶段耗时（打开帖子、等待加载、爬楼、点赞、回复……），
+汇总为每个阶段的延迟直方图和 p50/p95/p99。开销很小，可以常开。
+
+CallProfiler：页面对象代理（按需开启），按调用位置统计每次 get / run_js / ele
+的次数和耗时，找出来回最多、最慢的浏览器调用。
+
+NetworkMeter：监听标签页的 CDP 网络事件，按资源类型和主机统计请求数和传输字节数
+（encodedDataLength，即实际经过网络/代理的字节数，含响应头），可按帖子分段。
+
+用法：
+    timer = PhaseTimer()
+    with timer.span("topic.get"):
+        page.get(url)
+    timer.summary()     # {"topic.get": {"count": .., "p50": .., ...}}
+    timer.report()      # 可直接写入日志的多行文本
+
+    page = CallProfiler(page)
+    page.run_js(js)     # 与原页面对象用法相同
+    page.report()       # 按合计耗时排序的调用报告
+
+    net = NetworkMeter()
+    net.attach(page)    # 切换标签页 / 重启浏览器后需再次调用
+    net.delta()         # 距上次调用的 (请求数, 字节数)，用于按帖子统计
+    net.report(topics)  # 按类型、主机汇总的流量报告
+    net.reset()         # 清空统计（守护进程每次运行开始时）
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import bisect
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# 直方图桶上界（秒）
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+# 每个阶段保留的耗时样本上限（超过后随机替换，用于估算分位数）
+RESERVOIR_SIZE = 4096
+
+
+class _Phase:
+    """单个阶段的耗时统计"""
+
+    __slots__ = ("count", "total", "max", "buckets", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # 最后一个桶为 +Inf
+        self.samples = []
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            i = random.randrange(self.count)
+            if i < RESERVOIR_SIZE:
+                self.samples[i] = seconds
+
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[index]
+
+
+class PhaseTimer:
+    """各阶段耗时统计"""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def span(self, phase):
+        """计时上下文：with timer.span("topic.get"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def record(self, phase, seconds):
+        """记录一次耗时（秒）"""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = _Phase()
+        stats.add(seconds)
+
+    def histogram(self, phase):
+        """返回 [(桶上界, 累计次数)]，最后一项上界为 inf"""
+        stats = self.phases.get(phase)
+        if not stats:
+            return []
+        result, running = [], 0
+        for bound, n in zip(BUCKETS + (float("inf"),), stats.buckets):
+            running += n
+            result.append((bound, running))
+        return result
+
+    def summary(self):
+        """各阶段汇总：{阶段: {count, total, mean, p50, p95, p99, max}}"""
+        result = {}
+        for phase, stats in self.phases.items():
+            samples = sorted(stats.samples)
+            result[phase] = {
+                "count": stats.count,
+                "total": stats.total,
+                "mean": stats.total / stats.count if stats.count else 0.0,
+                "p50": _percentile(samples, 0.50),
+                "p95": _percentile(samples, 0.95),
+                "p99": _percentile(samples, 0.99),
+                "max": stats.max,
+            }
+        return result
+
+    def report(self):
+        """返回阶段耗时报告（多行文本列表），按总耗时降序"""
+        summary = self.summary()
+        if not summary:
+            return []
+        lines = [
+            "阶段耗时（秒，按合计降序）:",
+            f"  {'phase':<24}{'count':>6}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'total':>9}",
+        ]
+        for phase, s in sorted(summary.items(), key=lambda kv: kv[1]["total"], reverse=True):
+            lines.append(
+                f"  {phase:<24}{s['count']:>6}{s['p50']:>8.2f}{s['p95']:>8.2f}"
+                f"{s['p99']:>8.2f}{s['max']:>8.2f}{s['total']:>9.1f}"
+            )
+        return lines
+
+
+# ============================================================================
+# 浏览器调用统计
+# ============================================================================
+
+# 统计的页面方法
+PROFILED_CALLS = ("get", "run_js", "ele", "run_cdp")
+
+
+def _describe(op, args):
+    """调用内容的简短描述：脚本取函数名或首行，数字统一替换为 N 以便归并"""
+    if not args:
+        return ""
+    target = str(args[0])
+    if op == "run_js":
+        match = re.search(r"function\s+(\w+)", target)
+        if match:
+            return match.group(1) + "()"
+        target = next((line.strip() for line in target.splitlines() if line.strip()), "")
+    elif op == "get":
+        target = re.sub(r"^\w+://[^/]+", "", target) or "/"
+    return re.sub(r"\d+", "N", target)[:48]
+
+
+class CallProfiler:
+    """页面代理：按调用位置统计浏览器调用的次数和耗时，其余属性原样转发"""
+
+    def __init__(self, page):
+        self._page = page
+        self.calls = {}  # (op, 调用位置) -> [次数, 合计秒, 最大秒, 描述]
+
+    def __getattr__(self, name):
+        attr = getattr(self._page, name)
+        if name not in PROFILED_CALLS:
+            return attr
+
+        def profiled(*args, **kwargs):
+            caller = sys._getframe(1)
+            site = f"{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno} {caller.f_code.co_name}"
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats = self.calls.get((name, site))
+                if stats is None:
+                    stats = self.calls[(name, site)] = [0, 0.0, 0.0, _describe(name, args)]
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+
+        return profiled
+
+    def reset(self):
+        self.calls = {}
+
+    def totals(self):
+        """各方法的调用次数：Counter({"run_js": .., "get": ..})"""
+        totals = Counter()
+        for (op, _), stats in self.calls.items():
+            totals[op] += stats[0]
+        return totals
+
+    def report(self, top=20):
+        """返回调用报告（多行文本列表），按合计耗时降序，最多 top 行"""
+        if not self.calls:
+            return []
+        count = sum(stats[0] for stats in self.calls.values())
+        total = sum(stats[1] for stats in self.calls.values())
+        lines = [
+            f"浏览器调用（共 {count} 次，合计 {total:.1f}s，按合计降序）:",
+            f"  {'op':<8}{'count':>6}{'mean ms':>9}{'max ms':>9}{'total s':>9}  site / script",
+        ]
+        ranked = sorted(self.calls.items(), key=lambda kv: kv[1][1], reverse=True)
+        for (op, site), (n, seconds, peak, label) in ranked[:top]:
+            lines.append(
+                f"  {op:<8}{n:>6}{seconds / n * 1000:>9.1f}{peak * 1000:>9.1f}{seconds:>9.2f}"
+                f"  {site}  {label}"
+            )
+        return lines
+
+
+# ============================================================================
+# 网络流量统计
+# ============================================================================
+
+
+def _format_bytes(n):
+    if n >= 1048576:
+        return f"{n / 1048576:.1f} MB"
+    return f"{n / 1024:.0f} KB"
+
+
+class NetworkMeter:
+    """按资源类型和主机统计请求数和传输字节数（CDP Network 事件）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # requestId -> (资源类型, 主机)
+        self._tabs = []  # 已挂上监听的标签页（只保留最近几个，关闭的标签页不再产生事件）
+        self.requests = 0
+        self.bytes = 0
+        self.by_type = {}  # 资源类型 -> [请求数, 字节数]
+        self.by_host = {}  # 主机 -> [请求数, 字节数]
+        self._mark = (0, 0)
+
+    def attach(self, page):
+        """在当前标签页上挂上网络事件监听，已挂上时不重复操作；返回是否成功"""
+        tab = getattr(page, "raw", page)
+        if any(t is tab for t in self._tabs):
+            return True
+        try:
+            driver = tab.driver
+            driver.set_callback("Network.requestWillBeSent", self._on_request)
+            driver.set_callback("Network.loadingFinished", self._on_finished)
+            driver.set_callback("Network.loadingFailed", self._on_failed)
+            tab.run_cdp("Network.enable")
+        except Exception:
+            return False
+        self._tabs = self._tabs[-3:] + [tab]
+        return True
+
+    def _on_request(self, **params):
+        url = (params.get("request") or {}).get("url", "")
+        if not url.startswith(("http:", "https:")):
+            return
+        key = (params.get("type") or "Other", urlsplit(url).hostname or "")
+        with self._lock:
+            if params.get("requestId") not in self._pending:
+                self._count(key, requests=1)
+            self._pending[params.get("requestId")] = key
+
+    def _on_finished(self, **params):
+        with self._lock:
+            key = self._pending.pop(params.get("requestId"), None)
+            if key:
+                self._count(key, size=int(params.get("encodedDataLength") or 0))
+
+    def _on_failed(self, **params):
+        with self._lock:
+            self._pending.pop(params.get("requestId"), None)
+
+    def _count(self, key, requests=0, size=0):
+        self.requests += requests
+        self.bytes += size
+        for table, name in ((self.by_type, key[0]), (self.by_host, key[1])):
+            stats = table.setdefault(name, [0, 0])
+            stats[0] += requests
+            stats[1] += size
+
+    def reset(self):
+        """清空统计（守护进程每次运行开始时调用），监听保持不变"""
+        with self._lock:
+            self.requests = self.bytes = 0
+            self.by_type.clear()
+            self.by_host.clear()
+            self._mark = (0, 0)
+
+    def delta(self):
+        """距上次调用新增的 (请求数, 字节数)"""
+        with self._lock:
+            current = (self.requests, self.bytes)
+        requests, size = current[0] - self._mark[0], current[1] - self._mark[1]
+        self._mark = current
+        return requests, size
+
+    def report(self, topics=0, top=6):
+        """返回流量报告（多行文本列表）"""
+        if not self.requests:
+            return []
+        with self._lock:
+            by_type = sorted(self.by_type.items(), key=lambda kv: kv[1][1], reverse=True)
+            by_host = sorted(self.by_host.items(), key=lambda kv: kv[1][1], reverse=True)
+        line = f"网络流量: 请求 {self.requests} 个，传输 {_format_bytes(self.bytes)}"
+        if topics:
+            line += f"（平均每帖 {_format_bytes(self.bytes / topics)}）"
+        lines = [line]
+        for title, rows in (("按类型", by_type), ("按主机", by_host)):
+            lines.append(
+                f"  {title}: "
+                + "，".join(f"{name or '-'} {_format_bytes(b)}/{n}" for name, (n, b) in rows[:top])
+            )
+        return lines
+
+
+# ============================================================================
+# 页面加载统计
+# ============================================================================
+
+# 当前文档的加载耗时和传输量（Navigation / Resource Timing）
+# transferSize 为 0 且 decodedBodySize 不为 0 的资源来自缓存；
+# 跨域资源没有开放计时信息时两者都是 0，不计入传输量和缓存命中
+LOAD_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const resources = performance.getEntriesByType('resource');
+let bytes = nav.transferSize || 0, cached = 0;
+for (const r of resources) {
+    bytes += r.transferSize || 0;
+    if (!r.transferSize && r.decodedBodySize) cached++;
+}
+return {
+    load: (nav.loadEventEnd || nav.domContentLoadedEventEnd || 0) / 1000,
+    requests: resources.length + 1,
+    bytes: bytes,
+    cached: cached
+};
+"""
+
+
+def page_load_stats(page):
+    """
+    当前页面的加载统计，取不到返回 None
+
+    Returns:
+        dict: {"load": 加载耗时（秒）, "requests": 请求数, "bytes": 传输字节数, "cached": 缓存命中数}
+    """
+    try:
+        return page.run_js(LOAD_STATS_JS)
+    except Exception:
+        return None
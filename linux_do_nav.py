@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+站内导航（前端路由）
+
+Discourse 是单页应用：page.get 每次都整页重新加载，重新下载、解析几 MB 的 JS。
+当前标签页已经打开论坛页面时，改用论坛自己的前端路由（DiscourseURL.routeTo）
+切换到帖子或板块，只请求该页面的 JSON 数据，通常几百毫秒就能完成。
+
+以下情况回退到 page.get 整页加载：
+    - 当前页面不是论坛页面（空白页、新换的标签页、登录前等），或拿不到前端路由
+    - 路由后超过 timeout 秒仍未到达目标地址
+
+页面不再整页刷新后 JS 堆会逐渐变大，由 MemoryMonitor 按阈值换标签页回收。
+
+另外提供 TopicPreloader：阅读当前帖子时，在后台标签页加载下一个帖子，
+读完后直接切换过去（GuardedPage.swap_tab）并关闭原标签页，加载时间与阅读时间重叠。
+
+用法：
+    nav = Navigator(page, "https://linux.do", timeout=8, log=print)
+    nav.go(url)        # 返回 "spa"（站内导航）或 "reload"（整页加载）
+    nav.report()       # 两种方式各用了几次
+
+    preload = TopicPreloader(page, log=print)
+    preload.start(next_url)   # 当前帖子加载完成后开始预加载下一个
+    preload.take(url)         # 已预加载好时切换过去并返回 True，否则返回 False
+    preload.discard()         # 关闭没用上的预加载标签页
+"""
+
+import time
+import threading
+from urllib.parse import urlsplit
+
+from linux_do_js import call_helper
+
+
+class Navigator:
+    """优先用前端路由跳转，失败时整页加载"""
+
+    def __init__(self, page, base_url, enabled=True, timeout=8, poll=0.1, log=None):
+        """
+        Args:
+            page: 页面对象
+            base_url: 站点地址，只有同源地址才走前端路由
+            enabled: 是否启用前端路由，关闭时总是整页加载
+            timeout: 前端路由等待到达目标的超时时间（秒）
+            poll: 检查是否到达的间隔（秒）
+            log: 日志函数
+        """
+        self.page = page
+        parts = urlsplit(base_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.enabled = enabled
+        self.timeout = timeout
+        self.poll = poll
+        self._log = log or print
+        self.counts = {"spa": 0, "reload": 0}
+
+    def go(self, url):
+        """跳转到 url，返回使用的方式（"spa" / "reload"）"""
+        if self.enabled and self._route(url):
+            self.counts["spa"] += 1
+            return "spa"
+        self.page.get(url)
+        self.counts["reload"] += 1
+        return "reload"
+
+    def _route(self, url):
+        parts = urlsplit(url)
+        if parts.netloc and f"{parts.scheme}://{parts.netloc}" != self.origin:
+            return False
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        try:
+            if not call_helper(self.page, "route", self.origin, path):
+                return False
+            # 地址在路由切换完成、页面渲染后才更新
+            deadline = time.perf_counter() + self.timeout
+            while time.perf_counter() < deadline:
+                if call_helper(self.page, "arrived", path):
+                    return True
+                time.sleep(self.poll)
+        except Exception as e:
+            self._log(f"站内导航失败，改为整页加载: {e}")
+            return False
+        self._log(f"站内导航超时，改为整页加载: {path}")
+        return False
+
+    def reset(self):
+        self.counts = {"spa": 0, "reload": 0}
+
+    def report(self):
+        """返回导航统计（多行文本列表），没有跳转过时为空"""
+        if not self.enabled or not any(self.counts.values()):
+            return []
+        return [f"页面跳转: 站内导航 {self.counts['spa']} 次，整页加载 {self.counts['reload']} 次"]
+
+
+class TopicPreloader:
+    """在后台标签页预加载下一个帖子"""
+
+    def __init__(self, page, timeout=30, on_tab=None, log=None):
+        """
+        Args:
+            page: GuardedPage 对象（需要 new_tab / close_tabs / swap_tab）
+            timeout: 切换时最多再等预加载完成多久（秒）
+            on_tab: 新标签页创建后、开始加载前的回调（如挂上网络流量统计）
+            log: 日志函数
+        """
+        self.page = page
+        self.timeout = timeout
+        self._on_tab = on_tab
+        self._log = log or print
+        self._lock = threading.Lock()
+        self._job = None  # {url, tab, error, done, thread, relaunches}
+        self.counts = {"hit": 0, "miss": 0}
+
+    def _relaunches(self):
+        return (getattr(self.page, "recoveries", None) or {}).get("relaunches", 0)
+
+    def start(self, url):
+        """在后台标签页开始加载 url（之前没用上的预加载标签页会被关闭）"""
+        self.discard()
+        job = {
+            "url": url,
+            "tab": None,
+            "error": None,
+            "done": False,  # 已取用或已放弃
+            "relaunches": self._relaunches(),  # 期间重启过浏览器时标签页已失效
+        }
+
+        def run():
+            try:
+                try:
+                    tab = self.page.new_tab(background=True)
+                except TypeError:
+                    tab = self.page.new_tab()
+                with self._lock:
+                    job["tab"] = tab
+                    cancelled = job["done"]
+                if cancelled:
+                    self._close(tab)
+                    return
+                if self._on_tab:
+                    self._on_tab(tab)
+                tab.get(url)
+            except Exception as e:
+                job["error"] = e
+
+        job["thread"] = threading.Thread(target=run, name="preload", daemon=True)
+        self._job = job
+        job["thread"].start()
+
+    def take(self, url):
+        """url 已在后台标签页加载时切换过去并返回 True，否则返回 False（由调用方自行加载）"""
+        job = self._job
+        if not job or job["url"] != url:
+            self.discard()
+            return False
+        job["thread"].join(self.timeout)
+        with self._lock:
+            job["done"] = True
+            tab = job["tab"]
+        self._job = None
+        reason = None
+        if job["thread"].is_alive():
+            reason = f"{self.timeout}s 内未加载完成"
+        elif job["error"] is not None:
+            reason = str(job["error"])
+        elif job["relaunches"] != self._relaunches():
+            reason = "浏览器已重启"
+        if reason or tab is None:
+            self.counts["miss"] += 1
+            self._log(f"[预加载] 未使用预加载的页面（{reason or '标签页未创建'}）")
+            if tab is not None:
+                self._close(tab)
+            return False
+        self.page.swap_tab(tab)
+        self.counts["hit"] += 1
+        return True
+
+    def discard(self):
+        """关闭没用上的预加载标签页"""
+        job, self._job = self._job, None
+        if not job:
+            return
+        with self._lock:
+            job["done"] = True
+            tab = job["tab"]
+        if tab is not None:
+            self._close(tab)
+
+    def _close(self, tab):
+        try:
+            self.page.close_tabs(tab.tab_id)
+        except Exception:
+            pass
+
+    def reset(self):
+        self.counts = {"hit": 0, "miss": 0}
+
+    def report(self):
+        """返回预加载统计（多行文本列表），没有预加载过时为空"""
+        if not any(self.counts.values()):
+            return []
+        return [f"预加载: 直接切换 {self.counts['hit']} 次，未用上 {self.counts['miss']} 次"]
@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+"""
+浏览器用户数据目录维护
+
+用户数据目录保存了 Cookie（登录状态）和 HTTP 缓存。临时的运行环境（GitHub Actions、
+容器）每次都从空目录开始，首个页面要重新下载 Discourse 的大体积 JS/CSS。
+把目录打包成一个归档文件在两次运行之间传递（actions/cache、对象存储……），
+下次运行解包后即可直接使用缓存和登录状态。
+
+打包时跳过 Chrome 运行时的锁文件；先写临时文件再替换，中途失败不会损坏已有归档。
+解包时拒绝指向目录外的路径。
+
+RamProfile：启动时把用户数据目录复制到内存盘（tmpfs），浏览器在内存盘上运行，
+在检查点和退出时把登录状态写回磁盘。写回时先在 <目录>.new 中准备好完整副本并 fsync，
+再用两次重命名替换原目录；任何时刻崩溃，下次启动时 recover_profile() 都能
+恢复出一个完整的目录（旧的或新的），不会留下写了一半的目录。
+Chrome 以独占方式打开 Cookies 等 SQLite 数据库，运行中复制得不到一致的副本，
+所以写回只能在浏览器关闭后进行：机器人在检查点（刚登录后；到了写回间隔时的板块之间、
+守护进程两次运行之间）关闭浏览器、写回、再重新启动（GuardedPage.restart）。
+复制期间仍有文件被删除或 LevelDB 目录有文件增删（浏览器没有真正退出）时放弃本次写回。
+
+prune_profile()：用户数据目录超过大小上限时，先删崩溃转储，再按最后使用时间从旧到新
+整个删除缓存目录（HTTP 缓存、代码缓存、GPU 缓存……），直到不超过上限。
+Cookie、Local Storage、IndexedDB 等保存登录状态的数据不会删除。只能在浏览器未运行时调用。
+
+用法：
+    unpack_profile("browser_data.tar.gz", "browser_data")   # 启动浏览器前
+    ...
+    pack_profile("browser_data", "browser_data.tar.gz")     # 浏览器退出后
+
+    ram = RamProfile("browser_data", log=print)
+    co.set_user_data_path(ram.start())   # 内存盘不可用时返回原目录
+    if ram.due():                        # 检查点：到写回间隔时
+        page.restart(between=ram.sync)   # 关闭浏览器、写回登录状态、重新启动
+    ram.stop()                           # 浏览器退出后，完整写回并删除内存盘副本
+
+    prune_profile("browser_data", 500 * 1048576, log=print)
+
+命令行：
+    python linux_do_profile.py prune browser_data --budget-mb 500
+    python linux_do_profile.py pack browser_data browser_data.tar.gz
+    python linux_do_profile.py unpack browser_data.tar.gz browser_data
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tarfile
+import argparse
+
+# Chrome 运行时的锁文件（打包时跳过，解包后残留会导致浏览器认为目录被占用）
+LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+# 可重新生成的缓存目录（按目录名匹配，出现在 Default/ 等子目录中）
+CACHE_DIRS = (
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "DawnCache",
+    "CacheStorage",
+    "ScriptCache",
+)
+
+# 崩溃转储目录（位于用户数据目录根部，可直接删除）
+CRASH_DIRS = ("Crashpad", "Crash Reports")
+
+# 记录浏览器启动耗时的文件（比较清理前后的启动耗时）
+LAUNCH_FILE = ".linuxdo-launch.json"
+
+# 写回完成标记（<目录>.new 中有该文件才说明副本完整）
+SYNC_MARKER = ".linuxdo-synced"
+
+# 默认内存盘位置
+RAM_ROOTS = ("/dev/shm",)
+
+
+class ProfileChanged(Exception):
+    """复制期间用户数据目录发生变化（浏览器还在运行），副本可能不一致"""
+
+
+def dir_size(directory):
+    """目录总大小（字节），不跟随符号链接"""
+    total = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                if not os.path.islink(path):
+                    total += os.path.getsize(path)
+            except OSError:
+                continue
+    return total
+
+
+def _pack_filter(info):
+    """打包过滤：跳过锁文件和符号链接"""
+    if os.path.basename(info.name) in LOCK_FILES or info.issym() or info.islnk():
+        return None
+    return info
+
+
+def pack_profile(directory, archive):
+    """
+    把用户数据目录打包为 tar.gz（浏览器退出后调用）
+
+    Args:
+        directory: 用户数据目录
+        archive: 归档文件路径
+
+    Returns:
+        int: 归档大小（字节），目录不存在返回 0
+    """
+    if not os.path.isdir(directory):
+        return 0
+    parent = os.path.dirname(os.path.abspath(archive))
+    os.makedirs(parent, exist_ok=True)
+    tmp = f"{archive}.{os.getpid()}.tmp"
+    try:
+        with tarfile.open(tmp, "w:gz", compresslevel=1) as tar:
+            tar.add(directory, arcname=".", filter=_pack_filter)
+        os.replace(tmp, archive)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return os.path.getsize(archive)
+
+
+def unpack_profile(archive, directory):
+    """
+    把归档解包到用户数据目录（启动浏览器前调用）
+
+    Args:
+        archive: 归档文件路径
+        directory: 用户数据目录
+
+    Returns:
+        bool: 是否解包（归档不存在时返回 False）
+    """
+    if not os.path.isfile(archive):
+        return False
+    root = os.path.abspath(directory)
+    with tarfile.open(archive, "r:*") as tar:
+        members = []
+        for info in tar.getmembers():
+            target = os.path.abspath(os.path.join(root, info.name))
+            if target != root and not target.startswith(root + os.sep):
+                continue  # 指向目录外
+            if not (info.isdir() or info.isfile()) or os.path.basename(info.name) in LOCK_FILES:
+                continue
+            members.append(info)
+        os.makedirs(root, exist_ok=True)
+        extra = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        tar.extractall(root, members=members, **extra)
+    return True
+
+
+def cache_dirs(directory):
+    """用户数据目录中的缓存目录（相对路径列表）"""
+    found = []
+    for dirpath, dirnames, _ in os.walk(directory):
+        for name in list(dirnames):
+            if name in CACHE_DIRS:
+                found.append(os.path.relpath(os.path.join(dirpath, name), directory))
+                dirnames.remove(name)  # 不再进入缓存目录
+    return found
+
+
+def _latest_mtime(path):
+    """目录中最近修改的文件时间"""
+    latest = os.path.getmtime(path)
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(dirpath, filename)))
+            except OSError:
+                continue
+    return latest
+
+
+def prune_profile(directory, budget, log=None):
+    """
+    把用户数据目录清理到大小上限以内（浏览器未运行时调用）
+
+    Args:
+        directory: 用户数据目录
+        budget: 大小上限（字节），0 表示不限制
+        log: 日志函数
+
+    Returns:
+        int: 回收的字节数
+    """
+    log = log or print
+    if not budget or not os.path.isdir(directory):
+        return 0
+    total = dir_size(directory)
+    if total <= budget:
+        return 0
+
+    # 崩溃转储最先删除，其余缓存目录按最后使用时间从旧到新
+    candidates = [(0, name) for name in CRASH_DIRS if os.path.isdir(os.path.join(directory, name))]
+    candidates += sorted(
+        (_latest_mtime(os.path.join(directory, rel)), rel) for rel in cache_dirs(directory)
+    )
+
+    reclaimed = 0
+    removed = 0
+    for _, rel in candidates:
+        if total - reclaimed <= budget:
+            break
+        path = os.path.join(directory, rel)
+        size = dir_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        reclaimed += size - dir_size(path)  # 删除失败的部分不计入
+        removed += 1
+
+    log(
+        f"[目录清理] {directory}: {total / 1048576:.0f} MB -> {(total - reclaimed) / 1048576:.0f} MB，"
+        f"删除 {removed} 个缓存目录，回收 {reclaimed / 1048576:.1f} MB"
+        + ("（仍超出上限，其余为登录数据，未删除）" if total - reclaimed > budget else "")
+    )
+    return reclaimed
+
+
+def record_launch(directory, seconds):
+    """
+    记录本次浏览器启动耗时
+
+    Returns:
+        float: 上次记录的启动耗时，没有记录返回 None
+    """
+    path = os.path.join(directory, LAUNCH_FILE)
+    previous = None
+    try:
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f).get("launch")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"launch": round(seconds, 3), "ts": int(time.time())}, f)
+    except OSError:
+        pass
+    return previous
+
+
+def recover_profile(directory):
+    """
+    修复写回中途崩溃留下的目录（启动浏览器前调用）
+
+    Returns:
+        bool: 是否做了修复
+    """
+    staging, old = directory + ".new", directory + ".old"
+    recovered = False
+    if not os.path.exists(directory):
+        if os.path.exists(os.path.join(staging, SYNC_MARKER)):
+            os.rename(staging, directory)
+            os.remove(os.path.join(directory, SYNC_MARKER))
+            recovered = True
+        elif os.path.isdir(old):
+            os.rename(old, directory)
+            recovered = True
+    if os.path.exists(staging):
+        shutil.rmtree(staging, ignore_errors=True)
+        recovered = True
+    if os.path.exists(old):
+        shutil.rmtree(old, ignore_errors=True)
+        recovered = True
+    return recovered
+
+
+def _is_leveldb(directory):
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return False
+    return "CURRENT" in names and any(name.startswith("MANIFEST-") for name in names)
+
+
+def _copy_file(src, dst):
+    """复制文件；浏览器关闭后目录不应再变化，文件在复制期间消失时抛出 ProfileChanged"""
+    try:
+        return shutil.copy2(src, dst)
+    except FileNotFoundError:
+        raise ProfileChanged(f"复制期间文件被删除: {src}")
+
+
+def _check_leveldb(src, dst):
+    """复制完成后，确认每个 LevelDB 目录的文件列表与源目录一致（期间没有压缩等文件增删）"""
+    for dirpath, _, filenames in os.walk(dst):
+        if not _is_leveldb(dirpath):
+            continue
+        source = os.path.join(src, os.path.relpath(dirpath, dst))
+        try:
+            current = set(os.listdir(source)) - set(LOCK_FILES) - {"LOCK"}
+        except OSError:
+            current = set()
+        if current != set(filenames) - {"LOCK"}:
+            raise ProfileChanged(f"复制期间目录发生变化: {source}")
+
+
+def _fsync(path, directory=False):
+    """把文件或目录项刷到磁盘（Windows 不支持打开目录，跳过目录）"""
+    if directory and os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_tree(directory, skip=()):
+    """fsync 目录中的全部文件和子目录（skip 中的相对路径不进入）"""
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [
+            name for name in dirnames
+            if os.path.relpath(os.path.join(dirpath, name), directory) not in skip
+        ]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if not os.path.islink(path):
+                _fsync(path)
+        _fsync(dirpath, directory=True)
+
+
+def _ignore_locks(directory, names):
+    return [name for name in names if name in LOCK_FILES]
+
+
+def _ignore_caches(directory, names):
+    return [name for name in names if name in LOCK_FILES or name in CACHE_DIRS]
+
+
+def _ram_root():
+    """可用的内存盘目录，没有返回 None"""
+    for root in RAM_ROOTS:
+        if os.path.isdir(root) and os.access(root, os.W_OK):
+            return root
+    return None
+
+
+class RamProfile:
+    """在内存盘上运行浏览器用户数据目录，检查点和退出时原子写回磁盘"""
+
+    def __init__(self, directory, root=None, interval=600, log=None):
+        """
+        Args:
+            directory: 磁盘上的用户数据目录
+            root: 内存盘目录，为空时自动选择（Linux 为 /dev/shm）
+            interval: 检查点写回的最小间隔（秒），见 due()
+            log: 日志函数
+        """
+        self.directory = os.path.abspath(directory)
+        self.root = root or _ram_root()
+        self.interval = interval
+        self._log = log or print
+        self.path = self.directory
+        self.active = False
+        self._last_sync = 0
+
+    def start(self):
+        """把用户数据目录复制到内存盘，返回浏览器应使用的目录"""
+        if self.active:
+            return self.path
+        if recover_profile(self.directory):
+            self._log("[内存盘] 已修复上次中断的写回")
+        if not self.root:
+            self._log("[内存盘] 未找到可用的内存盘，使用磁盘目录")
+            return self.path
+
+        size = dir_size(self.directory)
+        try:
+            free = shutil.disk_usage(self.root).free
+        except OSError:
+            free = 0
+        if size * 2 > free:
+            self._log(f"[内存盘] 空间不足（需要 {size / 1048576:.0f} MB），使用磁盘目录")
+            return self.path
+
+        key = hashlib.md5(self.directory.encode("utf-8")).hexdigest()[:8]
+        path = os.path.join(self.root, f"linuxdo-{os.path.basename(self.directory)}-{key}")
+        start = time.perf_counter()
+        try:
+            # 磁盘上的目录是最后一次写回的完整状态，内存盘上的残留一律丢弃
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            if os.path.isdir(self.directory):
+                shutil.copytree(
+                    self.directory, path, symlinks=True, ignore=_ignore_locks, copy_function=_copy_file
+                )
+            else:
+                os.makedirs(path)
+        except (OSError, shutil.Error, ProfileChanged) as e:
+            self._log(f"[内存盘] 复制失败，使用磁盘目录: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return self.path
+
+        self.path = path
+        self.active = True
+        self._last_sync = time.time()
+        self._log(
+            f"[内存盘] 用户数据目录已复制到 {path}"
+            f"（{size / 1048576:.1f} MB，{time.perf_counter() - start:.1f}s）"
+        )
+        return self.path
+
+    def due(self):
+        """距上次写回是否已超过间隔（调用方在可以关闭浏览器的检查点据此写回）"""
+        return self.active and time.time() - self._last_sync >= self.interval
+
+    def sync(self, full=False):
+        """
+        把内存盘上的用户数据目录写回磁盘（只能在浏览器关闭后调用）
+
+        Args:
+            full: 是否连同缓存一起写回（最终退出时）。检查点只写登录状态等数据，
+                  磁盘上原有的缓存目录移入新目录保留
+
+        Returns:
+            bool: 是否写回成功
+        """
+        if not self.active:
+            return False
+        start = time.perf_counter()
+        staging, old = self.directory + ".new", self.directory + ".old"
+        parent = os.path.dirname(self.directory)
+        moved = []
+        try:
+            recover_profile(self.directory)  # 上次写回失败时先恢复完整目录
+            shutil.copytree(
+                self.path,
+                staging,
+                symlinks=True,
+                ignore=_ignore_locks if full else _ignore_caches,
+                copy_function=_copy_file,
+            )
+            _check_leveldb(self.path, staging)
+
+            # 副本落盘后才能替换原目录；保留的缓存目录原本就在磁盘上，不用再刷
+            if not full and os.path.isdir(self.directory):
+                for rel in cache_dirs(self.directory):
+                    target = os.path.join(staging, rel)
+                    if not os.path.exists(target) and os.path.isdir(os.path.dirname(target)):
+                        os.rename(os.path.join(self.directory, rel), target)
+                        moved.append(rel)
+            _fsync_tree(staging, skip=moved)
+            with open(os.path.join(staging, SYNC_MARKER), "w") as f:
+                os.fsync(f.fileno())
+            _fsync(staging, directory=True)
+
+            # 两次重命名替换原目录，中途崩溃由 recover_profile() 修复
+            if os.path.exists(old):
+                shutil.rmtree(old)
+            if os.path.exists(self.directory):
+                os.rename(self.directory, old)
+            os.rename(staging, self.directory)
+            _fsync(parent, directory=True)
+            os.remove(os.path.join(self.directory, SYNC_MARKER))
+            shutil.rmtree(old, ignore_errors=True)
+        except (OSError, shutil.Error, ProfileChanged) as e:
+            self._log(f"[内存盘] 写回失败（磁盘上保留上次的状态）: {e}")
+            if os.path.isdir(self.directory):
+                # 原目录还在：缓存目录移回去，丢弃副本
+                for rel in moved:
+                    try:
+                        os.rename(os.path.join(staging, rel), os.path.join(self.directory, rel))
+                    except OSError:
+                        pass
+                shutil.rmtree(staging, ignore_errors=True)
+            return False
+        finally:
+            self._last_sync = time.time()
+        self._log(f"[内存盘] 已写回磁盘（{'完整' if full else '登录状态'}，{time.perf_counter() - start:.1f}s）")
+        return True
+
+    def stop(self):
+        """浏览器退出后调用：完整写回并删除内存盘副本"""
+        if not self.active:
+            return
+        if not self.sync(full=True):
+            self._log(f"[内存盘] 保留内存盘副本: {self.path}")
+            return
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.active = False
+        self.path = self.directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="浏览器用户数据目录维护（浏览器未运行时使用）")
+    sub = parser.add_subparsers(dest="command", required=True)
+    prune = sub.add_parser("prune", help="清理到大小上限以内")
+    prune.add_argument("directory", help="用户数据目录")
+    prune.add_argument("--budget-mb", type=float, default=500, help="大小上限（MB），默认 500")
+    pack = sub.add_parser("pack", help="打包为 tar.gz")
+    pack.add_argument("directory", help="用户数据目录")
+    pack.add_argument("archive", help="归档文件路径")
+    unpack = sub.add_parser("unpack", help="从 tar.gz 解包")
+    unpack.add_argument("archive", help="归档文件路径")
+    unpack.add_argument("directory", help="用户数据目录")
+    args = parser.parse_args()
+
+    if args.command == "prune":
+        recover_profile(args.directory)
+        if not prune_profile(args.directory, int(args.budget_mb * 1048576)):
+            print(f"{args.directory}: {dir_size(args.directory) / 1048576:.0f} MB，未超出上限")
+    elif args.command == "pack":
+        size = pack_profile(args.directory, args.archive)
+        print(f"已打包: {args.archive}（{size / 1048576:.1f} MB）")
+    elif args.command == "unpack":
+        if unpack_profile(args.archive, args.directory):
+            print(f"已解包: {args.directory}")
+        else:
+            print(f"找不到归档: {args.archive}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+代理池
+
+配置多个代理地址（逗号或空格分隔），启动时并发探测每个代理，之后在后台定期复测；
+浏览器启动时使用延迟最低的可用代理。后台复测发现正在使用的代理失效时，
+看门狗在下一次页面操作前换用其他代理重启浏览器（GuardedPage 的 relaunch_when），
+不必等到当前帖子读完，也不会卡在第一次 page.get 上。
+
+探测方式：连接代理并请求隧道到目标站点（HTTP 代理发 CONNECT，SOCKS5 代理做握手），
+收到成功响应即视为可用，耗时作为延迟。不发送 TLS 握手，开销很小。
+
+支持的地址格式：
+    127.0.0.1:7897
+    http://127.0.0.1:7897
+    socks5://127.0.0.1:7898
+
+用法：
+    pool = ProxyPool("127.0.0.1:7897, 127.0.0.1:7898", target="linux.do:443", log=print)
+    pool.check()           # 启动时探测一次（并发）
+    pool.start()           # 后台定期复测
+    proxy = pool.best()    # 延迟最低的可用代理
+    pool.healthy(proxy)    # 代理是否仍然可用
+    pool.failed(proxy)     # 代理已失效且有其他可用代理（需要换代理重启浏览器）
+    pool.stop()
+"""
+
+import re
+import time
+import socket
+import struct
+import threading
+from urllib.parse import urlsplit
+
+# 探测的默认目标
+DEFAULT_TARGET = "linux.do:443"
+
+
+def parse_proxies(value):
+    """把配置值（字符串或列表）拆成代理地址列表，去掉空项和重复项"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = re.split(r"[\s,;]+", value)
+    return list(dict.fromkeys(p.strip() for p in value if p and p.strip()))
+
+
+def target_from_url(url):
+    """站点地址转换为探测目标（主机:端口）"""
+    parts = urlsplit(url)
+    return f"{parts.hostname}:{parts.port or (80 if parts.scheme == 'http' else 443)}"
+
+
+def _split(proxy):
+    """返回 (协议, 主机, 端口)"""
+    parts = urlsplit(proxy if "://" in proxy else "http://" + proxy)
+    scheme = parts.scheme.lower()
+    return scheme, parts.hostname, parts.port or (1080 if scheme.startswith("socks") else 80)
+
+
+def _recv_until(sock, marker, limit=4096):
+    data = b""
+    while marker not in data and len(data) < limit:
+        chunk = sock.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def probe(proxy, target=DEFAULT_TARGET, timeout=5):
+    """
+    探测代理能否建立到目标站点的隧道
+
+    Args:
+        proxy: 代理地址
+        target: 目标 "主机:端口"
+        timeout: 超时时间（秒）
+
+    Returns:
+        float: 延迟（秒），不可用返回 None
+    """
+    host, _, port = target.rpartition(":")
+    port = int(port)
+    try:
+        scheme, proxy_host, proxy_port = _split(proxy)
+    except ValueError:
+        return None
+
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((proxy_host, proxy_port), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            if scheme.startswith("socks"):
+                sock.sendall(b"\x05\x01\x00")  # SOCKS5，无认证
+                if sock.recv(2) != b"\x05\x00":
+                    return None
+                name = host.encode("idna")
+                sock.sendall(b"\x05\x01\x00\x03" + bytes([len(name)]) + name + struct.pack(">H", port))
+                reply = sock.recv(10)
+                if len(reply) < 2 or reply[1] != 0:
+                    return None
+            else:
+                sock.sendall(f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode())
+                status = _recv_until(sock, b"\r\n").split(b" ", 2)
+                if len(status) < 2 or status[1] != b"200":
+                    return None
+    except (OSError, ValueError):
+        return None
+    return time.perf_counter() - start
+
+
+class ProxyPool:
+    """代理池：并发探测、后台复测、按延迟选择"""
+
+    def __init__(self, proxies, target=DEFAULT_TARGET, interval=15, timeout=5, log=None):
+        """
+        Args:
+            proxies: 代理地址列表或逗号分隔的字符串
+            target: 探测目标 "主机:端口"
+            interval: 后台复测间隔（秒）
+            timeout: 单次探测超时（秒）
+            log: 日志函数
+        """
+        self.proxies = parse_proxies(proxies)
+        self.target = target
+        self.interval = interval
+        self.timeout = timeout
+        self._log = log or print
+        self.latency = {}  # 代理 -> 延迟（秒），不可用为 None；未探测的代理不在其中
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """并发探测所有代理，返回 {代理: 延迟}"""
+        results = {}
+
+        def run(proxy):
+            results[proxy] = probe(proxy, self.target, self.timeout)
+
+        threads = [threading.Thread(target=run, args=(p,), daemon=True) for p in self.proxies]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(self.timeout + 1)
+
+        with self._lock:
+            for proxy in self.proxies:
+                latency = results.get(proxy)
+                was = self.latency.get(proxy, 0)
+                if latency is None and was is not None:
+                    self._log(f"[代理] {proxy} 不可用")
+                elif latency is not None and was is None and proxy in self.latency:
+                    self._log(f"[代理] {proxy} 已恢复（{latency * 1000:.0f} ms）")
+                self.latency[proxy] = latency
+        return results
+
+    def healthy(self, proxy):
+        """代理是否可用（未探测过的视为可用）"""
+        with self._lock:
+            return self.latency.get(proxy, 0) is not None
+
+    def failed(self, proxy):
+        """代理已失效且还有其他可用代理"""
+        with self._lock:
+            if self.latency.get(proxy, 0) is not None:
+                return False
+            return any(lat is not None for p, lat in self.latency.items() if p != proxy)
+
+    def best(self):
+        """延迟最低的可用代理；全部不可用时返回第一个（与只配置一个代理时的行为相同）"""
+        if not self.proxies:
+            return None
+        if not self.latency:
+            self.check()
+        with self._lock:
+            alive = [(lat, p) for p, lat in self.latency.items() if lat is not None]
+        if alive:
+            return min(alive)[1]
+        self._log(f"[代理] 所有代理都不可用，仍使用 {self.proxies[0]}")
+        return self.proxies[0]
+
+    def start(self):
+        """启动后台复测线程（只有一个代理时不启动）"""
+        if len(self.proxies) < 2 or self._thread:
+            return self
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.check()
+
+        self._thread = threading.Thread(target=loop, name="proxy-pool", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def report(self):
+        """各代理状态（多行文本列表）"""
+        lines = []
+        with self._lock:
+            for proxy in self.proxies:
+                if proxy not in self.latency:
+                    continue
+                latency = self.latency[proxy]
+                lines.append(f"  {proxy}: " + (f"{latency * 1000:.0f} ms" if latency is not None else "不可用"))
+        return lines
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+页面录制
+
+真实运行时把板块列表、帖子、等级页的 DOM 快照和相关网络响应（.json）保存到目录，
+配合 bench/replay_server.py 和 bench/bench_replay.py 离线回放：
+用真实页面结构对 get_topics / get_floor_info / find_like_buttons / get_level_info
+做回归测试和性能测试。
+
+录制时同时记下当时提取到的结果（expect），回放时与之比较。
+快照去掉了 <script>，站内绝对链接改成相对路径，回放时不会访问外网。
+
+目录结构：
+    manifest.jsonl            每个快照一行：{kind, url, path, file, expect, responses}
+    pages/000001-topic.html   DOM 快照
+    responses/000001-1.json   快照前捕获到的 .json 响应
+
+用法：
+    recorder = PageRecorder("recordings/2024-06-01")
+    recorder.capture("topic", page, expect=lambda: {"floor": get_floor_info()})
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from urllib.parse import urlparse
+
+_SCRIPT = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.S | re.I)
+_SITE_URL = re.compile(r"https?://(?:[\w-]+\.)*linux\.do(?=[/\"'])", re.I)
+
+
+def clean_html(html):
+    """去掉脚本，站内绝对链接改为相对路径"""
+    return _SITE_URL.sub("", _SCRIPT.sub("", html))
+
+
+class PageRecorder:
+    """DOM 快照和网络响应录制"""
+
+    def __init__(self, directory, log=None, capture_responses=True):
+        """
+        Args:
+            directory: 录制目录
+            log: 日志函数
+            capture_responses: 是否捕获 .json 网络响应（需要 DrissionPage 的 listen 功能）
+        """
+        self.directory = directory
+        self._log = log or print
+        self.capture_responses = capture_responses
+        self.count = 0
+        self._lock = threading.Lock()
+        self._listening = None  # 正在监听的标签页
+        os.makedirs(os.path.join(directory, "pages"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "responses"), exist_ok=True)
+        manifest = os.path.join(directory, "manifest.jsonl")
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                self.count = sum(1 for _ in f)
+
+    def listen(self, page):
+        """开始捕获 .json 响应（页面切换到新标签页后需重新调用）"""
+        if not self.capture_responses:
+            return
+        tab = getattr(page, "raw", page)
+        if self._listening is tab:
+            return
+        try:
+            page.listen.start(".json")
+            self._listening = tab
+        except Exception as e:
+            self._log(f"[录制] 无法监听网络响应: {e}")
+            self.capture_responses = False
+
+    def _responses(self, page, index):
+        """取出监听到的响应并保存，返回响应列表"""
+        if not self.capture_responses or self._listening is None:
+            return []
+        try:
+            packets = page.listen.wait(count=200, timeout=0.2, fit_count=False) or []
+        except Exception:
+            return []
+        if not isinstance(packets, list):
+            packets = [packets]
+
+        saved = []
+        for n, packet in enumerate(packets, 1):
+            try:
+                body = packet.response.body
+                status = packet.response.status
+            except Exception:
+                continue
+            name = f"{index:06d}-{n}.json"
+            with open(os.path.join(self.directory, "responses", name), "w", encoding="utf-8") as f:
+                if isinstance(body, (dict, list)):
+                    json.dump(body, f, ensure_ascii=False)
+                else:
+                    f.write(str(body or ""))
+            parsed = urlparse(packet.url)
+            saved.append(
+                {
+                    "url": packet.url,
+                    "path": parsed.path + (f"?{parsed.query}" if parsed.query else ""),
+                    "status": status,
+                    "file": f"responses/{name}",
+                }
+            )
+        return saved
+
+    def capture(self, kind, page, expect=None):
+        """
+        保存当前页面快照
+
+        Args:
+            kind: 页面类型（category / topic / connect）
+            page: 页面对象
+            expect: 当时提取到的结果（dict 或返回 dict 的函数），回放时用于比较
+        """
+        try:
+            url = page.url
+            html = page.html
+            if callable(expect):
+                expect = expect()
+        except Exception as e:
+            self._log(f"[录制] 快照失败: {e}")
+            return
+
+        with self._lock:
+            self.count += 1
+            index = self.count
+            name = f"{index:06d}-{kind}.html"
+            with open(os.path.join(self.directory, "pages", name), "w", encoding="utf-8") as f:
+                f.write(clean_html(html))
+            parsed = urlparse(url)
+            record = {
+                "ts": round(time.time(), 3),
+                "kind": kind,
+                "url": url,
+                "path": parsed.path + (f"?{parsed.query}" if parsed.query else ""),
+                "file": f"pages/{name}",
+                "expect": expect,
+                "responses": self._responses(page, index),
+            }
+            with open(os.path.join(self.directory, "manifest.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.listen(page)
+
+
+def load_manifest(directory):
+    """读取录制目录的快照列表（跳过损坏的行）"""
+    records = []
+    with open(os.path.join(directory, "manifest.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records